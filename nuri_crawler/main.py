@@ -1,18 +1,45 @@
-
+import argparse
 import logging
-from src.crawler import NuriCrawler
-from src.storage import Storage
+from src.config import INCREMENTAL_MODE, PROFILE_SAMPLE_RATE, ATTACHMENTS_ENABLED, ATTACHMENT_WORKERS
+from src.config import HEADLESS, TARGET_COUNT, DELAY_BETWEEN_REQUESTS, RUN_PROFILES, DEFAULT_PROFILE, METRICS_PORT
+
+# Heavy modules (Playwright, pandas/openpyxl, bs4) are imported inside the
+# command that needs them, so export/search/api start without loading them.
+
+# Run setting -> command-line flag that overrides it
+PROFILE_FLAGS = {'headless': 'headless', 'target_count': 'target_count', 'delay': 'delay', 'concurrency': 'processes'}
+
+def resolve_profile(args, **command_defaults) -> dict:
+    """
+    Run settings, later sources winning: config defaults, the command's own
+    defaults (e.g. SHARD_TARGET_COUNT for shard), the --profile entry (only
+    when one is given), then explicit flags.
+    """
+    settings = {'headless': HEADLESS, 'target_count': TARGET_COUNT, 'incremental': INCREMENTAL_MODE,
+                'delay': DELAY_BETWEEN_REQUESTS, 'concurrency': None}
+    settings.update(command_defaults)
+    if getattr(args, 'profile', None):
+        settings.update(RUN_PROFILES[args.profile])
+    for key, flag in PROFILE_FLAGS.items():
+        if getattr(args, flag, None) is not None:
+            settings[key] = getattr(args, flag)
+    if getattr(args, 'incremental', False):
+        settings['incremental'] = True
+    return settings
+
+def run_crawl(args):
+    from src.crawler import NuriCrawler
+    from src.storage import Storage
 
-def main():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
     logger = logging.getLogger("Main")
-    logger.info("Starting Nuri G2B Crawler")
-    
-    crawler = NuriCrawler()
+    settings = resolve_profile(args, concurrency=ATTACHMENT_WORKERS)
+    logger.info(f"Starting Nuri G2B Crawler (profile {args.profile or '-'}: {settings})")
+
+    crawler = NuriCrawler(target_count=settings['target_count'], incremental=settings['incremental'],
+                          profile_rate=args.profile_rate, headless=settings['headless'], delay=settings['delay'],
+                          attachments=args.attachments or ATTACHMENTS_ENABLED,
+                          attachment_workers=settings['concurrency'],
+                          metrics_port=METRICS_PORT)
     try:
         crawler.run()
     except Exception as e:
@@ -22,5 +49,320 @@ def main():
         Storage.save_csv(crawler.results, "data/results.csv")
         Storage.save_json(crawler.results, "data/results.json")
 
+def run_shard(args):
+    from src.config import SHARD_PROCESSES, SHARD_TARGET_COUNT
+    from src.shard import ShardCoordinator, split_date_range, split_by_values
+
+    logger = logging.getLogger("Main")
+    extra = {}
+    if args.agency:
+        extra['agency'] = args.agency
+    if args.task_categories:
+        extra_base = dict(extra, date_from=args.date_from, date_to=args.date_to)
+        shards = split_by_values('task_category', args.task_categories, extra_base)
+    else:
+        shards = split_date_range(args.date_from, args.date_to, args.days, extra)
+
+    # Profile target_count applies per shard; incremental is not supported by shards
+    settings = resolve_profile(args, concurrency=SHARD_PROCESSES, target_count=SHARD_TARGET_COUNT)
+    coordinator = ShardCoordinator(shards, processes=settings['concurrency'], target_count=settings['target_count'],
+                                   headless=settings['headless'], delay=settings['delay'])
+    summary = coordinator.run()
+    logger.info(f"Shard summary: {summary}")
+    coordinator.merge_results()
+
+def run_watch(args):
+    from src.crawler import NuriCrawler
+
+    logger = logging.getLogger("Main")
+    logger.info(f"Starting watch mode (interval {args.interval}s)")
+    settings = resolve_profile(args)
+    crawler = NuriCrawler(headless=settings['headless'], delay=settings['delay'], metrics_port=METRICS_PORT)
+    crawler.watch(interval=args.interval)
+    logger.info(f"Watch finished. Collected {len(crawler.results)} items.")
+
+def run_daemon(args):
+    from src.daemon import CrawlerDaemon
+
+    settings = resolve_profile(args)
+    daemon = CrawlerDaemon(
+        interval=args.interval,
+        cron=args.cron,
+        target_count=settings['target_count'],
+        incremental=settings['incremental'],
+        headless=settings['headless'],
+        delay=settings['delay'],
+    )
+    daemon.run()
+
+def run_bench(args):
+    import json
+    from src.bench import run_benchmark
+
+    report = run_benchmark(
+        notices=args.notices,
+        target_count=args.target_count,
+        latency_ms=args.latency_ms,
+        report_file=args.report,
+        headless=not args.headed,
+    )
+    print(json.dumps({k: v for k, v in report.items() if k != 'metrics'}, ensure_ascii=False, indent=2))
+
+def fault_spec(spec: str) -> tuple:
+    """argparse type for --fault NAME=RATE (a known SOAK_FAULT_RATES name, rate in [0, 1])."""
+    from src.config import SOAK_FAULT_RATES
+
+    name, sep, rate = spec.partition("=")
+    name = name.strip()
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=RATE, got '{spec}'")
+    if name not in SOAK_FAULT_RATES:
+        raise argparse.ArgumentTypeError(f"unknown fault '{name}' (choose from {', '.join(sorted(SOAK_FAULT_RATES))})")
+    try:
+        value = float(rate)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"rate for '{name}' is not a number: '{rate}'")
+    if not 0 <= value <= 1:
+        raise argparse.ArgumentTypeError(f"rate for '{name}' must be between 0 and 1, got {value}")
+    return name, value
+
+def run_soak(args):
+    import json
+    from src.soak import run_soak as soak
+
+    faults = dict(args.fault) if args.fault else None
+    report = soak(
+        notices=args.notices,
+        target_count=args.target_count,
+        faults=faults,
+        seed=args.seed,
+        latency_ms=args.latency_ms,
+        report_file=args.report,
+        headless=not args.headed,
+    )
+    print(json.dumps({k: v for k, v in report.items() if k != 'metrics'}, ensure_ascii=False, indent=2))
+
+def run_parser_bench(args):
+    import sys
+    from src.parser_bench import run_parser_bench as parser_bench
+
+    sys.exit(parser_bench(
+        iterations=args.iterations,
+        threshold=args.threshold,
+        update_baseline=args.update_baseline,
+        build=args.build_corpus,
+    ))
+
+def run_search(args):
+    import time
+    from src.search import SearchIndex
+
+    index = SearchIndex(args.db)
+    try:
+        if args.rebuild:
+            count = index.rebuild_from_json(args.rebuild)
+            print(f"Indexed {count} notices from {args.rebuild} ({len(index)} total)")
+            if not (args.keyword or args.agency or args.date_from or args.date_to):
+                return
+        start = time.perf_counter()
+        rows = index.search(keyword=" ".join(args.keyword) or None, agency=args.agency,
+                            date_from=args.date_from, date_to=args.date_to, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    finally:
+        index.close()
+    for row in rows:
+        print(f"{row['notice_date'] or '-':16}  {row['bid_no']}  {row['bid_name']}  [{row['agency'] or '-'}]")
+    print(f"{len(rows)} results in {elapsed_ms:.1f} ms")
+
+def run_api(args):
+    from src.api import ReadAPI
+
+    ReadAPI(db_file=args.db, host=args.host, port=args.port).serve_forever()
+
+def run_export(args):
+    from src.config import QUEUE_DB, SEARCH_DB
+    from src.export import export_csv
+
+    logger = logging.getLogger("Main")
+    if args.source == "search":
+        from src.search import SearchIndex
+        store = SearchIndex(args.db or SEARCH_DB)
+        source = store.iter_items
+    else:
+        from src.jobqueue import JobQueue
+        store = JobQueue(args.db or QUEUE_DB)
+        source = store.iter_results
+    try:
+        # Both export passes read one snapshot, even while a crawl keeps writing
+        with store.snapshot():
+            summary = export_csv(source, args.out, args.compress)
+    finally:
+        store.close()
+    logger.info(f"Export summary: {summary}")
+
+def run_reparse(args):
+    import glob
+    import os
+    from src.parser import NuriParser
+    from src.storage import Storage
+
+    logger = logging.getLogger("Main")
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.html"), recursive=True)))
+        else:
+            files.append(path)
+    parser = NuriParser() if args.full else NuriParser.from_config()
+    items = []
+    for file in files:
+        with open(file, 'r', encoding='utf-8') as f:
+            item = parser.parse_detail(f.read())
+        if item.bid_no:
+            items.append(item)
+        else:
+            logger.warning(f"No 입찰공고번호 in {file}; skipped")
+    Storage.save_json(items, args.out)
+    logger.info(f"Re-parsed {len(items)}/{len(files)} saved detail pages into {args.out}")
+    if args.index and items:
+        from src.search import SearchIndex
+
+        index = SearchIndex(args.db)
+        try:
+            index.add(items)
+        finally:
+            index.close()
+        logger.info(f"Indexed {len(items)} notices into {args.db}")
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    from src.config import SHARD_DAYS, WATCH_INTERVAL, DAEMON_INTERVAL, DAEMON_CRON
+    from src.config import PARSER_BENCH_ITERATIONS, PARSER_REGRESSION_THRESHOLD, SEARCH_DB, API_HOST, API_PORT
+    from src.config import EXPORT_COMPRESSION
+
+    # Options shared by the browser commands
+    run_options = argparse.ArgumentParser(add_help=False)
+    run_options.add_argument("--profile", choices=sorted(RUN_PROFILES), default=DEFAULT_PROFILE,
+                             help="Named settings from RUN_PROFILES (default: config defaults only)")
+    run_options.add_argument("--headless", action=argparse.BooleanOptionalAction, default=None,
+                             help="Override the profile's browser mode")
+    run_options.add_argument("--delay", type=float, help="Seconds between requests (default: profile or DELAY_BETWEEN_REQUESTS)")
+
+    parser = argparse.ArgumentParser(description="Nuri G2B Crawler")
+    subparsers = parser.add_subparsers(dest="command")
+
+    crawl_parser = subparsers.add_parser("crawl", parents=[run_options], help="Single-browser crawl (default)")
+    crawl_parser.add_argument("--target-count", type=int, help="Stop after this many items (default: profile)")
+    crawl_parser.add_argument("--incremental", action="store_true",
+                              help="Only fetch notices newer than the stored 입력일시 high-water mark")
+    crawl_parser.add_argument("--profile-rate", type=float, default=PROFILE_SAMPLE_RATE,
+                              help="Fraction of notices to trace/profile into data/diagnostics (e.g. 0.05)")
+    crawl_parser.add_argument("--attachments", action="store_true",
+                              help="Download 파일첨부 files into data/attachments")
+
+    shard_parser = subparsers.add_parser("shard", parents=[run_options], help="Multi-process crawl split into search partitions")
+    shard_parser.add_argument("--date-from", required=True, help="Notice date from (YYYY/MM/DD)")
+    shard_parser.add_argument("--date-to", required=True, help="Notice date to (YYYY/MM/DD)")
+    shard_parser.add_argument("--days", type=int, default=SHARD_DAYS, help="Days per date shard")
+    shard_parser.add_argument("--task-categories", nargs="+", help="Shard by 업무분류 instead of date (e.g. 물품 공사 용역)")
+    shard_parser.add_argument("--agency", help="Restrict all shards to one 공고기관")
+    shard_parser.add_argument("--processes", type=int, help="Worker processes (default: profile concurrency or SHARD_PROCESSES)")
+    shard_parser.add_argument("--target-count", type=int,
+                              help="Item limit per shard (default: profile or SHARD_TARGET_COUNT)")
+
+    watch_parser = subparsers.add_parser("watch", parents=[run_options], help="Poll the first list page and fetch new notices immediately")
+    watch_parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="Seconds between polls")
+
+    daemon_parser = subparsers.add_parser("daemon", parents=[run_options], help="Keep a warm browser and run crawl cycles on a schedule")
+    daemon_parser.add_argument("--interval", type=float, default=DAEMON_INTERVAL, help="Seconds between cycles")
+    daemon_parser.add_argument("--cron", default=DAEMON_CRON, help="5-field cron expression (overrides --interval)")
+    daemon_parser.add_argument("--target-count", type=int, help="Item limit per cycle (default: profile)")
+    daemon_parser.add_argument("--incremental", action="store_true",
+                               help="Only fetch notices newer than the stored 입력일시 high-water mark")
+
+    bench_parser = subparsers.add_parser("bench", help="End-to-end throughput benchmark against a local mock site")
+    bench_parser.add_argument("--notices", type=int, default=100, help="Notices served by the mock site")
+    bench_parser.add_argument("--target-count", type=int, help="Notices to crawl (default: all)")
+    bench_parser.add_argument("--latency-ms", type=float, default=0, help="Artificial per-response latency")
+    bench_parser.add_argument("--report", default="data/bench_report.json", help="JSON report path")
+    bench_parser.add_argument("--headed", action="store_true", help="Show the browser window")
+
+    soak_parser = subparsers.add_parser("soak", help="Crawl the mock site with injected faults and report recovery cost")
+    soak_parser.add_argument("--notices", type=int, default=200, help="Notices served by the mock site")
+    soak_parser.add_argument("--target-count", type=int, help="Notices to crawl (default: all)")
+    soak_parser.add_argument("--fault", action="append", type=fault_spec, metavar="NAME=RATE",
+                             help="Fault rate, repeatable (default: SOAK_FAULT_RATES), e.g. server_error=0.05")
+    soak_parser.add_argument("--seed", type=int, help="Random seed for reproducible fault sequences")
+    soak_parser.add_argument("--latency-ms", type=float, default=0, help="Artificial per-response latency")
+    soak_parser.add_argument("--report", default="data/soak_report.json", help="JSON report path")
+    soak_parser.add_argument("--headed", action="store_true", help="Show the browser window")
+
+    parser_bench_parser = subparsers.add_parser("parser-bench", help="Offline NuriParser benchmark with regression gate")
+    parser_bench_parser.add_argument("--iterations", type=int, default=PARSER_BENCH_ITERATIONS)
+    parser_bench_parser.add_argument("--threshold", type=float, default=PARSER_REGRESSION_THRESHOLD,
+                                     help="Allowed docs/sec drop vs baseline (0.15 = 15%%)")
+    parser_bench_parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser_bench_parser.add_argument("--build-corpus", action="store_true", help="Regenerate the HTML fixtures first")
+
+    search_parser = subparsers.add_parser("search", help="Query the full-text index of crawled notices")
+    search_parser.add_argument("keyword", nargs="*", default=[], help="Keywords in 공고명 / item names (all must match)")
+    search_parser.add_argument("--agency", help="Agency keyword")
+    search_parser.add_argument("--from", dest="date_from", help="Notice date from (YYYY/MM/DD)")
+    search_parser.add_argument("--to", dest="date_to", help="Notice date to, inclusive (YYYY/MM/DD)")
+    search_parser.add_argument("--limit", type=int, default=50)
+    search_parser.add_argument("--db", default=SEARCH_DB, help="Index database")
+    search_parser.add_argument("--rebuild", metavar="RESULTS_JSON", nargs="?", const="data/results.json",
+                               help="(Re)index a results.json file first (default: data/results.json)")
+
+    api_parser = subparsers.add_parser("api", help="Serve the crawl store over a local HTTP read API")
+    api_parser.add_argument("--host", default=API_HOST)
+    api_parser.add_argument("--port", type=int, default=API_PORT)
+    api_parser.add_argument("--db", default=SEARCH_DB, help="Index database written by the crawler")
+
+    export_parser = subparsers.add_parser("export", help="Stream results into a flattened CSV plus one CSV per sub-grid")
+    export_parser.add_argument("--source", choices=["queue", "search"], default="queue",
+                               help="Result sink to read: job queue results (as crawled) or search index (revisions merged)")
+    export_parser.add_argument("--db", help="Database file of the source (default: QUEUE_DB / SEARCH_DB)")
+    export_parser.add_argument("--out", default="data/export/results.csv", help="Main CSV path")
+    export_parser.add_argument("--compress", choices=["gzip", "zstd"], default=EXPORT_COMPRESSION)
+
+    reparse_parser = subparsers.add_parser("reparse", help="Re-run the parser over saved detail-page HTML (no browser)")
+    reparse_parser.add_argument("paths", nargs="*", default=["data/diagnostics"],
+                                help="HTML files or directories searched recursively (default: data/diagnostics)")
+    reparse_parser.add_argument("--out", default="data/reparsed.json", help="Results JSON path")
+    reparse_parser.add_argument("--full", action="store_true", help="Extract every field and grid (ignore PROJECTION_MODE)")
+    reparse_parser.add_argument("--index", action="store_true", help="Also upsert the items into the search index")
+    reparse_parser.add_argument("--db", default=SEARCH_DB, help="Index database for --index")
+
+    args = parser.parse_args()
+    if args.command is None:
+        args = parser.parse_args(["crawl"])
+    if args.command == "shard":
+        run_shard(args)
+    elif args.command == "watch":
+        run_watch(args)
+    elif args.command == "daemon":
+        run_daemon(args)
+    elif args.command == "bench":
+        run_bench(args)
+    elif args.command == "soak":
+        run_soak(args)
+    elif args.command == "parser-bench":
+        run_parser_bench(args)
+    elif args.command == "search":
+        run_search(args)
+    elif args.command == "api":
+        run_api(args)
+    elif args.command == "export":
+        run_export(args)
+    elif args.command == "reparse":
+        run_reparse(args)
+    else:
+        run_crawl(args)
+
 if __name__ == "__main__":
     main()
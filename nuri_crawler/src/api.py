@@ -0,0 +1,258 @@
+import base64
+import binascii
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import urlparse, parse_qs, unquote
+from .config import SEARCH_DB, API_HOST, API_PORT, API_PAGE_SIZE, API_MAX_PAGE_SIZE, API_CACHE_SIZE
+from .search import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+LIST_FILTERS = ('q', 'agency', 'bid_type', 'task_category', 'deadline_from', 'deadline_to')
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """Thread-safe LRU of response bodies, cleared whenever the index changes."""
+
+    def __init__(self, maxsize: int = API_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+def encode_cursor(direction: str, seq: int) -> str:
+    raw = json.dumps({direction: seq}, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if not (isinstance(value, dict) and len(value) == 1 and set(value) <= {'before', 'after'}
+                and isinstance(next(iter(value.values())), int)):
+            raise ValueError(value)
+        return value
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ApiError(400, "Invalid cursor")
+
+
+class ReadAPI:
+    """
+    Local HTTP query service over the search index (data/search.db), so
+    consumers never re-read results.json:
+
+    - GET /notices?q=&agency=&bid_type=&task_category=&deadline_from=&deadline_to=&limit=&cursor=&full=1
+      newest writes first; `next_cursor` continues the listing.
+      `since=0` (or a cursor from it) is a change feed: oldest first, resumable.
+    - GET /notices/<bid_no>: full merged record
+    - GET /health
+
+    Responses carry an ETag and Last-Modified derived from the index
+    generation; If-None-Match / If-Modified-Since turn a 200 into a 304
+    (errors are returned as usual). Response
+    bodies are cached in an LRU that is cleared when the crawler writes.
+    """
+
+    def __init__(self, db_file: str = SEARCH_DB, host: str = API_HOST, port: int = API_PORT,
+                 cache_size: int = API_CACHE_SIZE):
+        self.db_file = db_file
+        self.host = host
+        self.port = port
+        self.cache = LRUCache(cache_size)
+        self._generation = None
+        self._generation_lock = threading.Lock()
+        self._local = threading.local()
+        self._server = None
+        SearchIndex(db_file).close()  # Create/upgrade the schema up front
+
+    def _index(self) -> SearchIndex:
+        # sqlite3 connections are per thread
+        index = getattr(self._local, 'index', None)
+        if index is None:
+            index = self._local.index = SearchIndex(self.db_file)
+        return index
+
+    def _current_generation(self, index: SearchIndex) -> tuple:
+        generation, updated_at = index.generation()
+        with self._generation_lock:
+            if generation != self._generation:
+                if self._generation is not None:
+                    logger.info(f"Index changed (generation {generation}); clearing {len(self.cache)} cached responses")
+                self.cache.clear()
+                self._generation = generation
+        return generation, updated_at
+
+    # --- Request handling ------------------------------------------------
+
+    @staticmethod
+    def _int_param(params: dict, name: str, default: Optional[int] = None) -> Optional[int]:
+        value = params.get(name)
+        if value in (None, ""):
+            return default
+        try:
+            return int(value)
+        except ValueError:
+            raise ApiError(400, f"'{name}' must be an integer")
+
+    def _list(self, index: SearchIndex, params: dict) -> dict:
+        limit = max(1, min(self._int_param(params, 'limit', API_PAGE_SIZE), API_MAX_PAGE_SIZE))
+        before = after = None
+        if params.get('cursor'):
+            cursor = decode_cursor(params['cursor'])
+            before, after = cursor.get('before'), cursor.get('after')
+        elif params.get('since') not in (None, ""):
+            after = self._int_param(params, 'since')
+
+        rows = index.page(
+            keyword=params.get('q'), agency=params.get('agency'), bid_type=params.get('bid_type'),
+            task_category=params.get('task_category'), deadline_from=params.get('deadline_from'),
+            deadline_to=params.get('deadline_to'), before_seq=before, after_seq=after,
+            limit=limit, full=params.get('full') in ('1', 'true'),
+        )
+        if after is not None:
+            # Change feed: always hand back a cursor so consumers can keep polling
+            last = rows[-1]['seq'] if rows else after
+            next_cursor = encode_cursor('after', last)
+        else:
+            next_cursor = encode_cursor('before', rows[-1]['seq']) if len(rows) == limit else None
+        return {'items': rows, 'next_cursor': next_cursor}
+
+    def handle(self, path: str, params: dict, headers) -> tuple:
+        """Return (status, extra headers, body bytes)."""
+        index = self._index()
+        generation, updated_at = self._current_generation(index)
+
+        cache_key = (path, tuple(sorted(params.items())))
+        etag = 'W/"{}-{}"'.format(generation, hashlib.sha1(repr(cache_key).encode('utf-8')).hexdigest()[:12])
+        validators = {'ETag': etag, 'Last-Modified': formatdate(updated_at, usegmt=True), 'Cache-Control': 'no-cache'}
+
+        # Route and parameters are validated (404/400) before conditional headers apply
+        body = self.cache.get(cache_key)
+        if body is None:
+            if path == "/notices":
+                unknown = set(params) - set(LIST_FILTERS) - {'limit', 'cursor', 'since', 'full'}
+                if unknown:
+                    raise ApiError(400, f"Unknown parameters: {', '.join(sorted(unknown))}")
+                payload = self._list(index, params)
+            elif path.startswith("/notices/"):
+                payload = index.get(unquote(path[len("/notices/"):]))
+                if payload is None:
+                    raise ApiError(404, "Notice not found")
+            elif path == "/health":
+                payload = {'status': 'ok', 'notices': len(index), 'generation': generation,
+                           'cache': {'size': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses}}
+                return 200, {'Cache-Control': 'no-store'}, json.dumps(payload).encode('utf-8')
+            else:
+                raise ApiError(404, "Not found")
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self.cache.put(cache_key, body)
+        if self._not_modified(headers, etag, updated_at):
+            return 304, validators, b""
+        return 200, validators, body
+
+    @staticmethod
+    def _not_modified(headers, etag: str, updated_at: float) -> bool:
+        """Conditional GET of a 200 response; If-None-Match takes precedence over If-Modified-Since."""
+        if_none_match = headers.get('If-None-Match')
+        if if_none_match:
+            return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+        if headers.get('If-Modified-Since') and updated_at:
+            try:
+                return int(updated_at) <= parsedate_to_datetime(headers['If-Modified-Since']).timestamp()
+            except (TypeError, ValueError):
+                pass  # Unparseable date: ignore the header
+        return False
+
+    # --- Server ----------------------------------------------------------
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                try:
+                    status, headers, body = api.handle(parsed.path.rstrip("/") or "/", params, self.headers)
+                except ApiError as e:
+                    status, headers = e.status, {}
+                    body = json.dumps({'error': str(e)}, ensure_ascii=False).encode('utf-8')
+                except Exception as e:
+                    logger.error(f"API request failed: {self.path}: {e}", exc_info=True)
+                    status, headers, body = 500, {}, b'{"error": "Internal error"}'
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if status != 304:
+                    self.send_header("Content-Type", "application/json; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    def serve_forever(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.port = self._server.server_address[1]
+        logger.info(f"Read API at http://{self.host}:{self.port}/notices (index {self.db_file})")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> "ReadAPI":
+        """Serve from a background thread (tests, embedding)."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
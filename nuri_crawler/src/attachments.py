@@ -0,0 +1,244 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from .config import (ATTACHMENT_GRID, ATTACHMENT_WORKERS, ATTACHMENT_TIMEOUT, ATTACHMENT_MAX_ATTEMPTS,
+                     ATTACHMENT_CHUNK_SIZE)
+from .state import StateManager
+
+logger = logging.getLogger(__name__)
+
+FILENAME_PATTERN = re.compile(r'\.[A-Za-z0-9]{2,5}$')
+
+# Attachment status lifecycle: pending -> partial -> done, or failed after ATTACHMENT_MAX_ATTEMPTS
+STATUS_PENDING = "pending"
+STATUS_PARTIAL = "partial"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_NO_URL = "no_url"  # Link is a script handler; fetched by clicking instead
+
+# Collect the file links of the attachment grid. Each link gets a data attribute
+# so links without a usable href can be clicked afterwards.
+LINKS_JS = """(gridTitle) => {
+    const pattern = /\\.[A-Za-z0-9]{2,5}$/;
+    let scope = document;
+    for (const title of document.querySelectorAll('.df_tit, .tit')) {
+        if (title.textContent.trim() === gridTitle) {
+            let el = title.nextElementSibling;
+            while (el && !el.classList.contains('w2grid') && !el.querySelector('.w2grid')) el = el.nextElementSibling;
+            if (el) scope = el;
+            break;
+        }
+    }
+    const links = [];
+    scope.querySelectorAll('a, span.w2textbox, td nobr').forEach((el) => {
+        const name = el.textContent.trim();
+        if (!pattern.test(name)) return;
+        const index = links.length;
+        el.setAttribute('data-nuri-attachment', String(index));
+        const href = el.tagName === 'A' ? el.href : '';
+        links.push({index, name, url: href.startsWith('http') ? href : ''});
+    });
+    return links;
+}"""
+
+
+def _safe_filename(name: str) -> str:
+    return re.sub(r'[\\/:*?"<>|\x00-\x1f]', '_', name).strip() or "attachment"
+
+
+class AttachmentDownloader:
+    """
+    Bounded pool of attachment downloads sharing the browser session's cookies.
+
+    Files are stored once per content under objects/<sha256[:2]>/<sha256> and
+    hard-linked as by_notice/<bid_no>/<file name>. Interrupted downloads stay in
+    partial/ and resume with HTTP Range (If-Range guards against changed files).
+    Progress per URL is kept in the shared state (StateManager.record_attachment).
+    """
+
+    def __init__(self, state: StateManager, root_dir: str, workers: int = ATTACHMENT_WORKERS):
+        self.state = state
+        self.root_dir = root_dir
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="attachment")
+        self.futures = []
+        self._headers = {}
+        self._lock = threading.Lock()
+        self._url_locks = {}  # url -> Lock; one download per URL at a time
+        self.stats = {'downloaded': 0, 'deduplicated': 0, 'resumed': 0, 'failed': 0, 'bytes': 0}
+
+    # --- Paths -----------------------------------------------------------
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.root_dir, "objects", sha256[:2], sha256)
+
+    def _partial_path(self, url: str) -> str:
+        return os.path.join(self.root_dir, "partial", hashlib.sha1(url.encode('utf-8')).hexdigest() + ".part")
+
+    def _link(self, sha256: str, bid_no: str, name: str) -> str:
+        """Expose a stored object under by_notice/<bid_no>/<name> (hard link, or copy)."""
+        path = os.path.join(self.root_dir, "by_notice", _safe_filename(bid_no), _safe_filename(name))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not os.path.exists(path):
+            try:
+                os.link(self._object_path(sha256), path)
+            except OSError:
+                shutil.copyfile(self._object_path(sha256), path)
+        return path
+
+    def _bump(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _stored(self, info: dict) -> bool:
+        return info.get('status') == STATUS_DONE and os.path.exists(self._object_path(info['sha256']))
+
+    # --- Scheduling ------------------------------------------------------
+
+    def set_session(self, cookies: List[dict], user_agent: Optional[str] = None, referer: Optional[str] = None):
+        """Cookies from context.cookies(); captured on the Playwright thread, used by the workers."""
+        headers = {}
+        if cookies:
+            headers['Cookie'] = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+        if user_agent:
+            headers['User-Agent'] = user_agent
+        if referer:
+            headers['Referer'] = referer
+        self._headers = headers
+
+    def submit(self, bid_no: str, name: str, url: str) -> bool:
+        """Queue a download unless it is done or out of attempts. Returns True if queued."""
+        info = self.state.attachment(url) or {}
+        if self._stored(info):
+            # Already downloaded (possibly for another notice/revision): (re)create the link
+            self._link(info['sha256'], bid_no, name)
+            return False
+        if info.get('attempts', 0) >= ATTACHMENT_MAX_ATTEMPTS:
+            return False
+        self.state.record_attachment(url, bid_no=bid_no, name=name, status=info.get('status', STATUS_PENDING))
+        self.futures.append(self.executor.submit(self._download, bid_no, name, url, dict(self._headers)))
+        return True
+
+    def wait(self):
+        """Block until every queued download has finished."""
+        futures, self.futures = self.futures, []
+        for future in futures:
+            future.result()
+        logger.info(f"Attachments: {self.stats}")
+
+    def close(self):
+        self.wait()
+        self.executor.shutdown(wait=True)
+
+    # --- Download --------------------------------------------------------
+
+    def _download(self, bid_no: str, name: str, url: str, headers: dict):
+        """Download one URL; concurrent submits of the same URL run one after another."""
+        with self._url_lock(url):
+            # State may have changed while queued (an earlier submit of this URL finished or gave up)
+            info = self.state.attachment(url) or {}
+            if self._stored(info):
+                self._link(info['sha256'], bid_no, name)
+                return
+            if info.get('attempts', 0) >= ATTACHMENT_MAX_ATTEMPTS:
+                return
+            self._fetch(bid_no, name, url, headers, info)
+
+    def _fetch(self, bid_no: str, name: str, url: str, headers: dict, info: dict):
+        self.state.record_attachment(url, attempts=info.get('attempts', 0) + 1)
+        partial = self._partial_path(url)
+        os.makedirs(os.path.dirname(partial), exist_ok=True)
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+
+        request_headers = dict(headers)
+        if offset:
+            request_headers['Range'] = f"bytes={offset}-"
+            validator = info.get('etag') or info.get('last_modified')
+            if validator:
+                request_headers['If-Range'] = validator
+
+        try:
+            try:
+                response = urllib.request.urlopen(urllib.request.Request(url, headers=request_headers),
+                                                  timeout=ATTACHMENT_TIMEOUT)
+            except urllib.error.HTTPError as e:
+                if e.code != 416 or not offset:
+                    raise
+                # Range not satisfiable: the partial file already holds the whole body
+                response = None
+
+            sha = hashlib.sha256()
+            if response is not None and response.status != 206:
+                offset = 0  # Server ignored the range (or the file changed): start over
+            elif offset:
+                self._bump('resumed')
+                with open(partial, 'rb') as f:
+                    for chunk in iter(lambda: f.read(ATTACHMENT_CHUNK_SIZE), b""):
+                        sha.update(chunk)
+
+            if response is not None:
+                with response:
+                    self.state.record_attachment(
+                        url, status=STATUS_PARTIAL,
+                        etag=response.headers.get('ETag'), last_modified=response.headers.get('Last-Modified'),
+                    )
+                    with open(partial, 'ab' if offset else 'wb') as f:
+                        for chunk in iter(lambda: response.read(ATTACHMENT_CHUNK_SIZE), b""):
+                            f.write(chunk)
+                            sha.update(chunk)
+                            offset += len(chunk)
+                            self._bump('bytes', len(chunk))
+                self.state.record_attachment(url, bytes=offset)
+
+            self._store(bid_no, name, url, partial, sha.hexdigest(), offset)
+        except Exception as e:
+            # Keep the partial file: the next attempt resumes from it
+            attempts = (self.state.attachment(url) or {}).get('attempts', 0)
+            status = STATUS_FAILED if attempts >= ATTACHMENT_MAX_ATTEMPTS else STATUS_PARTIAL
+            self.state.record_attachment(url, status=status, error=str(e),
+                                         bytes=os.path.getsize(partial) if os.path.exists(partial) else 0)
+            self._bump('failed')
+            logger.warning(f"Attachment download failed ({bid_no} {name}): {e}")
+
+    def _store(self, bid_no: str, name: str, url: Optional[str], source: str, sha256: str, size: int):
+        """Move a finished download into the content-addressed store (or drop it as a duplicate)."""
+        target = self._object_path(sha256)
+        if os.path.exists(target):
+            os.remove(source)
+            self._bump('deduplicated')
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(source, target)
+            self._bump('downloaded')
+        path = self._link(sha256, bid_no, name)
+        if url:
+            self.state.record_attachment(url, status=STATUS_DONE, sha256=sha256, bytes=size, path=path, error=None)
+        logger.info(f"Attachment stored: {bid_no} {name} ({size} bytes, sha256 {sha256[:12]})")
+
+    def store_file(self, bid_no: str, name: str, key: str, file_path: str):
+        """Store a file fetched another way (e.g. a Playwright download) under the same scheme."""
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(ATTACHMENT_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        size = os.path.getsize(file_path)
+        staged = self._partial_path(key)
+        os.makedirs(os.path.dirname(staged), exist_ok=True)
+        shutil.copyfile(file_path, staged)
+        self.state.record_attachment(key, bid_no=bid_no, name=name, status=STATUS_PENDING)
+        self._store(bid_no, name, key, staged, sha.hexdigest(), size)
+
+
+def collect_links(target_frame) -> List[dict]:
+    """[{'index', 'name', 'url'}] for the file links in the detail page's attachment grid."""
+    return target_frame.evaluate(LINKS_JS, ATTACHMENT_GRID)
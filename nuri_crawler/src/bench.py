@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+import resource
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+from .config import MOCK_GRID_WINDOW
+from .mocksite import MockSite, default_results_file
+from .watchdog import process_tree_rss_mb
+
+logger = logging.getLogger(__name__)
+
+
+class _RssSampler:
+    """Samples the browser process tree RSS in the background and keeps the peak."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = process_tree_rss_mb()
+            if rss is not None:
+                self.samples.append(rss)
+                self.peak_mb = max(self.peak_mb, rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def _python_peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def crawl_mock_site(site: MockSite, target_count: int, headless: bool = True):
+    """
+    Run the real NuriCrawler against a started MockSite in a throwaway output
+    directory. Returns (crawler, elapsed seconds, browser peak RSS MB,
+    number of queue jobs leased more than once).
+    """
+    from .crawler import NuriCrawler
+
+    with tempfile.TemporaryDirectory(prefix="nuri_bench_") as work_dir:
+        crawler = NuriCrawler(
+            target_count=target_count,
+            output_dir=work_dir,
+            list_url=site.url,
+            headless=headless,
+            delay=0,
+            queue_db=os.path.join(work_dir, "queue.db"),
+            state_db=os.path.join(work_dir, "state.db"),
+            search_db=os.path.join(work_dir, "search.db"),
+        )
+        try:
+            with _RssSampler() as sampler:
+                start = time.perf_counter()
+                crawler.run()
+                elapsed = time.perf_counter() - start
+            retried = crawler.queue.retried()
+        finally:
+            crawler.queue.close()
+            crawler.state.close()
+            if crawler.search_index:
+                crawler.search_index.close()
+    return crawler, elapsed, sampler.peak_mb, retried
+
+
+def write_report(report: dict, report_file: Optional[str]):
+    if not report_file:
+        return
+    os.makedirs(os.path.dirname(report_file) or '.', exist_ok=True)
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def run_benchmark(notices: int = 100, target_count: Optional[int] = None, latency_ms: float = 0,
+                  results_file: Optional[str] = None, report_file: Optional[str] = None,
+                  headless: bool = True) -> dict:
+    """
+    Crawl the local mock site end to end with the real NuriCrawler and report
+    throughput (notices/min), per-stage timings and peak memory.
+    """
+    target_count = target_count or notices
+    site = MockSite(results_file or default_results_file(), total=notices, latency_ms=latency_ms,
+                    grid_window=MOCK_GRID_WINDOW).start()
+    try:
+        crawler, elapsed, browser_peak_mb, _ = crawl_mock_site(site, target_count, headless)
+    finally:
+        site.stop()
+
+    items = len(crawler.results)
+    report = {
+        'notices': notices,
+        'target_count': target_count,
+        'latency_ms': latency_ms,
+        'items': items,
+        'elapsed_s': round(elapsed, 3),
+        'notices_per_min': round(items / elapsed * 60, 2) if elapsed else 0.0,
+        'http_requests': site.request_count,
+        'memory': {
+            'browser_peak_rss_mb': round(browser_peak_mb, 1),
+            'python_peak_rss_mb': round(_python_peak_rss_mb(), 1),
+        },
+        'metrics': crawler.metrics.summary(),
+    }
+    logger.info(f"Benchmark: {items} notices in {elapsed:.1f}s ({report['notices_per_min']} notices/min)")
+    write_report(report, report_file)
+    return report
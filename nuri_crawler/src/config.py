@@ -27,6 +27,15 @@ SELECTORS = {
             # Try to catch the image button for 'next page' or the li.next
             "next_btn": "#mf_wfm_container_gen44_btn_next_page, .w2pageList_control_next, .w2pageList .w2pageList_next_btn, li.next",
             "page_list": ".w2pageList",
+            "current_page": ".w2pageList_label_selected, .w2pageList .on",  # Active page number
+        },
+        "filters": {
+            # Search form inputs used to narrow the list (sharding / incremental mode)
+            # WebSquare ids vary by release; id-substring fallbacks to be verified.
+            "date_from": "#mf_wfm_container_ibxStrDay, input[id*='StrDay'], input[id*='FromDt']",
+            "date_to": "#mf_wfm_container_ibxEndDay, input[id*='EndDay'], input[id*='ToDt']",
+            "task_category": "#mf_wfm_container_sbxBsnsDvcd, select[id*='BsnsDvcd'], select[id*='Bsns']",  # 업무분류
+            "agency": "#mf_wfm_container_ibxPbancInstNm, input[id*='InstNm']",  # 공고기관
         }
     },
     "detail": {
@@ -55,9 +64,135 @@ SELECTORS = {
 # Crawler Configuration
 TIMEOUT = 30000  # 30 seconds
 HEADLESS = False  # Changed to False for manual execution/debugging
+TARGET_COUNT = 22  # Items collected per crawl run / daemon cycle
 DELAY_BETWEEN_REQUESTS = 2.0  # Seconds - Standard delay
 
+# Run Profiles (main.py --profile NAME): override HEADLESS, TARGET_COUNT,
+# INCREMENTAL_MODE, DELAY_BETWEEN_REQUESTS and concurrency (shard processes /
+# attachment downloads); each command uses only the settings it supports
+RUN_PROFILES = {
+    "dev": {"headless": False, "target_count": TARGET_COUNT},
+    "scheduled": {"headless": True, "target_count": 100, "concurrency": 1, "incremental": True},
+    "backfill": {"headless": True, "target_count": 5000, "concurrency": 4},
+}
+DEFAULT_PROFILE = None  # None = config and command defaults only
+
+# Request Routing (skip assets the crawler never reads)
+BLOCK_RESOURCES = True
+# Playwright resource types let through; everything else is aborted
+ROUTE_ALLOWED_RESOURCE_TYPES = ["document", "script", "xhr", "fetch", "stylesheet", "other"]
+# Always aborted, regardless of type (analytics / trackers)
+ROUTE_BLOCKED_URL_PATTERNS = [
+    r"google-analytics\.com", r"googletagmanager\.com", r"doubleclick\.net",
+    r"/wcs\.naver\.net/", r"nethru", r"/analytics/",
+]
+# Stylesheets kept for WebSquare layout/visibility; other CSS is aborted
+ROUTE_ESSENTIAL_STYLESHEETS = [r"websquare", r"/ui/", r"\.w2"]
+# Average response size per blocked type, used to estimate bytes saved
+ROUTE_ESTIMATED_BYTES = {
+    "image": 15_000, "font": 60_000, "media": 200_000, "stylesheet": 20_000,
+    "script": 30_000, "other": 5_000,
+}
+
+# Daemon Mode (warm browser, scheduled crawl cycles)
+DAEMON_INTERVAL = 3600  # Seconds between cycle starts
+DAEMON_CRON = None  # Optional 5-field cron expression, e.g. "0 * * * *"; overrides the interval
+
+# Memory Watchdog (browser context recycling)
+MEMORY_RSS_LIMIT_MB = 1500  # Renderer process RSS limit (what a context recycle frees)
+MEMORY_RECYCLE_MARGIN_MB = 200  # Recycle again only this far above the RSS left after the last recycle
+MEMORY_HEAP_LIMIT_MB = 300  # Page JS heap limit
+RECYCLE_EVERY_N_ITEMS = 200  # Recycle unconditionally after N notices (0 = never)
+
+# Metrics (per-stage latency, written to the output directory)
+METRICS_REPORT_FILE = "run_report.json"
+METRICS_PROM_FILE = "metrics.prom"  # Prometheus textfile-collector format
+METRICS_PORT = None  # e.g. 9108 to also serve /metrics and /report locally (shard N uses port + N)
+METRICS_RESERVOIR_SIZE = 2048  # Observations kept per stage for quantiles (count/sum/max stay exact)
+
+# Profiling / Diagnostics (opt-in)
+PROFILE_SAMPLE_RATE = 0.0  # Fraction of notices to trace and profile (0 = off)
+DIAGNOSTICS_DIR = "data/diagnostics"  # One sub-directory per run
+DIAGNOSTICS_SLOWEST_N = 20  # Items listed in summary.json
+
+# Soak Test (fault injection on the local mock site)
+# Probability per response of each injected fault
+SOAK_FAULT_RATES = {
+    "missing_list_button": 0.1,  # Detail page without '목록' button
+    "detached_frame": 0.05,  # '목록' replaces the content iframe (frame detaches)
+    "slow_spinner": 0.1,  # List rows appear only after a loading spinner
+    "missing_pagination": 0.1,  # Page links vanish briefly after the list loads
+    "server_error": 0.02,  # HTTP 500 for list/detail pages
+}
+SOAK_SPINNER_MS = 3000
+SOAK_PAGINATION_GAP_MS = 3000
+PAGINATION_RETRY_TIMEOUT = 5000  # ms to wait for vanished page links before giving up
+
+# Field Projection
+# Extract only SELECTORS['detail']['fields_by_label'] labels plus the grids below
+# (skips pairing every label and parsing every grid on the page)
+PROJECTION_MODE = False
+PROJECTION_GRIDS = []  # Grid titles kept in projection mode, e.g. ["투찰제한-지역", "파일첨부"]
+
+# Virtualized Grids
+# WebSquare renders only the visible rows of a w2grid; read the full dataset
+# through the grid component (or scroll-and-collect) in one in-frame call
+GRID_FULL_EXTRACTION = True
+MOCK_GRID_WINDOW = 11  # Rows the mock site renders per grid (bench/soak); the rest via its component API
+
+# Attachments (파일첨부 grid downloads)
+ATTACHMENTS_ENABLED = False
+ATTACHMENT_GRID = "파일첨부"  # Detail-page grid title holding the file links
+ATTACHMENT_WORKERS = 4  # Concurrent downloads
+ATTACHMENT_TIMEOUT = 60  # Seconds per request
+ATTACHMENT_MAX_ATTEMPTS = 3  # Per file, across runs (partial downloads resume)
+ATTACHMENT_CHUNK_SIZE = 64 * 1024
+
+# Search Index (SQLite FTS5, Hangul bigrams)
+SEARCH_INDEX = True  # Index items as they are stored
+SEARCH_DB = "data/search.db"
+SEARCH_AGENCY_FIELDS = ["공고기관", "수요기관", "담당부서"]  # First present field is the agency
+SEARCH_DATE_FIELDS = ["공고일시", "게시일시", "입찰서접수시작일시"]  # First present field is the notice date
+SEARCH_ITEM_GRIDS = {"물품상세내역": "품명", "공사상세내역": "공사명", "용역상세내역": "용역명"}  # Grid -> item name column
+SEARCH_DEADLINE_FIELDS = ["입찰서접수마감일시", "입찰서접수마감일시(연장)"]
+SEARCH_BID_TYPE_FIELD = "공고종류"  # 실공고 / 연습공고 ...
+SEARCH_TASK_CATEGORY_FIELD = "업무분류"  # 물품 / 공사 / 용역 ...
+
+# CSV Export (flattened main CSV + one CSV per sub-grid)
+EXPORT_PRIORITY_FIELDS = ['입찰공고번호', '입찰공고명', '공고명', '수요기관', '공고기관', '계약방법']  # Leading columns
+EXPORT_COMPRESSION = None  # None, "gzip" or "zstd" (needs the zstandard package)
+
+# Read API (local HTTP query service over the search index)
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_PAGE_SIZE = 50
+API_MAX_PAGE_SIZE = 500
+API_CACHE_SIZE = 256  # Hot query responses kept in memory
+
+# Parser Benchmark
+PARSER_CORPUS_DIR = "data/parser_corpus"  # Detail-page HTML fixtures (*.html)
+PARSER_BASELINE_FILE = "data/parser_corpus/baseline.json"  # Machine-specific; created on first run
+PARSER_BENCH_ITERATIONS = 20
+PARSER_REGRESSION_THRESHOLD = 0.15  # Fail when docs/sec drops more than 15% below baseline
+
 # Production Settings
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # Seconds
 MAX_DUPLICATE_LIMIT = 10  # Stop crawling after N consecutive duplicates
+INCREMENTAL_MODE = False  # Use the 입력일시 high-water mark instead of the duplicate heuristic
+
+# Watch Mode (low-latency new-notice polling)
+WATCH_INTERVAL = 30  # Seconds between first-page polls
+
+# Shared State (visited IDs, revisions, high-water mark; safe across concurrent processes)
+STATE_DB = "data/state.db"  # A legacy state.json in the same directory is imported once
+
+# Job Queue (crash-safe detail fetching)
+QUEUE_DB = "data/queue.db"
+JOB_LEASE_SECONDS = 300  # A leased job becomes available again after this
+MAX_JOB_ATTEMPTS = 3  # Jobs failing this many times are marked 'failed'
+
+# Sharded Crawl
+SHARD_PROCESSES = 4  # Worker processes (one browser each)
+SHARD_DAYS = 7  # Width of each date-range shard
+SHARD_TARGET_COUNT = 1000  # Per-shard item limit
@@ -1,21 +1,80 @@
 from playwright.sync_api import sync_playwright, Page, BrowserContext
+import os
+import socket
 import time
 import logging
-from .config import LIST_URL, TIMEOUT, HEADLESS, SELECTORS, DELAY_BETWEEN_REQUESTS, MAX_RETRIES, RETRY_DELAY, MAX_DUPLICATE_LIMIT
+from .config import LIST_URL, TIMEOUT, HEADLESS, SELECTORS, DELAY_BETWEEN_REQUESTS, MAX_RETRIES, RETRY_DELAY, MAX_DUPLICATE_LIMIT, INCREMENTAL_MODE, WATCH_INTERVAL, BLOCK_RESOURCES, METRICS_REPORT_FILE, METRICS_PROM_FILE, PROFILE_SAMPLE_RATE, QUEUE_DB, STATE_DB, PAGINATION_RETRY_TIMEOUT, SEARCH_INDEX, SEARCH_DB, ATTACHMENTS_ENABLED, GRID_FULL_EXTRACTION, TARGET_COUNT, ATTACHMENT_WORKERS
 from .parser import NuriParser
 from .model import BidItem
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
-from .state import StateManager
+from .state import StateManager, normalize_input_date
 from .storage import Storage
+from .jobqueue import JobQueue
+from .search import SearchIndex
+from .attachments import AttachmentDownloader, collect_links, STATUS_DONE, STATUS_NO_URL
+from .routing import ResourceFilter
+from .watchdog import MemoryWatchdog
+from .metrics import Histogram, Metrics, timed
+from .diagnostics import Diagnostics
 
 class NuriCrawler:
-    def __init__(self):
-        self.parser = NuriParser()
+    def __init__(self, shard: Optional[dict] = None, target_count: int = TARGET_COUNT, output_dir: str = "data",
+                 incremental: bool = INCREMENTAL_MODE, profile_rate: float = PROFILE_SAMPLE_RATE,
+                 list_url: str = LIST_URL, headless: bool = HEADLESS, delay: float = DELAY_BETWEEN_REQUESTS,
+                 queue_db: str = QUEUE_DB, state_db: str = STATE_DB, search_db: Optional[str] = SEARCH_DB if SEARCH_INDEX else None,
+                 attachments: bool = ATTACHMENTS_ENABLED, attachment_workers: int = ATTACHMENT_WORKERS,
+                 metrics_port: Optional[int] = None):
+        """
+        Args:
+            shard: Optional {'name': ..., 'filters': {...}} restricting the list search
+            target_count: Stop after collecting this many items
+            output_dir: Directory for result, report and attachment files
+            incremental: Filter the search by the stored 입력일시 high-water mark and stop
+                at older rows, instead of the consecutive-duplicate heuristic
+            profile_rate: Fraction of notices to trace/profile into the diagnostics directory
+            list_url, headless, delay, queue_db, state_db: Overrides for the config defaults
+                (e.g. to run against the local mock site); shards share the same
+                queue and state databases
+            search_db: Full-text index updated as items are stored (None = off)
+            attachments: Download 파일첨부 files into <output_dir>/attachments
+            attachment_workers: Concurrent attachment downloads
+            metrics_port: Serve /metrics and /report on this port (None = off); passed
+                by the entry points so concurrent crawlers never bind the same port
+        """
+        self.parser = NuriParser.from_config()
         self.results = []
-        self.state = StateManager()
+        self.shard = shard or {}
+        self.target_count = target_count
+        self.output_dir = output_dir
+        self.list_url = list_url
+        self.headless = headless
+        self.delay = delay
+        self.state = StateManager(state_db)
+        self.queue = JobQueue(queue_db)
+        self.search_index = SearchIndex(search_db) if search_db else None
+        self.attachments = AttachmentDownloader(
+            self.state, os.path.join(output_dir, "attachments"), attachment_workers
+        ) if attachments else None
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
         self.consecutive_duplicates = 0  # Track consecutive duplicate items
+        self.incremental = incremental
+        self.newest_input_date = None  # Newest 입력일시 seen this run
+        self.reached_end = False  # True once the whole (filtered) list was walked
+        self.input_date_col = next(
+            (idx for idx, name in SELECTORS['list']['columns'].items() if name == 'input_date'), None
+        )
+        self.watch_latencies = Histogram()  # Detection-to-record seconds per item (watch mode)
+        self.watchdog = MemoryWatchdog()
+        self.metrics = Metrics()
+        self.resource_filter = ResourceFilter(metrics=self.metrics) if BLOCK_RESOURCES else None
+        if metrics_port:
+            self.metrics.serve(metrics_port)
+        self.diagnostics = Diagnostics(profile_rate)
+        self.stop_requested = False  # Set by the daemon for graceful shutdown
+        self.session = None  # (browser, context, page, target_frame) kept warm across cycles
 
     def _retry(self, func, description, *args, **kwargs):
         """Retry a function with exponential backoff"""
@@ -32,6 +91,7 @@ class NuriCrawler:
         logger.error(f"{description} failed after {MAX_RETRIES} attempts.")
         raise last_exception
 
+    @timed("frame_discovery")
     def _find_content_frame(self, page: Page):
         """Find the main content frame containing the grid."""
         target_frame = None
@@ -76,12 +136,13 @@ class NuriCrawler:
                 time.sleep(2)
         return None
 
+    @timed("navigation")
     def _navigate_to_list(self, page: Page):
         """Navigate to the list page from scratch (URL -> Popups -> Menu)."""
-        logger.info(f"Navigating to {LIST_URL}...")
+        logger.info(f"Navigating to {self.list_url}...")
         try:
             # 1. Goto URL
-            self._retry(lambda: page.goto(LIST_URL, timeout=TIMEOUT), "Navigate to URL")
+            self._retry(lambda: page.goto(self.list_url, timeout=TIMEOUT), "Navigate to URL")
             page.wait_for_load_state('networkidle')
             
             # 2. Close Popups
@@ -162,142 +223,974 @@ class NuriCrawler:
             logger.error(f"Navigation failed: {e}")
             return None
 
-    def run(self):
-        with sync_playwright() as p:
-            # Enhanced Browser Launch for WebSquare Compatibility
-            browser = p.chromium.launch(
-                headless=HEADLESS,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-infobars',
-                    '--window-size=1920,1080',
-                ],
-                ignore_default_args=["--enable-automation"]
-            )
-            context = browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36',
-                locale='ko-KR',
-                timezone_id='Asia/Seoul'
-            )
-            
-            page = context.new_page()
-            
-            # Initial Navigation
-            target_frame = self._navigate_to_list(page)
-            if not target_frame:
-                logger.error("Initial navigation failed. Exiting.")
-                browser.close()
-                return
+    def _search_filters(self) -> dict:
+        """Search form filters for this run: shard filters plus the incremental date cutoff."""
+        filters = dict(self.shard.get('filters', {}))
+        if self.incremental and self.state.high_water_mark and 'date_from' not in filters:
+            # Site filters by day; same-day rows at or below the mark are skipped per row
+            filters['date_from'] = self.state.high_water_mark.split(" ")[0]
+        return filters
 
-            # 6. Click Search Button (Crucial Step)
-            logger.info("Clicking Search Button to load data...")
+    def _apply_search_filters(self, target_frame, filters: dict):
+        """Fill the list search form (date range, 업무분류, 공고기관) before clicking search."""
+        filter_selectors = SELECTORS['list'].get('filters', {})
+        for key, value in filters.items():
+            selector = filter_selectors.get(key)
+            if not selector or value in (None, ""):
+                continue
             try:
-                search_btn = target_frame.locator(SELECTORS['list']['search_btn'])
-                if search_btn.count() > 0:
-                    # Retry search button click
-                    self._retry(lambda: search_btn.first.click(), "Search button click")
-                    
-                    page.wait_for_load_state('networkidle')
-                    # Wait specifically for rows to appear
-                    logger.info("Waiting for grid rows...")
-                    try:
-                        target_frame.locator(SELECTORS['list']['grid_row']).first.wait_for(state="visible", timeout=10000)
-                    except:
-                        logger.warning("Timeout waiting for first row.")
+                field = target_frame.locator(selector).first
+                if field.count() == 0:
+                    logger.warning(f"Search filter '{key}' not found on list page.")
+                    continue
+                tag = field.evaluate("el => el.tagName.toLowerCase()")
+                if tag == "select":
+                    field.select_option(label=str(value))
                 else:
-                    logger.warning("Search button not found with configured selector.")
-                    
+                    field.fill(str(value))
+                    field.press("Tab")  # Commit value to the WebSquare component
+                logger.info(f"Applied search filter {key}={value}")
             except Exception as e:
-                logger.error(f"Failed to click search button: {e}")
-            
+                logger.warning(f"Failed to apply search filter {key}: {e}")
 
+    def _launch_browser(self, p):
+        """Launch Chromium with a context/page configured for WebSquare."""
+        browser = self._start_browser(p.chromium)
+        context, page = self._new_context(browser)
+        return browser, context, page
 
-            # Pagination Loop
-            TARGET_COUNT = 22
-            page_num = 1
-            stop_crawling = False
-            
-            while len(self.results) < TARGET_COUNT:
-                if stop_crawling:
-                     break
-                     
-                logger.info(f"Processing Page {page_num}...")
-                
-                # Ensure frame is valid
-                if not target_frame or target_frame.is_detached():
-                     target_frame = self._find_content_frame(page)
-                
-                if not target_frame:
-                     logger.error("Content frame not found. Stopping.")
-                     break
+    def _start_browser(self, browser_type):
+        # Enhanced Browser Launch for WebSquare Compatibility
+        return browser_type.launch(
+            headless=self.headless,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--no-sandbox',
+                '--disable-setuid-sandbox',
+                '--disable-infobars',
+                '--window-size=1920,1080',
+            ],
+            ignore_default_args=["--enable-automation"]
+        )
+
+    def _new_context(self, browser):
+        """Open a fresh context and page on an existing browser."""
+        context = browser.new_context(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36',
+            locale='ko-KR',
+            timezone_id='Asia/Seoul'
+        )
+        if self.resource_filter:
+            self.resource_filter.install(context)
+
+        page = context.new_page()
+        return context, page
+
+    def _recycle_context(self, browser, context, page_num: int, reason: str):
+        """
+        Tear down the context to release renderer memory, then re-enter the list
+        and restore page_num. If that leaves the renderer RSS over its limit,
+        the whole browser is restarted as well. Returns (browser, context, page,
+        target_frame); target_frame is None if the list could not be restored.
+        """
+        logger.warning(f"Recycling browser context ({reason}). Restoring page {page_num}...")
+        try:
+            context.close()
+        except Exception as e:
+            logger.warning(f"Context close failed: {e}")
+
+        context, page = self._new_context(browser)
+        target_frame = self._restore_list(page, page_num)
+        self.watchdog.reset(page)
+        if self.watchdog.restart_needed:
+            logger.warning(f"Renderer RSS still {self.watchdog.baseline['rss_mb']:.0f} MB after recycle. "
+                           f"Restarting the browser...")
+            browser_type = browser.browser_type
+            try:
+                browser.close()
+            except Exception as e:
+                logger.warning(f"Browser close failed: {e}")
+            browser = self._start_browser(browser_type)
+            context, page = self._new_context(browser)
+            target_frame = self._restore_list(page, page_num)
+            self.watchdog.reset(page, restarted=True)
+            self.metrics.incr("browser_restarts")
+        if target_frame:
+            logger.info(f"✓ Context recycled (#{self.watchdog.recycle_count}), back on page {page_num}.")
+        return browser, context, page, target_frame
+
+    def _restore_list(self, page: Page, page_num: int):
+        """Open the list in a fresh page and go to page_num. Returns the frame, or None."""
+        target_frame = self._navigate_to_list(page)
+        if not target_frame:
+            return None
+        self._click_search(page, target_frame)
+        if not self._goto_page(page, target_frame, page_num):
+            logger.error(f"Could not restore page {page_num} after recycle.")
+            return None
+        return target_frame
+
+    def _current_page_number(self, target_frame) -> Optional[int]:
+        """Active page number of the list pagination, or None if it cannot be read."""
+        try:
+            current = target_frame.locator(SELECTORS['list']['pagination']['current_page']).first
+            if current.count() == 0:
+                return None
+            text = current.inner_text().strip()
+            return int(text) if text.isdigit() else None
+        except Exception:
+            return None
+
+    def _is_last_page(self, target_frame, page_num: int) -> bool:
+        """
+        True only if the pagination shows page_num as the active page with no
+        higher page link and no next-block button (a real end of the list, as
+        opposed to pagination that failed or has not rendered).
+        """
+        if self._current_page_number(target_frame) != page_num:
+            return False
+        try:
+            higher = target_frame.evaluate(
+                """(n) => Array.from(document.querySelectorAll('.w2pageList a[index]'))
+                    .some((a) => parseInt(a.getAttribute('index'), 10) > n)""",
+                page_num
+            )
+            next_btn = target_frame.locator(SELECTORS['list']['pagination']['next_btn']).first
+            return not higher and not (next_btn.count() > 0 and next_btn.is_visible())
+        except Exception:
+            return False
+
+    def _goto_page(self, page: Page, target_frame, page_num: int) -> bool:
+        """
+        Move a freshly searched list (on page 1) to page_num and verify the active
+        page number, since the 'Next' arrow fallback may land on another page.
+        """
+        if page_num <= 1:
+            return True
+        # Direct jump works while the page link is in the visible block (1-10)
+        if self._goto_next_page(page, target_frame, page_num - 1) and \
+                self._current_page_number(target_frame) == page_num:
+            return True
+
+        # Search again (back to page 1) and step one verified page at a time
+        logger.warning(f"Direct jump to page {page_num} not confirmed. Stepping from page 1...")
+        self._click_search(page, target_frame)
+        for current in range(1, page_num):
+            if not self._goto_next_page(page, target_frame, current):
+                logger.error(f"Could not reach page {page_num} (stuck at {current}).")
+                return False
+            landed = self._current_page_number(target_frame)
+            if landed != current + 1:
+                logger.error(f"Expected page {current + 1} but the list shows page {landed}.")
+                return False
+        return True
 
-                # 7. Dynamic Grid Discovery (Re-run for each page)
-                logger.info("Locating Grid in Frame...")
-                rows_locator = None
+    def _click_search(self, page: Page, target_frame):
+        """Apply search filters and click the search button to load the grid."""
+        logger.info("Clicking Search Button to load data...")
+        try:
+            filters = self._search_filters()
+            if filters:
+                logger.info(f"Applying search filters: {filters}")
+                self._apply_search_filters(target_frame, filters)
+
+            search_btn = target_frame.locator(SELECTORS['list']['search_btn'])
+            if search_btn.count() > 0:
+                # Retry search button click
+                self._retry(lambda: search_btn.first.click(), "Search button click")
+
+                page.wait_for_load_state('networkidle')
+                # Wait specifically for rows to appear
+                logger.info("Waiting for grid rows...")
                 try:
-                    # Strategy A: Find by Header Text "입찰공고번호" inside frame
-                    if target_frame.get_by_text("입찰공고번호").count() > 0:
-                        # Try multiple selectors for WebSquare grids
-                        grid_selectors = [
-                            ".w2grid_body tbody tr",
-                            ".w2grid tbody tr", 
-                            "tbody tr",
-                        ]
-                        
-                        for selector in grid_selectors:
-                            test_rows = target_frame.locator(selector)
-                            row_count = test_rows.count()
-                            if row_count > 0:
-                                rows_locator = test_rows
-                                logger.info(f"✓ Using selector: {selector}")
-                                break
-                    
-                    # Strategy B: Fallback to Config Selector
-                    if not rows_locator:
-                        rows_locator = target_frame.locator(SELECTORS['list']['grid_row'])
-                    
-                    # Check if we have rows
-                    count = rows_locator.count()
-                    logger.info(f"Found {count} rows on page {page_num}")
-                    
-                    if count == 0:
-                        logger.warning("No rows found. Stopping.")
+                    target_frame.locator(SELECTORS['list']['grid_row']).first.wait_for(state="visible", timeout=10000)
+                except:
+                    logger.warning("Timeout waiting for first row.")
+            else:
+                logger.warning("Search button not found with configured selector.")
+
+        except Exception as e:
+            logger.error(f"Failed to click search button: {e}")
+
+    def _locate_rows(self, target_frame, page_num: int = 1):
+        """Locate list grid rows. Returns (rows_locator, count); count is -1 on failure."""
+        logger.info("Locating Grid in Frame...")
+        rows_locator = None
+        try:
+            # Strategy A: Find by Header Text "입찰공고번호" inside frame
+            if target_frame.get_by_text("입찰공고번호").count() > 0:
+                # Try multiple selectors for WebSquare grids
+                grid_selectors = [
+                    ".w2grid_body tbody tr",
+                    ".w2grid tbody tr", 
+                    "tbody tr",
+                ]
+
+                for selector in grid_selectors:
+                    test_rows = target_frame.locator(selector)
+                    row_count = test_rows.count()
+                    if row_count > 0:
+                        rows_locator = test_rows
+                        logger.info(f"✓ Using selector: {selector}")
                         break
 
-                except Exception as e:
-                    logger.error(f"Grid location failed: {e}")
-                    break
-                
-                # Process Rows on Current Page
-                # Data Loading Wait: Ensure first row has text
+            # Strategy B: Fallback to Config Selector
+            if not rows_locator:
+                rows_locator = target_frame.locator(SELECTORS['list']['grid_row'])
+
+            # Check if we have rows
+            count = rows_locator.count()
+            logger.info(f"Found {count} rows on page {page_num}")
+
+            if count == 0:
+                logger.warning("No rows found. Stopping.")
+            return rows_locator, count
+
+        except Exception as e:
+            logger.error(f"Grid location failed: {e}")
+            return None, -1
+
+    def _fetch_detail(self, page: Page, target_frame, row, i: int, bid_no: str) -> BidItem:
+        """Open the detail view for a list row and parse it."""
+        # Strategy: Find clickable link in row
+        link = None
+
+        # 1. Try to find any visible anchor tag in the row
+        anchors = row.locator('a')
+        anchor_count = anchors.count()
+
+        if anchor_count > 0:
+            # Find first visible anchor (skip hidden ones)
+            for j in range(anchor_count):
+                try:
+                    candidate = anchors.nth(j)
+                    if candidate.is_visible(timeout=1000):
+                        link = candidate
+                        break
+                except:
+                    continue
+
+        # 2. If no visible anchor found, try clicking specific td columns
+        if not link:
+            # Try different columns (skip nth(2) which might be fixed)
+            for col_idx in [1, 3, 4]:  # Try columns 2, 4, 5
                 try:
-                    for _ in range(10):
-                        if rows_locator.first.inner_text().strip():
+                    td = row.locator('td').nth(col_idx)
+                    if td.count() > 0:
+                        td_anchor = td.locator('a').first
+                        if td_anchor.count() > 0 and td_anchor.is_visible(timeout=1000):
+                            link = td_anchor
                             break
-                        time.sleep(0.5)
+                except:
+                    continue
+
+        # 3. Last resort: click the row itself
+        if not link:
+            logger.warning(f"No anchor found in row {i}, clicking row itself")
+            link = row
+
+        link_text = link.inner_text().strip() if link else ""
+        logger.info(f"Processing row {i}: {link_text[:50]}... (Bid: {bid_no})")
+
+        # Scroll into view before clicking
+        try:
+            link.scroll_into_view_if_needed(timeout=3000)
+        except:
+            pass
+
+        # Click with timeout and force fallback
+        click_start = time.perf_counter()
+        try:
+            self._retry(lambda: link.click(timeout=10000), "Click row link")
+        except Exception as click_error:
+            logger.warning(f"Normal click failed, trying force click: {click_error}")
+            link.click(force=True)
+
+        # Wait for the detail page content to load in the frame
+        try:
+            target_frame.wait_for_selector("label:has-text('입찰공고번호')", timeout=15000)
+            time.sleep(1)
+        except Exception as wait_error:
+            logger.warning(f"Timeout waiting for detail content: {wait_error}")
+            self.metrics.incr("detail_wait_timeout")
+        self.metrics.observe("detail_ready", time.perf_counter() - click_start)
+
+        detail_url = target_frame.url
+        if self.attachments:
+            self._queue_attachments(page, target_frame, bid_no)
+
+        # Field projection without grids: read the label/span pairs in the frame
+        # instead of serializing and re-parsing the whole page
+        if self.parser.fields and self.parser.grids == set() and not self.diagnostics.sampled:
+            try:
+                with self.metrics.stage("content"):
+                    data = self._extract_fields_in_frame(target_frame, self.parser.fields)
+                return self.parser.build_item(data, detail_url)
+            except Exception as e:
+                logger.warning(f"In-frame extraction failed for {bid_no}, parsing HTML instead: {e}")
+
+        # Virtualized grids only have their visible rows in the DOM: read the full datasets first
+        grid_rows = None
+        if GRID_FULL_EXTRACTION and self.parser.grids != set():
+            try:
+                with self.metrics.stage("grid_data"):
+                    datasets = self._extract_grids_in_frame(target_frame, self.parser.grids)
+                grid_rows = {}
+                for grid_id, dataset in datasets.items():
+                    grid_rows[grid_id] = dataset['rows']
+                    hidden = len(dataset['rows']) - dataset['dom_rows']
+                    if hidden > 0:
+                        self.metrics.incr("grid_rows_recovered", hidden, source=dataset['source'])
+            except Exception as e:
+                logger.warning(f"Full grid extraction failed for {bid_no}, using rendered rows: {e}")
+
+        # Get the detail page content from the frame
+        with self.metrics.stage("content"):
+            detail_html = target_frame.content()
+        self.diagnostics.save_html(detail_html)
+
+        # Retry parsing if it fails? (Usually CPU bound, not network, but maybe good for robustness)
+        try:
+            with self.metrics.stage("parse"), self.diagnostics.profile("parse"):
+                item = self.parser.parse_detail(detail_html, detail_url, grid_rows=grid_rows)
+        except Exception as parse_e:
+            logger.error(f"Parsing failed for {bid_no}: {parse_e}")
+            self.metrics.incr("parse_errors")
+            item = BidItem(bid_no='', bid_name='') # Empty item
+
+        return item
+
+    def _queue_attachments(self, page: Page, target_frame, bid_no: str):
+        """Hand the detail page's file links to the download pool (script-only links are clicked)."""
+        try:
+            with self.metrics.stage("attachments"):
+                links = collect_links(target_frame)
+                if not links:
+                    return
+                self.attachments.set_session(page.context.cookies(), referer=page.url,
+                                             user_agent=page.evaluate("navigator.userAgent"))
+                for link in links:
+                    if link['url']:
+                        self.attachments.submit(bid_no, link['name'], link['url'])
+                        continue
+                    # WebSquare download handlers have no href: let the browser fetch it
+                    key = f"{bid_no}#{link['name']}"
+                    if (self.state.attachment(key) or {}).get('status') == STATUS_DONE:
+                        continue
+                    try:
+                        with page.expect_download(timeout=TIMEOUT) as download_info:
+                            target_frame.locator(f"[data-nuri-attachment='{link['index']}']").click(timeout=5000)
+                        download = download_info.value
+                        self.attachments.store_file(bid_no, link['name'], key, download.path())
+                        download.delete()
+                    except Exception as e:
+                        self.state.record_attachment(key, bid_no=bid_no, name=link['name'], status=STATUS_NO_URL,
+                                                     error=str(e))
+                        logger.warning(f"Could not download attachment {link['name']} ({bid_no}): {e}")
+        except Exception as e:
+            logger.warning(f"Attachment discovery failed for {bid_no}: {e}")
+
+    @staticmethod
+    def _extract_fields_in_frame(target_frame, fields) -> dict:
+        """Pair w2textbox labels with the following span in the frame, stopping once all fields are found."""
+        js_code = """(wanted) => {
+            const remaining = new Set(wanted);
+            const data = {};
+            let key = null;
+            for (const el of document.querySelectorAll('label.w2textbox, span.w2textbox')) {
+                const text = el.textContent.trim();
+                if (!text) continue;
+                if (el.tagName === 'LABEL') {
+                    key = text;
+                } else if (key !== null) {
+                    if (remaining.delete(key)) {
+                        data[key] = text;
+                        if (remaining.size === 0) break;
+                    }
+                    key = null;
+                }
+            }
+            return data;
+        }"""
+        return target_frame.evaluate(js_code, sorted(fields))
+
+    @staticmethod
+    def _extract_grids_in_frame(target_frame, grids=None) -> dict:
+        """
+        Full row data of every w2grid in the frame (only the titles in `grids`,
+        if given), keyed by grid element id: {'rows', 'dom_rows', 'source'}.
+
+        WebSquare renders only the visible rows, so rows are read from the grid
+        component (getTotalRow / getCellDisplayData); grids without a reachable
+        component are scrolled through, waiting one render frame per step.
+        Grids whose rows are all rendered are left to the HTML parser.
+        """
+        js_code = """async ({wanted, maxSteps}) => {
+            const only = wanted ? new Set(wanted) : null;
+            const cellText = (td) => {
+                const el = td.querySelector('nobr, span, input');
+                return (el || td).textContent.trim();
+            };
+            const domRows = (grid) => {
+                const body = grid.querySelector('.w2grid_body_table, .w2grid_body table');
+                const trs = body ? body.querySelectorAll('tr') : grid.querySelectorAll('tbody tr, .w2grid_body tr');
+                return Array.from(trs).filter((tr) => tr.querySelector('td'));
+            };
+            const toRow = (tr, headers) => {
+                const row = {};
+                Array.from(tr.querySelectorAll('td')).slice(0, headers.length)
+                    .forEach((td, i) => { row[headers[i]] = cellText(td); });
+                return row;
+            };
+            const component = (id) => {
+                try {
+                    if (window.$p && $p.getComponentById) return $p.getComponentById(id);
+                    if (window.WebSquare && WebSquare.util) return WebSquare.util.getComponentById(id);
+                } catch (e) {}
+                return null;
+            };
+            const fromComponent = (comp, headers) => {
+                if (!comp || typeof comp.getTotalRow !== 'function') return null;
+                const read = typeof comp.getCellDisplayData === 'function' ? 'getCellDisplayData' : 'getCellData';
+                // Map the visible columns onto the rendered header cells
+                const cols = [];
+                const count = typeof comp.getColumnCount === 'function' ? comp.getColumnCount() : headers.length;
+                for (let c = 0; c < count && cols.length < headers.length; c++) {
+                    if (typeof comp.getColumnVisible === 'function' && comp.getColumnVisible(c) === false) continue;
+                    cols.push(c);
+                }
+                const rows = [];
+                for (let r = 0, total = comp.getTotalRow(); r < total; r++) {
+                    const row = {};
+                    cols.forEach((c, i) => {
+                        const value = comp[read](r, c);
+                        row[headers[i]] = value == null ? '' : String(value).trim();
+                    });
+                    rows.push(row);
+                }
+                return rows;
+            };
+            const fromScroll = async (grid, headers) => {
+                const scroller = grid.querySelector('.w2grid_scrollY, .w2grid_body');
+                if (!scroller || scroller.scrollHeight <= scroller.clientHeight) return null;
+                const seen = new Map();
+                const collect = () => domRows(grid).forEach((tr) => {
+                    const key = tr.getAttribute('data-rowindex') ?? tr.getAttribute('rowindex') ?? tr.textContent;
+                    if (!seen.has(key)) seen.set(key, toRow(tr, headers));
+                });
+                const nextFrame = () => new Promise((resolve) => requestAnimationFrame(() => requestAnimationFrame(resolve)));
+                collect();
+                for (let step = 0, last = -1; step < maxSteps && scroller.scrollTop !== last; step++) {
+                    last = scroller.scrollTop;
+                    scroller.scrollTop += scroller.clientHeight;
+                    await nextFrame();
+                    collect();
+                }
+                scroller.scrollTop = 0;
+                return Array.from(seen.values());
+            };
+
+            const results = {};
+            let title = '';
+            const nodes = document.querySelectorAll(
+                'div.df_tit, div.tit, div.w2textbox, h3.df_tit, h3.tit, h4.df_tit, h4.tit, div.w2grid');
+            for (const el of nodes) {
+                if (!el.classList.contains('w2grid')) {
+                    title = el.textContent.trim();
+                    continue;
+                }
+                if (!el.id || (only && !only.has(title))) continue;
+                let heads = el.querySelectorAll('.w2grid_head_sort_div_main_outer nobr');
+                if (!heads.length) heads = el.querySelectorAll('thead th, .w2grid_hRow td');
+                const headers = Array.from(heads, (h) => h.textContent.trim());
+                if (!headers.length) continue;
+                const rendered = domRows(el).length;
+                let rows = fromComponent(component(el.id), headers);
+                let source = 'component';
+                if (rows === null) {
+                    rows = await fromScroll(el, headers);
+                    source = 'scroll';
+                }
+                if (rows !== null && rows.length > rendered) {
+                    results[el.id] = {rows, dom_rows: rendered, source};
+                }
+            }
+            return results;
+        }"""
+        return target_frame.evaluate(js_code, {'wanted': sorted(grids) if grids is not None else None,
+                                               'maxSteps': 500})
+
+    def _store_item(self, bid_no: str, item: BidItem) -> bool:
+        """Record a parsed item in the queue, state and result files."""
+        if item.bid_no:
+            # Amended notice: record the per-field delta (raw_data stays complete)
+            changes = self.state.revision_changes(item)
+            if changes is not None:
+                logger.info(f"Revision {item.bid_no} of {changes['previous_revision']}: "
+                            f"{len(changes['changed'])} changed, {len(changes['removed'])} removed fields")
+                item.previous_revision = changes['previous_revision']
+                item.changed_fields = changes['changed']
+                item.removed_fields = changes['removed']
+
+            # Baseline before the result: if the result is never committed (crash,
+            # lost lease), the refetched revision is diffed against the one before it
+            self.state.record_revision(item)
+            # Result write and job completion are one transaction
+            with self.metrics.stage("queue_complete"):
+                completed = self.queue.complete(bid_no, self.worker_id, item)
+            if not completed:
+                # Lease expired and another worker took the job: its result wins
+                logger.warning(f"Discarding {item.bid_no}: lease for job {bid_no} was lost")
+                self.state.release(bid_no, self.worker_id)
+                self.metrics.incr("items_failed", reason="lease_lost")
+                return False
+            self.results.append(item)
+            self.state.mark_visited(item.bid_no)
+            if item.bid_no != bid_no:
+                self.state.release(bid_no, self.worker_id)
+            with self.metrics.stage("state_save"):
+                self.state.save_state()  # Save state incrementally
+            logger.info(f"✓ Parsed: {item.bid_no} - {item.bid_name} ({len(self.results)}/{self.target_count})")
+            self.metrics.incr("items_stored")
+
+            # Incremental Save
+            try:
+                with self.metrics.stage("storage_write"), self.diagnostics.profile("storage"):
+                    Storage.save_json(self.results, os.path.join(self.output_dir, "results.json"))
+            except Exception as e:
+                logger.error(f"Incremental save failed: {e}")
+
+            if self.search_index:
+                try:
+                    with self.metrics.stage("search_index"):
+                        self.search_index.add([item])
+                except Exception as e:
+                    logger.error(f"Search indexing failed for {item.bid_no}: {e}")
+            return True
+        else:
+            logger.warning(f"Failed to extract bid_no from detail page")
+            self.queue.fail(bid_no, self.worker_id, "Empty bid_no in detail page")
+            self.state.release(bid_no, self.worker_id)
+            self.metrics.incr("items_failed", reason="empty_bid_no")
+            return False
+
+    def _return_to_list(self, page: Page, target_frame):
+        """Navigate back from a detail view to the list (list button -> back -> soft -> hard recovery)."""
+        back_success = False
+        strategy = None  # Strategy that brought us back, for recovery metrics
+        back_start = time.perf_counter()
+
+        # Strategy 1: Click 'List' button in Detail Page (Best for WebSquare)
+        try:
+            # Verify frame is still attached
+            if target_frame.is_detached():
+                target_frame = self._find_content_frame(page)
+
+            if target_frame:
+                list_btn_selector = SELECTORS['detail'].get('list_btn')
+                if list_btn_selector:
+                    list_btn = target_frame.locator(list_btn_selector).first
+                    if list_btn.is_visible(timeout=2000):
+                        logger.info("Clicking 'List' button on detail page...")
+                        list_btn.click()
+                        back_success = True
+                        strategy = "list_button"
+        except Exception as e:
+            logger.warning(f"List button strategy failed: {e}")
+
+        # Strategy 2: Browser Back (History)
+        if not back_success:
+            logger.info("List button not found/clicked. Trying browser back...")
+            try:
+                page.go_back()
+                back_success = True
+                strategy = "browser_back"
+            except Exception as e:
+                logger.warning(f"Browser back failed: {e}")
+
+        # Verification & Recovery
+        try:
+            # Re-locate frame if needed
+            if target_frame.is_detached():
+                target_frame = self._find_content_frame(page)
+
+            if target_frame:
+                # Check if we are back on list
+                try:
+                    # Wait for search button or grid to confirm list page
+                    target_frame.wait_for_selector(SELECTORS['list']['search_btn'], timeout=3000)
+                    logger.info("✓ Returned to list page (verified).")
+                    back_success = True
+
+                    # Ensure Grid is Visible again
+                    try:
+                        target_frame.locator(SELECTORS['list']['grid_row']).first.wait_for(state="visible", timeout=3000)
+                    except:
+                        logger.warning("Grid rows not immediately visible, might need search click.")
+
+                except:
+                    back_success = False # Verification failed
+
+            # Strategy 3: Soft Recovery (Menu Click)
+            if not back_success:
+                logger.warning("Still on detail page or lost. Executing SOFT RECOVERY (Menu Click)...")
+                try:
+                    menu_3 = page.locator("a.depth3").filter(has_text="입찰공고목록").first
+                    if menu_3.is_visible():
+                        menu_3.click()
+                        logger.info("Clicked menu item. Waiting for list...")
+                        # Wait for list to load
+                        target_frame = self._find_content_frame(page) # Re-find frame
+                        if target_frame:
+                            target_frame.wait_for_selector(SELECTORS['list']['search_btn'], timeout=5000)
+                            logger.info("✓ SOFT RECOVERY SUCCESS: Menu click returned to list.")
+                            back_success = True
+                            strategy = "soft_recovery"
+                except Exception as e:
+                    logger.warning(f"Soft recovery failed: {e}")
+
+            # Strategy 4: Hard Recovery (Full Reset) - Last Resort
+            if not back_success:
+                logger.error("All back strategies failed. Executing HARD RECOVERY (Full Restart & Navigation)...")
+                # FORCE RECOVERY: Call _navigate_to_list to reset everything
+                try:
+                    # Refresh page and re-do menu
+                    new_frame = self._navigate_to_list(page)
+                    if new_frame:
+                        target_frame = new_frame
+                        # Search again (filters included) so the grid has data
+                        self._click_search(page, target_frame)
+
+                        logger.info("✓ HARD RECOVERY SUCCESS: Full navigation reset completed.")
+                        back_success = True
+                        strategy = "hard_recovery"
+
+                        # Reset page_num logic because hard recovery usually resets pagination to 1
+                        # If we were on page 2, we are now on page 1.
+                        # This is a limitation of hard recovery.
+                        logger.warning("Hard recovery resets pagination. Crawler might re-process page 1.")
+
+                    else:
+                        logger.error("Recovery failed: Reference frame not found.")
+                except Exception as recovery_e:
+                    logger.error(f"Recovery failed: {recovery_e}")
+
+        except Exception as e:
+            logger.error(f"Failed to verify/recover list state: {e}")
+
+        if not back_success:
+            strategy = "failed"
+        self.metrics.observe("back_navigation", time.perf_counter() - back_start, strategy=strategy)
+        self.metrics.incr("recovery", strategy=strategy)
+        return target_frame
+
+    def _wait_for_page_link(self, target_frame, next_page: int) -> bool:
+        """Give vanished pagination links (still re-rendering) a moment to come back."""
+        try:
+            with self.metrics.stage("pagination_wait"):
+                target_frame.wait_for_selector(f"a[index='{next_page}']", state="visible", timeout=PAGINATION_RETRY_TIMEOUT)
+            logger.info(f"Page link {next_page} reappeared. Retrying pagination...")
+            return True
+        except Exception:
+            return False
+
+    @timed("pagination")
+    def _goto_next_page(self, page: Page, target_frame, page_num: int) -> bool:
+        """Click through to page_num + 1. Returns True on success."""
+        logger.info("Attempting to move to next page...")
+        pagination_success = False
+
+        try:
+            # Strategy 1: removed (generic next buttons often skip to next block 1->11)
+            # We will rely solely on explicit page number clicking below
+            pass
+
+            # Strategy 2: Click page number using index attribute (accurate page selection)
+            if not pagination_success:
+                try:
+                    next_page = page_num + 1
+                    logger.info(f"Trying to find page {next_page}...")
+
+                    # Simplified Pagination Strategy
+
+                    # Strategy 1: Find by exact text and click (Most robust)
+                    try:
+                        # Try locating by index attribute (from user feedback)
+                        # <a id="mf_wfm_container_pagelist_page_2" index="2" ...>2</a>
+                        page_link_index = target_frame.locator(f"a[index='{next_page}']").first
+                        if page_link_index.count() > 0 and page_link_index.is_visible():
+                             logger.info(f"Found page {next_page} by index='{next_page}'. Clicking...")
+                             page_link_index.click()
+                             pagination_success = True
+                        else:
+                             # Try locating by ID pattern
+                             page_link_id = target_frame.locator(f"#mf_wfm_container_pagelist_page_{next_page}").first
+                             if page_link_id.count() > 0:
+                                  logger.info(f"Found page {next_page} by ID. Clicking...")
+                                  page_link_id.click()
+                                  pagination_success = True
+                             else:
+                                  # Try locating by text directly
+                                  page_link = target_frame.locator(f"a:text-is('{next_page}')").first
+                                  if page_link.count() > 0 and page_link.is_visible():
+                                       logger.info(f"Found page {next_page} by text-is. Clicking...")
+                                       page_link.click()
+                                       pagination_success = True
+                                  else:
+                                       # Try with specific classes if generic fails
+                                       candidate = target_frame.locator(f".w2pageList_label:text-is('{next_page}')").first
+                                       if candidate.count() > 0:
+                                            candidate.click()
+                                            pagination_success = True
+                                       else:
+                                            # Try partial text allowing for whitespace
+                                            candidate_lax = target_frame.locator(f"a:has-text('{next_page}')").filter(has_text=f"^{next_page}$").first
+                                            if candidate_lax.count() > 0:
+                                                candidate_lax.click()
+                                                pagination_success = True
+                    except Exception as e:
+                        logger.warning(f"Standard pagination click failed: {e}")
+
+                    # Strategy 2: 'Next' Image Button (Arrow)
+                    if not pagination_success:
+                        try:
+                            next_btn = target_frame.locator(SELECTORS['list']['pagination']['next_btn']).first
+                            if next_btn.count() > 0 and next_btn.is_visible():
+                                 logger.info("Clicking 'Next' button...")
+                                 next_btn.click()
+                                 pagination_success = True
+                        except Exception as e:
+                            logger.warning(f"Next button strategy failed: {e}")
+
+                    # Strategy 3: Javascript Fallback (Simpler)
+                    if not pagination_success:
+                        try:
+                            # Try by ID specifically in JS
+                            js_code_id = f"""() => {{
+                                const el = document.getElementById('mf_wfm_container_pagelist_page_{next_page}');
+                                if (el) {{
+                                    el.click();
+                                    return true;
+                                }}
+                                return false;
+                            }}"""
+                            if target_frame.evaluate(js_code_id):
+                                 logger.info(f"Clicked page {next_page} via JS ID fallback.")
+                                 pagination_success = True
+                            else:
+                                # Generic JS
+                                js_code = f"""() => {{
+                                    const links = document.querySelectorAll('a, li, div');
+                                    for (const link of links) {{
+                                        if (link.innerText.trim() === '{next_page}' && link.offsetParent !== null) {{
+                                            link.click();
+                                            return true;
+                                        }}
+                                    }}
+                                    return false;
+                                }}"""
+                                if target_frame.evaluate(js_code):
+                                    logger.info(f"Clicked page {next_page} via JS fallback.")
+                                    pagination_success = True
+                        except Exception as e:
+                            logger.warning(f"JS fallback failed: {e}")
+
+                    if pagination_success:
+                        page.wait_for_load_state('networkidle')
+                        time.sleep(3)
+                    else:
+                        logger.warning(f"Could not find link for page {next_page}")
+                        # Debug: Print available numbers
+                        try:
+                             texts = target_frame.locator(".w2pageList_label, .w2pageList a").all_inner_texts()
+                             logger.info(f"Visible generic pagination links: {texts}")
+                        except: pass
+
+                except Exception as e:
+                    logger.debug(f"Page number strategy failed: {e}")
+
+            if not pagination_success:
+                logger.info("Could not find or click pagination button.")
+                # Dump HTML for debugging
+                try:
+                    html = target_frame.content()
+                    with open(os.path.join(self.output_dir, "debug_pagination.html"), "w", encoding="utf-8") as f:
+                        f.write(html)
+                    logger.info("Saved debug_pagination.html")
                 except: pass
+            return pagination_success
 
-                processed_on_page = 0
-                for i in range(count):
-                    if len(self.results) >= TARGET_COUNT:
-                        break
-                    
-                    if target_frame.is_detached():
-                        logger.warning("Frame detached during row processing. Restarting grid discovery.")
+        except Exception as e:
+            logger.error(f"Pagination failed: {e}")
+            return False
+
+    def _process_job(self, context, page: Page, target_frame, row, i: int, bid_no: str):
+        """
+        Fetch and store a claimed, leased job from its list row, then return to the list.
+        Returns (stored, target_frame).
+        """
+        try:
+            self.diagnostics.begin_item(context, bid_no)
+            item = self._fetch_detail(page, target_frame, row, i, bid_no)
+            stored = self._store_item(bid_no, item)
+            target_frame = self._return_to_list(page, target_frame)
+            self.diagnostics.end_item()
+            return stored, target_frame
+        except Exception as e:
+            logger.error(f"Failed to process row {i}: {e}")
+            self.queue.fail(bid_no, self.worker_id, str(e))
+            self.state.release(bid_no, self.worker_id)
+            self.metrics.incr("items_failed", reason="exception")
+            self.diagnostics.end_item()
+            # Try to recover navigation via menu (last ditch)
+            try:
+                 page.locator("a.depth3").filter(has_text="입찰공고목록").first.click()
+                 time.sleep(3)
+            except: pass
+            return False, target_frame
+
+    def _drain_queue(self, browser, context, page: Page, target_frame):
+        """
+        Worker phase after the list walk: fetch the jobs of this shard that are
+        still pending (failed fetches, rows the walk did not reach again) or whose
+        lease expired (crashed worker). Jobs are grouped by the list page they were
+        found on, so each page is searched and opened once; rows missing there are
+        looked for once more on the next page (newer notices push rows down).
+        Returns (browser, context, page, target_frame).
+        """
+        by_page = {}
+        for bid_no, meta in self.queue.available(scope=self.shard.get('name', '')):
+            by_page.setdefault(max(1, int(meta.get('page') or 1)), []).append(bid_no)
+        if by_page:
+            logger.info(f"Draining {sum(map(len, by_page.values()))} queued jobs from {len(by_page)} list pages")
+
+        page_num = min(by_page) if by_page else None
+        carried = []  # Missing from their recorded page, tried on this one
+        while page_num is not None and target_frame and not self._drain_done():
+            wanted = carried + by_page.pop(page_num, [])
+            browser, context, page, target_frame, missing = self._drain_page(
+                browser, context, page, target_frame, page_num, wanted)
+            for bid_no in missing:
+                if bid_no in carried:
+                    self._fail_unleased(bid_no, "Row not found on list page")
+            carried = [b for b in missing if b not in carried]
+            page_num = page_num + 1 if carried else (min(by_page) if by_page else None)
+        return browser, context, page, target_frame
+
+    def _drain_done(self) -> bool:
+        return len(self.results) >= self.target_count or self.stop_requested
+
+    def _fail_unleased(self, bid_no: str, error: str):
+        """Count a failed attempt for a job that was never leased (so it ends up 'failed')."""
+        logger.warning(f"Queued job {bid_no}: {error}; left for a later run")
+        if self.queue.lease(bid_no, self.worker_id):
+            self.queue.fail(bid_no, self.worker_id, error)
+        self.metrics.incr("items_failed", reason="row_not_found")
+
+    def _drain_page(self, browser, context, page: Page, target_frame, page_num: int, bid_nos: list):
+        """
+        Open list page page_num (only if the list is not already on it) and fetch
+        the wanted jobs found there. Returns (browser, context, page, target_frame,
+        missing bid numbers).
+        """
+        pending, missing = list(bid_nos), []
+        while pending and target_frame and not self._drain_done():
+            if target_frame.is_detached():
+                target_frame = self._find_content_frame(page)
+                if not target_frame:
+                    break
+            if self._current_page_number(target_frame) != page_num:
+                self._click_search(page, target_frame)
+                if not self._goto_page(page, target_frame, page_num):
+                    break
+            rows_locator, count = self._locate_rows(target_frame, page_num)
+            row_bid_nos = self._read_row_bid_nos(rows_locator) if count > 0 else []
+            missing += [b for b in pending if b not in row_bid_nos]
+            pending = [b for b in pending if b in row_bid_nos]
+            if not pending:
+                break
+
+            bid_no = pending.pop(0)
+            if not self.queue.lease(bid_no, self.worker_id):
+                logger.info(f"Skipping queued job {bid_no}: leased by another worker or completed")
+                continue
+            if not self.state.claim(bid_no, self.worker_id):
+                self.queue.fail(bid_no, self.worker_id, "Already fetched or claimed by another process")
+                continue
+            i = row_bid_nos.index(bid_no)
+            logger.info(f"Draining queued job {bid_no} (list page {page_num}, row {i})")
+            stored, target_frame = self._process_job(context, page, target_frame, rows_locator.nth(i), i, bid_no)
+            if stored:
+                self.metrics.incr("jobs_drained")
+
+            self.watchdog.record_item()
+            reason = self.watchdog.check(page)
+            if reason:
+                browser, context, page, target_frame = self._recycle_context(browser, context, page_num, reason)
+            time.sleep(self.delay)
+        return browser, context, page, target_frame, missing
+
+    def _crawl_pages(self, browser, context, page: Page, target_frame):
+        """
+        Walk the list page by page, fetching details for new rows.
+        Returns (browser, context, page, target_frame), which change if the context
+        was recycled or the browser restarted.
+        """
+        # Pagination Loop
+        TARGET_COUNT = self.target_count
+        page_num = 1
+        start_row = 0  # Row to resume from after a context recycle
+        stop_crawling = False
+
+        while len(self.results) < TARGET_COUNT:
+            if stop_crawling or self.stop_requested:
+                 break
+
+            logger.info(f"Processing Page {page_num}...")
+
+            # Ensure frame is valid
+            if not target_frame or target_frame.is_detached():
+                 target_frame = self._find_content_frame(page)
+
+            if not target_frame:
+                 logger.error("Content frame not found. Stopping.")
+                 break
+
+            # 7. Dynamic Grid Discovery (Re-run for each page)
+            rows_locator, count = self._locate_rows(target_frame, page_num)
+            if count <= 0:
+                break
+
+            # Process Rows on Current Page
+            # Data Loading Wait: Ensure first row has text
+            try:
+                for _ in range(10):
+                    if rows_locator.first.inner_text().strip():
                         break
-                        
-                    row = rows_locator.nth(i)
-                    
+                    time.sleep(0.5)
+            except: pass
+
+            processed_on_page = 0
+            recycled = False
+            for i in range(start_row, count):
+                if len(self.results) >= TARGET_COUNT or self.stop_requested:
+                    break
+
+                if target_frame.is_detached():
+                    logger.warning("Frame detached during row processing. Restarting grid discovery.")
+                    break
+
+                row = rows_locator.nth(i)
+
+                with self.metrics.stage("row_scan"):
                     try:
                         # Optimization 1: System Row Check (Class/ID/Style)
                         try:
                            id_attr = row.get_attribute("id") or ""
                            style_attr = row.get_attribute("style") or ""
                            class_attr = row.get_attribute("class") or ""
-                           
+
                            if "scroll" in id_attr or "display: none" in style_attr or "height:0px" in style_attr or "w2grid_hidedRow" in class_attr:
                                logger.debug(f"Skipping system/hidden row {i}")
                                continue
@@ -319,393 +1212,333 @@ class NuriCrawler:
                         if not row_text:
                             logger.debug(f"Skipping empty text row {i}")
                             continue
-                            
+
                         bid_no = ""
                         # Try to find bid_no in the row text or specific cells
                         # ...
                         # Extract bid number from first or second column
                         bid_no = row.locator('td').nth(1).inner_text().strip()
-                        
+
                         if not bid_no:
                             logger.debug(f"Skipping row {i}: Empty bid_no")
                             continue
-                            
+
+                        input_date = ""
+                        if self.incremental and self.input_date_col is not None:
+                            input_date = normalize_input_date(
+                                row.locator('td').nth(self.input_date_col).inner_text()
+                            )
+
                     except:
                         # If any of the above fails (e.g. detached), skip
                         continue
-                    
-                    # Smart Resume / Duplicate Checks
-                    if self.state.is_visited(bid_no):
-                        self.consecutive_duplicates += 1
-                        logger.info(f"Skipping already visited: {bid_no} (Consecutive: {self.consecutive_duplicates})")
-                        
-                        if self.consecutive_duplicates >= MAX_DUPLICATE_LIMIT:
-                            logger.info(f"Smart Resume: Reached {MAX_DUPLICATE_LIMIT} consecutive duplicates. Stopping crawler.")
-                            stop_crawling = True
-                            break
+
+                # Incremental Mode: the list is newest-first, so rows at or below
+                # the high-water mark mean everything after them was already crawled
+                if self.incremental and input_date:
+                    hwm = self.state.high_water_mark
+                    if hwm and input_date < hwm:
+                        logger.info(f"Incremental: reached high-water mark {hwm} at {bid_no} ({input_date}). Stopping.")
+                        self.reached_end = True
+                        stop_crawling = True
+                        break
+                    if not self.newest_input_date or input_date > self.newest_input_date:
+                        self.newest_input_date = input_date
+                    if not self.state.needs_fetch(bid_no):
+                        logger.info(f"Skipping already visited: {bid_no}")
                         continue
-                    else:
-                        # Reset counter on new item
-                        self.consecutive_duplicates = 0
 
+                # Smart Resume / Duplicate Checks
+                # Revision-aware: only new notices or newer revisions are fetched
+                if not self.state.needs_fetch(bid_no):
+                    self.consecutive_duplicates += 1
+                    logger.info(f"Skipping already visited: {bid_no} (Consecutive: {self.consecutive_duplicates})")
 
-                    try:
-                        # Strategy: Find clickable link in row
-                        link = None
-                        
-                        # 1. Try to find any visible anchor tag in the row
-                        anchors = row.locator('a')
-                        anchor_count = anchors.count()
-                        
-                        if anchor_count > 0:
-                            # Find first visible anchor (skip hidden ones)
-                            for j in range(anchor_count):
-                                try:
-                                    candidate = anchors.nth(j)
-                                    if candidate.is_visible(timeout=1000):
-                                        link = candidate
-                                        break
-                                except:
-                                    continue
-                        
-                        # 2. If no visible anchor found, try clicking specific td columns
-                        if not link:
-                            # Try different columns (skip nth(2) which might be fixed)
-                            for col_idx in [1, 3, 4]:  # Try columns 2, 4, 5
-                                try:
-                                    td = row.locator('td').nth(col_idx)
-                                    if td.count() > 0:
-                                        td_anchor = td.locator('a').first
-                                        if td_anchor.count() > 0 and td_anchor.is_visible(timeout=1000):
-                                            link = td_anchor
-                                            break
-                                except:
-                                    continue
-                        
-                        # 3. Last resort: click the row itself
-                        if not link:
-                            logger.warning(f"No anchor found in row {i}, clicking row itself")
-                            link = row
-                        
-                        link_text = link.inner_text().strip() if link else ""
-                        logger.info(f"Processing row {i}: {link_text[:50]}... (Bid: {bid_no})")
-                        
-                        # Scroll into view before clicking
-                        try:
-                            link.scroll_into_view_if_needed(timeout=3000)
-                        except:
-                            pass
-                        
-                        # Click with timeout and force fallback
-                        try:
-                            self._retry(lambda: link.click(timeout=10000), "Click row link")
-                        except Exception as click_error:
-                            logger.warning(f"Normal click failed, trying force click: {click_error}")
-                            link.click(force=True)
-                        
-                        # Wait for the detail page content to load in the frame
-                        try:
-                            target_frame.wait_for_selector("label:has-text('입찰공고번호')", timeout=15000)
-                            time.sleep(1)
-                        except Exception as wait_error:
-                            logger.warning(f"Timeout waiting for detail content: {wait_error}")
-                        
-                        # Get the detail page content from the frame
-                        detail_html = target_frame.content()
-                        detail_url = target_frame.url
-                        
-                        # Retry parsing if it fails? (Usually CPU bound, not network, but maybe good for robustness)
-                        try:
-                            item = self.parser.parse_detail(detail_html, detail_url)
-                        except Exception as parse_e:
-                            logger.error(f"Parsing failed for {bid_no}: {parse_e}")
-                            item = BidItem() # Empty item
-                        
-                        if item.bid_no:
-                            self.results.append(item)
-                            self.state.mark_visited(item.bid_no)
-                            self.state.save_state()  # Save state incrementally
-                            logger.info(f"✓ Parsed: {item.bid_no} - {item.bid_name} ({len(self.results)}/{TARGET_COUNT})")
-                            processed_on_page += 1
-                            
-                            # Incremental Save
-                            try:
-                                Storage.save_json(self.results, "data/results.json")
-                            except Exception as e:
-                                logger.error(f"Incremental save failed: {e}")
-                        else:
-                            logger.warning(f"Failed to extract bid_no from detail page")
-                        
-                        # --- Navigation Back Logic ---
-                        back_success = False
-                        
-                        # Strategy 1: Click 'List' button in Detail Page (Best for WebSquare)
-                        try:
-                            # Verify frame is still attached
-                            if target_frame.is_detached():
-                                target_frame = self._find_content_frame(page)
-                                
-                            if target_frame:
-                                list_btn_selector = SELECTORS['detail'].get('list_btn')
-                                if list_btn_selector:
-                                    list_btn = target_frame.locator(list_btn_selector).first
-                                    if list_btn.is_visible(timeout=2000):
-                                        logger.info("Clicking 'List' button on detail page...")
-                                        list_btn.click()
-                                        back_success = True
-                        except Exception as e:
-                            logger.warning(f"List button strategy failed: {e}")
+                    self.metrics.incr("rows_skipped", reason="visited")
+                    if self.consecutive_duplicates >= MAX_DUPLICATE_LIMIT:
+                        logger.info(f"Smart Resume: Reached {MAX_DUPLICATE_LIMIT} consecutive duplicates. Stopping crawler.")
+                        stop_crawling = True
+                        break
+                    continue
+                else:
+                    # Reset counter on new item
+                    self.consecutive_duplicates = 0
 
-                        # Strategy 2: Browser Back (History)
-                        if not back_success:
-                            logger.info("List button not found/clicked. Trying browser back...")
-                            try:
-                                page.go_back()
-                                back_success = True
-                            except Exception as e:
-                                logger.warning(f"Browser back failed: {e}")
+                # Shared State: another process may be fetching (or just fetched) this notice
+                if not self.state.claim(bid_no, self.worker_id):
+                    logger.info(f"Skipping {bid_no}: claimed by another process")
+                    self.metrics.incr("rows_skipped", reason="claimed")
+                    continue
 
-                        # Verification & Recovery
-                        try:
-                            # Re-locate frame if needed
-                            if target_frame.is_detached():
-                                target_frame = self._find_content_frame(page)
-                                
-                            if target_frame:
-                                # Check if we are back on list
-                                try:
-                                    # Wait for search button or grid to confirm list page
-                                    target_frame.wait_for_selector(SELECTORS['list']['search_btn'], timeout=3000)
-                                    logger.info("✓ Returned to list page (verified).")
-                                    back_success = True
-                                    
-                                    # Ensure Grid is Visible again
-                                    try:
-                                        target_frame.locator(SELECTORS['list']['grid_row']).first.wait_for(state="visible", timeout=3000)
-                                    except:
-                                        logger.warning("Grid rows not immediately visible, might need search click.")
-                                        
-                                except:
-                                    back_success = False # Verification failed
-                            
-                            # Strategy 3: Soft Recovery (Menu Click)
-                            if not back_success:
-                                logger.warning("Still on detail page or lost. Executing SOFT RECOVERY (Menu Click)...")
-                                try:
-                                    menu_3 = page.locator("a.depth3").filter(has_text="입찰공고목록").first
-                                    if menu_3.is_visible():
-                                        menu_3.click()
-                                        logger.info("Clicked menu item. Waiting for list...")
-                                        # Wait for list to load
-                                        target_frame = self._find_content_frame(page) # Re-find frame
-                                        if target_frame:
-                                            target_frame.wait_for_selector(SELECTORS['list']['search_btn'], timeout=5000)
-                                            logger.info("✓ SOFT RECOVERY SUCCESS: Menu click returned to list.")
-                                            back_success = True
-                                except Exception as e:
-                                    logger.warning(f"Soft recovery failed: {e}")
-
-                            # Strategy 4: Hard Recovery (Full Reset) - Last Resort
-                            if not back_success:
-                                logger.error("All back strategies failed. Executing HARD RECOVERY (Full Restart & Navigation)...")
-                                # FORCE RECOVERY: Call _navigate_to_list to reset everything
-                                try:
-                                    # Refresh page and re-do menu
-                                    new_frame = self._navigate_to_list(page)
-                                    if new_frame:
-                                        target_frame = new_frame
-                                        # Click search button again to ensure data?
-                                        try:
-                                             search_btn = target_frame.locator(SELECTORS['list']['search_btn'])
-                                             if search_btn.count() > 0:
-                                                 search_btn.first.click()
-                                                 target_frame.locator(SELECTORS['list']['grid_row']).first.wait_for(state="visible", timeout=10000)
-                                        except: pass
-                                        
-                                        logger.info("✓ HARD RECOVERY SUCCESS: Full navigation reset completed.")
-                                        back_success = True
-                                        
-                                        # Reset page_num logic because hard recovery usually resets pagination to 1
-                                        # If we were on page 2, we are now on page 1.
-                                        # This is a limitation of hard recovery.
-                                        logger.warning("Hard recovery resets pagination. Crawler might re-process page 1.")
-                                        
-                                    else:
-                                        logger.error("Recovery failed: Reference frame not found.")
-                                except Exception as recovery_e:
-                                    logger.error(f"Recovery failed: {recovery_e}")
-                                    
-                        except Exception as e:
-                            logger.error(f"Failed to verify/recover list state: {e}")
+                # Durable Queue: enqueue on discovery (with the page for the drain phase), lease before fetching
+                self.queue.enqueue(bid_no, {'shard': self.shard.get('name', ''), 'page': page_num})
+                if not self.queue.lease(bid_no, self.worker_id):
+                    logger.info(f"Skipping {bid_no}: leased by another worker, completed or out of attempts")
+                    self.state.release(bid_no, self.worker_id)
+                    continue
 
-                    except Exception as e:
-                        logger.error(f"Failed to process row {i}: {e}")
-                        # Try to recover navigation via menu (last ditch)
-                        try: 
-                             page.locator("a.depth3").filter(has_text="입찰공고목록").first.click()
-                             time.sleep(3)
-                        except: pass
-                    
-                    time.sleep(DELAY_BETWEEN_REQUESTS)
-                
-                if stop_crawling:
-                     break
+                stored, target_frame = self._process_job(context, page, target_frame, row, i, bid_no)
+                if stored:
+                    processed_on_page += 1
 
-                # Check if we need more items
-                if len(self.results) >= TARGET_COUNT:
-                    logger.info(f"Reached target count ({len(self.results)}). Stopping.")
+                # Memory Watchdog: recycle the context and resume at the next row
+                self.watchdog.record_item()
+                reason = self.watchdog.check(page)
+                if reason:
+                    browser, context, page, target_frame = self._recycle_context(browser, context, page_num, reason)
+                    start_row = i + 1
+                    recycled = True
                     break
-                
-                # Pagination Logic: Click Next Page
-                logger.info("Attempting to move to next page...")
-                pagination_success = False
-                
-                try:
-                    # Strategy 1: removed (generic next buttons often skip to next block 1->11)
-                    # We will rely solely on explicit page number clicking below
-                    pass
-                    
-                    # Strategy 2: Click page number using index attribute (accurate page selection)
-                    if not pagination_success:
-                        try:
-                            next_page = page_num + 1
-                            logger.info(f"Trying to find page {next_page}...")
-                            
-                            # Simplified Pagination Strategy
-                            
-                            # Strategy 1: Find by exact text and click (Most robust)
-                            try:
-                                # Try locating by index attribute (from user feedback)
-                                # <a id="mf_wfm_container_pagelist_page_2" index="2" ...>2</a>
-                                page_link_index = target_frame.locator(f"a[index='{next_page}']").first
-                                if page_link_index.count() > 0 and page_link_index.is_visible():
-                                     logger.info(f"Found page {next_page} by index='{next_page}'. Clicking...")
-                                     page_link_index.click()
-                                     pagination_success = True
-                                else:
-                                     # Try locating by ID pattern
-                                     page_link_id = target_frame.locator(f"#mf_wfm_container_pagelist_page_{next_page}").first
-                                     if page_link_id.count() > 0:
-                                          logger.info(f"Found page {next_page} by ID. Clicking...")
-                                          page_link_id.click()
-                                          pagination_success = True
-                                     else:
-                                          # Try locating by text directly
-                                          page_link = target_frame.locator(f"a:text-is('{next_page}')").first
-                                          if page_link.count() > 0 and page_link.is_visible():
-                                               logger.info(f"Found page {next_page} by text-is. Clicking...")
-                                               page_link.click()
-                                               pagination_success = True
-                                          else:
-                                               # Try with specific classes if generic fails
-                                               candidate = target_frame.locator(f".w2pageList_label:text-is('{next_page}')").first
-                                               if candidate.count() > 0:
-                                                    candidate.click()
-                                                    pagination_success = True
-                                               else:
-                                                    # Try partial text allowing for whitespace
-                                                    candidate_lax = target_frame.locator(f"a:has-text('{next_page}')").filter(has_text=f"^{next_page}$").first
-                                                    if candidate_lax.count() > 0:
-                                                        candidate_lax.click()
-                                                        pagination_success = True
-                            except Exception as e:
-                                logger.warning(f"Standard pagination click failed: {e}")
-
-                            # Strategy 2: 'Next' Image Button (Arrow)
-                            if not pagination_success:
-                                try:
-                                    next_btn = target_frame.locator(SELECTORS['list']['pagination']['next_btn']).first
-                                    if next_btn.count() > 0 and next_btn.is_visible():
-                                         logger.info("Clicking 'Next' button...")
-                                         next_btn.click()
-                                         pagination_success = True
-                                except Exception as e:
-                                    logger.warning(f"Next button strategy failed: {e}")
-
-                            # Strategy 3: Javascript Fallback (Simpler)
-                            if not pagination_success:
-                                try:
-                                    # Try by ID specifically in JS
-                                    js_code_id = f"""() => {{
-                                        const el = document.getElementById('mf_wfm_container_pagelist_page_{next_page}');
-                                        if (el) {{
-                                            el.click();
-                                            return true;
-                                        }}
-                                        return false;
-                                    }}"""
-                                    if target_frame.evaluate(js_code_id):
-                                         logger.info(f"Clicked page {next_page} via JS ID fallback.")
-                                         pagination_success = True
-                                    else:
-                                        # Generic JS
-                                        js_code = f"""() => {{
-                                            const links = document.querySelectorAll('a, li, div');
-                                            for (const link of links) {{
-                                                if (link.innerText.trim() === '{next_page}' && link.offsetParent !== null) {{
-                                                    link.click();
-                                                    return true;
-                                                }}
-                                            }}
-                                            return false;
-                                        }}"""
-                                        if target_frame.evaluate(js_code):
-                                            logger.info(f"Clicked page {next_page} via JS fallback.")
-                                            pagination_success = True
-                                except Exception as e:
-                                    logger.warning(f"JS fallback failed: {e}")
 
-                            if pagination_success:
-                                page_num = next_page
-                                page.wait_for_load_state('networkidle')
-                                time.sleep(3)
-                            else:
-                                logger.warning(f"Could not find link for page {next_page}")
-                                # Debug: Print available numbers
-                                try:
-                                     texts = target_frame.locator(".w2pageList_label, .w2pageList a").all_inner_texts()
-                                     logger.info(f"Visible generic pagination links: {texts}")
-                                except: pass
-                                
-                        except Exception as e:
-                            logger.debug(f"Page number strategy failed: {e}")
-                    
-                    if not pagination_success:
-                        logger.info("Could not find or click pagination button. End of list.")
-                        # Dump HTML for debugging
-                        try:
-                            html = target_frame.content()
-                            with open("data/debug_pagination.html", "w", encoding="utf-8") as f:
-                                f.write(html)
-                            logger.info("Saved debug_pagination.html")
-                        except: pass
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"Pagination failed: {e}")
+                time.sleep(self.delay)
+
+            if stop_crawling:
+                 break
+
+            if recycled:
+                if not target_frame:
+                    logger.error("List not restored after context recycle. Stopping.")
                     break
+                continue  # Re-discover rows on the same page
+            start_row = 0
 
-            
-            browser.close()
-            
-            # Save results
+            # Check if we need more items
+            if len(self.results) >= TARGET_COUNT:
+                logger.info(f"Reached target count ({len(self.results)}). Stopping.")
+                break
+
+            # Pagination Logic: Click Next Page
+            if self._goto_next_page(page, target_frame, page_num):
+                page_num += 1
+            elif self._wait_for_page_link(target_frame, page_num + 1) and self._goto_next_page(page, target_frame, page_num):
+                self.metrics.incr("recovery", strategy="pagination_retry")
+                page_num += 1
+            else:
+                if self._is_last_page(target_frame, page_num):
+                    logger.info(f"Page {page_num} is the last page. End of list.")
+                    self.reached_end = True
+                else:
+                    logger.warning(f"Pagination failed after page {page_num}; the list was not walked to the end.")
+                break
+
+        return browser, context, page, target_frame
+
+    def _write_metrics(self):
+        """Write the JSON run report and the Prometheus text file."""
+        try:
+            self.metrics.write_json(os.path.join(self.output_dir, METRICS_REPORT_FILE))
+            self.metrics.write_prometheus(os.path.join(self.output_dir, METRICS_PROM_FILE))
+            logger.info(f"Run report written to {self.output_dir}/{METRICS_REPORT_FILE}")
+        except Exception as e:
+            logger.error(f"Failed to write metrics: {e}")
+
+    def _finish_run(self):
+        """Advance the high-water mark and save state and result files."""
+        # Advance the high-water mark only after a complete pass (last page or a
+        # row below the mark), so rows skipped by a crash, TARGET_COUNT or failed
+        # pagination are still picked up next run
+        if self.incremental and self.reached_end and self.newest_input_date:
+            self.state.update_high_water_mark(self.newest_input_date)
+            logger.info(f"Incremental: high-water mark advanced to {self.state.high_water_mark}")
+
+        if self.attachments:
+            self.attachments.wait()
+
+        # Save results
+        with self.metrics.stage("state_save"):
             self.state.save_state()
+
+        if self.results:
+            logger.info("Attempting to save results...")
+            try:
+                with self.metrics.stage("storage_write"):
+                    Storage.save_json(self.results, os.path.join(self.output_dir, "results.json"))
+                logger.info(f"✓ Saved to {self.output_dir}/results.json")
+            except Exception as e:
+                logger.error(f"Failed to save JSON: {e}")
+
+            try:
+                with self.metrics.stage("storage_write", format="xlsx"):
+                    Storage.save_excel(self.results, os.path.join(self.output_dir, "results.xlsx"))
+                logger.info(f"✓ Saved to {self.output_dir}/results.xlsx")
+            except Exception as e:
+                logger.error(f"Failed to save Excel: {e}")
+        else:
+            logger.warning("No results to save")
+
+        self._write_metrics()
+        self.diagnostics.write_summary()
+
+    def run(self):
+        with sync_playwright() as p:
+            browser, context, page = self._launch_browser(p)
             
-            if self.results:
-                logger.info("Attempting to save results...")
-                try:
-                    Storage.save_json(self.results, "data/results.json")
-                    logger.info("✓ Saved to data/results.json")
-                except Exception as e:
-                    logger.error(f"Failed to save JSON: {e}")
+            # Initial Navigation
+            target_frame = self._navigate_to_list(page)
+            if not target_frame:
+                logger.error("Initial navigation failed. Exiting.")
+                browser.close()
+                return
 
-                try:
-                    Storage.save_excel(self.results, "data/results.xlsx")
-                    logger.info("✓ Saved to data/results.xlsx")
-                except Exception as e:
-                    logger.error(f"Failed to save Excel: {e}")
-            else:
-                logger.warning("No results to save")
+            # 6. Click Search Button (Crucial Step)
+            self._click_search(page, target_frame)
+
+            browser, context, page, target_frame = self._crawl_pages(browser, context, page, target_frame)
+            browser, context, page, target_frame = self._drain_queue(browser, context, page, target_frame)
+
+            if self.resource_filter:
+                self.resource_filter.log_summary()
+            browser.close()
+
+            self._finish_run()
+
+    def start_session(self, p):
+        """Launch a browser that stays warm across crawl cycles (daemon mode)."""
+        browser, context, page = self._launch_browser(p)
+        self.session = (browser, context, page, None)
+
+    def crawl_cycle(self) -> int:
+        """
+        Run one crawl on the warm session, reusing the list frame if it is still
+        attached. State and results are checkpointed at the end of the cycle.
+        """
+        browser, context, page, target_frame = self.session
+        self.results = []
+        self.consecutive_duplicates = 0
+        self.newest_input_date = None
+        self.reached_end = False
+
+        if not target_frame or target_frame.is_detached():
+            target_frame = self._navigate_to_list(page)
+            if not target_frame:
+                self.session = (browser, context, page, None)
+                raise RuntimeError("Navigation to list page failed")
+
+        self._click_search(page, target_frame)
+        try:
+            browser, context, page, target_frame = self._crawl_pages(browser, context, page, target_frame)
+            browser, context, page, target_frame = self._drain_queue(browser, context, page, target_frame)
+        except Exception:
+            target_frame = None  # Force a full navigation next cycle
+            raise
+        finally:
+            self.session = (browser, context, page, target_frame)
+            self._finish_run()
+        return len(self.results)
+
+    def close_session(self):
+        if not self.session:
+            return
+        if self.resource_filter:
+            self.resource_filter.log_summary()
+        try:
+            self.session[0].close()
+        except Exception as e:
+            logger.warning(f"Browser close failed: {e}")
+        self.session = None
+
+    def _read_row_bid_nos(self, rows_locator) -> list:
+        """Read the bid number column of every row in one round trip ('' for system rows)."""
+        return rows_locator.evaluate_all(
+            """rows => rows.map(r => {
+                const cells = r.querySelectorAll('td');
+                return cells.length >= 5 ? cells[1].innerText.trim() : '';
+            })"""
+        )
+
+    def _watch_cycle(self, page: Page, target_frame):
+        """Diff the first list page against state and fetch only new notices."""
+        rows_locator, count = self._locate_rows(target_frame)
+        if count <= 0:
+            return target_frame
+
+        detected_at = time.time()
+        bid_nos = self._read_row_bid_nos(rows_locator)
+        new_ids = [b for b in bid_nos if b and self.state.needs_fetch(b)]
+        if not new_ids:
+            logger.info("Watch: no new notices.")
+            return target_frame
+        logger.info(f"Watch: {len(new_ids)} new notices detected: {new_ids}")
+
+        for bid_no in new_ids:
+            if not self.state.claim(bid_no, self.worker_id):
+                continue
+            self.queue.enqueue(bid_no, {'shard': self.shard.get('name', ''), 'page': 1})
+            if not self.queue.lease(bid_no, self.worker_id):
+                self.state.release(bid_no, self.worker_id)
+                continue
+            try:
+                self.diagnostics.begin_item(page.context, bid_no)
+                # Rows are re-rendered after each back-navigation, so match by bid number
+                row = rows_locator.filter(has_text=bid_no).first
+                item = self._fetch_detail(page, target_frame, row, bid_nos.index(bid_no), bid_no)
+                if self._store_item(bid_no, item):
+                    latency = time.time() - detected_at
+                    self.watch_latencies.add(latency)
+                    self.watchdog.record_item()
+                    logger.info(f"Watch: {bid_no} recorded {latency:.2f}s after detection")
+                    self.metrics.observe("watch_detection_to_record", latency)
+                target_frame = self._return_to_list(page, target_frame)
+                self.diagnostics.end_item()
+                rows_locator, count = self._locate_rows(target_frame)
+                if count <= 0:
+                    break
+            except Exception as e:
+                logger.error(f"Watch: failed to process {bid_no}: {e}")
+                self.queue.fail(bid_no, self.worker_id, str(e))
+                self.state.release(bid_no, self.worker_id)
+                self.diagnostics.end_item()
+                target_frame = self._return_to_list(page, target_frame)
+        return target_frame
+
+    def watch(self, interval: float = WATCH_INTERVAL, max_cycles: Optional[int] = None):
+        """
+        Long-running watch mode: keep the list frame open, re-issue the search every
+        `interval` seconds and immediately fetch details for first-page notices not
+        yet in state. Per-item detection-to-record latency is kept in watch_latencies.
+        """
+        with sync_playwright() as p:
+            browser, context, page = self._launch_browser(p)
+
+            target_frame = self._navigate_to_list(page)
+            if not target_frame:
+                logger.error("Initial navigation failed. Exiting.")
+                browser.close()
+                return
+
+            cycle = 0
+            try:
+                while max_cycles is None or cycle < max_cycles:
+                    cycle += 1
+                    cycle_start = time.time()
+
+                    if not target_frame or target_frame.is_detached():
+                        target_frame = self._find_content_frame(page) or self._navigate_to_list(page)
+                    if not target_frame:
+                        logger.error("Content frame lost. Stopping watch.")
+                        break
+
+                    self._click_search(page, target_frame)
+                    target_frame = self._watch_cycle(page, target_frame)
+
+                    reason = self.watchdog.check(page)
+                    if reason:
+                        browser, context, page, target_frame = self._recycle_context(browser, context, 1, reason)
+
+                    if self.watch_latencies.count:
+                        latencies = self.watch_latencies.sorted_samples()
+                        logger.info(f"Watch cycle {cycle}: {self.watch_latencies.count} items, latency "
+                                    f"p50={latencies[len(latencies) // 2]:.2f}s max={self.watch_latencies.max:.2f}s")
+                    time.sleep(max(0.0, interval - (time.time() - cycle_start)))
+            except KeyboardInterrupt:
+                logger.info("Watch stopped by user.")
+            finally:
+                if self.resource_filter:
+                    self.resource_filter.log_summary()
+                browser.close()
+                self.state.save_state()
+                self._write_metrics()
+                self.diagnostics.write_summary()
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
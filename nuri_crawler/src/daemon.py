@@ -0,0 +1,155 @@
+import logging
+import signal
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from .config import DAEMON_INTERVAL, DAEMON_CRON, INCREMENTAL_MODE, TARGET_COUNT, HEADLESS, METRICS_PORT, DELAY_BETWEEN_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+MAX_CONSECUTIVE_FAILURES = 3  # Restart the browser after this many failed cycles
+
+
+class CronSchedule:
+    """
+    Minimal 5-field cron expression (minute hour day-of-month month day-of-week).
+    Supports '*', 'a', 'a-b', lists 'a,b' and steps '*/n', 'a-b/n'. Sunday is 0 or 7.
+    """
+
+    RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.RANGES)
+        ]
+        if 7 in self.weekdays:
+            self.weekdays.add(0)
+        # Standard cron: if both day fields are restricted, either may match
+        self.day_restricted = fields[2] != "*"
+        self.weekday_restricted = fields[4] != "*"
+
+    @staticmethod
+    def _parse_field(field: str, low: int, high: int) -> set:
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step_text = part.split("/", 1)
+                step = int(step_text)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(x) for x in part.split("-", 1))
+            else:
+                start = end = int(part)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Invalid cron field '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _matches(self, dt: datetime) -> bool:
+        if dt.minute not in self.minutes or dt.hour not in self.hours or dt.month not in self.months:
+            return False
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays  # cron: Sunday = 0
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt: datetime) -> datetime:
+        candidate = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)  # Covers Feb 29 schedules
+        while candidate < limit:
+            if self._matches(candidate):
+                return candidate
+            candidate += timedelta(minutes=1)
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+
+class CrawlerDaemon:
+    """
+    Long-running crawler: one warm browser and loaded state reused across
+    crawl cycles run on an interval or cron schedule. SIGINT/SIGTERM stop
+    the current cycle at the next row and checkpoint state and results.
+    """
+
+    def __init__(self, interval: float = DAEMON_INTERVAL, cron: Optional[str] = DAEMON_CRON,
+                 target_count: int = TARGET_COUNT, incremental: bool = INCREMENTAL_MODE, max_cycles: Optional[int] = None,
+                 headless: bool = HEADLESS, delay: float = DELAY_BETWEEN_REQUESTS):
+        self.interval = interval
+        self.headless = headless
+        self.delay = delay
+        self.schedule = CronSchedule(cron) if cron else None
+        self.target_count = target_count
+        self.incremental = incremental
+        self.max_cycles = max_cycles
+        self.crawler = None
+        self.stop_requested = False
+
+    def _handle_signal(self, signum, frame):
+        logger.info(f"Received signal {signum}. Finishing current item and shutting down...")
+        self.stop_requested = True
+        if self.crawler:
+            self.crawler.stop_requested = True
+
+    def _next_run_time(self, last_start: Optional[float]) -> float:
+        if self.schedule:
+            return self.schedule.next_after(datetime.now()).timestamp()
+        if last_start is None:
+            return time.time()
+        return last_start + self.interval
+
+    def _sleep_until(self, timestamp: float):
+        # Short sleeps so shutdown signals are handled promptly
+        while not self.stop_requested and time.time() < timestamp:
+            time.sleep(min(1.0, timestamp - time.time()))
+
+    def run(self):
+        from playwright.sync_api import sync_playwright
+        from .crawler import NuriCrawler
+
+        signal.signal(signal.SIGINT, self._handle_signal)
+        signal.signal(signal.SIGTERM, self._handle_signal)
+
+        # One crawler (and metrics endpoint) for every cycle
+        self.crawler = NuriCrawler(target_count=self.target_count, incremental=self.incremental, headless=self.headless,
+                                   delay=self.delay, metrics_port=METRICS_PORT)
+        schedule_desc = f"cron '{self.schedule.expression}'" if self.schedule else f"every {self.interval}s"
+        logger.info(f"Daemon started ({schedule_desc}).")
+
+        cycles = 0
+        failures = 0
+        last_start = None
+        with sync_playwright() as p:
+            self.crawler.start_session(p)
+            try:
+                while not self.stop_requested and (self.max_cycles is None or cycles < self.max_cycles):
+                    next_run = self._next_run_time(last_start)
+                    if next_run > time.time():
+                        logger.info(f"Next cycle at {datetime.fromtimestamp(next_run):%Y-%m-%d %H:%M:%S}")
+                        self._sleep_until(next_run)
+                    if self.stop_requested:
+                        break
+
+                    last_start = time.time()
+                    cycles += 1
+                    try:
+                        count = self.crawler.crawl_cycle()
+                        failures = 0
+                        logger.info(f"Cycle {cycles} finished in {time.time() - last_start:.1f}s: {count} new items")
+                    except Exception as e:
+                        failures += 1
+                        logger.error(f"Cycle {cycles} failed ({failures} in a row): {e}", exc_info=True)
+                        if failures >= MAX_CONSECUTIVE_FAILURES:
+                            logger.warning("Restarting browser after repeated failures.")
+                            self.crawler.close_session()
+                            self.crawler.start_session(p)
+                            failures = 0
+            finally:
+                self.crawler.close_session()
+                self.crawler.state.save_state()
+                logger.info(f"Daemon stopped after {cycles} cycles.")
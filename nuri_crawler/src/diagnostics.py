@@ -0,0 +1,140 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+from .config import PROFILE_SAMPLE_RATE, DIAGNOSTICS_DIR, DIAGNOSTICS_SLOWEST_N
+
+logger = logging.getLogger(__name__)
+
+
+def _safe_name(bid_no: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]', '_', bid_no) or "unknown"
+
+
+class Diagnostics:
+    """
+    Opt-in per-item diagnostics for a sampled fraction of notices:
+
+    - Playwright trace (screenshots, network, DOM snapshots) from the detail
+      click through back-navigation: <bid_no>.trace.zip
+    - cProfile of NuriParser.parse_detail and Storage calls: <bid_no>.<stage>.prof/.txt
+    - Raw detail HTML: <bid_no>.html
+
+    Every item's wall time is recorded so summary.json can rank the slowest ones.
+    """
+
+    def __init__(self, sample_rate: float = PROFILE_SAMPLE_RATE, root_dir: str = DIAGNOSTICS_DIR):
+        self.sample_rate = sample_rate
+        self.run_dir = os.path.join(root_dir, datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self.items = []  # {'bid_no', 'seconds', 'sampled', 'stages'}
+        self.current: Optional[dict] = None
+        self._context = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    @property
+    def sampled(self) -> bool:
+        """Whether the current item is sampled (its raw HTML is wanted)."""
+        return bool(self.current and self.current['sampled'])
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.run_dir, f"{_safe_name(self.current['bid_no'])}{suffix}")
+
+    def begin_item(self, context, bid_no: str):
+        """Start timing an item and, if sampled, a Playwright trace."""
+        sampled = self.enabled and random.random() < self.sample_rate
+        self.current = {'bid_no': bid_no, 'start': time.perf_counter(), 'sampled': sampled, 'stages': {}}
+        if not sampled:
+            return
+        os.makedirs(self.run_dir, exist_ok=True)
+        try:
+            context.tracing.start(title=bid_no, screenshots=True, snapshots=True)
+            self._context = context
+        except Exception as e:
+            logger.warning(f"Trace start failed for {bid_no}: {e}")
+
+    def end_item(self):
+        """Stop the trace (if any) and record the item's wall time."""
+        if not self.current:
+            return
+        current, self.current = self.current, None
+        if self._context is not None:
+            try:
+                self._context.tracing.stop(
+                    path=os.path.join(self.run_dir, f"{_safe_name(current['bid_no'])}.trace.zip")
+                )
+            except Exception as e:
+                logger.warning(f"Trace stop failed for {current['bid_no']}: {e}")
+            self._context = None
+        self.items.append({
+            'bid_no': current['bid_no'],
+            'seconds': round(time.perf_counter() - current['start'], 3),
+            'sampled': current['sampled'],
+            'stages': current['stages'],
+        })
+
+    def save_html(self, html: str):
+        if not self.current or not self.current['sampled']:
+            return
+        try:
+            with open(self._path(".html"), 'w', encoding='utf-8') as f:
+                f.write(html)
+        except Exception as e:
+            logger.warning(f"Failed to save diagnostics HTML: {e}")
+
+    @contextmanager
+    def profile(self, stage: str):
+        """cProfile the block for sampled items; time it for all items."""
+        if not self.current:
+            yield
+            return
+        current = self.current
+        profiler = cProfile.Profile() if current['sampled'] else None
+        start = time.perf_counter()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            current['stages'][stage] = round(current['stages'].get(stage, 0) + time.perf_counter() - start, 4)
+            if profiler:
+                self._dump_profile(profiler, current['bid_no'], stage)
+
+    def _dump_profile(self, profiler: cProfile.Profile, bid_no: str, stage: str):
+        base = os.path.join(self.run_dir, f"{_safe_name(bid_no)}.{stage}")
+        try:
+            profiler.dump_stats(base + ".prof")
+            text = io.StringIO()
+            pstats.Stats(profiler, stream=text).sort_stats("cumulative").print_stats(25)
+            with open(base + ".txt", 'w', encoding='utf-8') as f:
+                f.write(text.getvalue())
+        except Exception as e:
+            logger.warning(f"Failed to write profile {base}: {e}")
+
+    def write_summary(self):
+        """Write summary.json ranking the slowest items (sampled ones have artifacts)."""
+        if not self.enabled or not self.items:
+            return
+        slowest = sorted(self.items, key=lambda it: it['seconds'], reverse=True)[:DIAGNOSTICS_SLOWEST_N]
+        os.makedirs(self.run_dir, exist_ok=True)
+        summary = {
+            'sample_rate': self.sample_rate,
+            'items': len(self.items),
+            'sampled_items': sum(1 for it in self.items if it['sampled']),
+            'slowest': slowest,
+        }
+        with open(os.path.join(self.run_dir, "summary.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        logger.info(f"Diagnostics written to {self.run_dir} ({summary['sampled_items']} sampled items)")
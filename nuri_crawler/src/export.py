@@ -0,0 +1,217 @@
+"""
+Streaming CSV export of crawled notices.
+
+Scalar raw_data fields become columns of the main CSV (a stable union of
+every item's fields), and each sub-grid is written to its own CSV whose rows
+are linked back by 입찰공고번호. Items are streamed twice from the source
+(schema pass, write pass), so memory does not grow with the number of notices.
+"""
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+from typing import Callable, Dict, Iterable, Iterator, Optional, Union
+from .config import EXPORT_PRIORITY_FIELDS
+from .model import BidItem
+
+try:
+    import zstandard
+except ImportError:  # Optional; only needed for compression="zstd"
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = {None: "", "gzip": ".gz", "zstd": ".zst"}
+LINK_COLUMN = "입찰공고번호"
+META_COLUMNS = ['상세페이지URL', 'crawled_at', 'previous_revision', 'changed_fields', 'removed_fields']
+
+ItemSource = Union[Iterable[BidItem], Callable[[], Iterable[BidItem]]]
+
+
+def _open_text(path: str, compression: Optional[str]):
+    """Text handle for csv writing (utf-8 with BOM so Excel detects the encoding)."""
+    if compression == "gzip":
+        return gzip.open(path, 'wt', encoding='utf-8-sig', newline='')
+    if compression == "zstd":
+        raw = open(path, 'wb')
+        writer = zstandard.ZstdCompressor().stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(writer, encoding='utf-8-sig', newline='')
+    return open(path, 'w', encoding='utf-8-sig', newline='')
+
+
+def _clean(value) -> str:
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return "|".join(_clean(v) for v in value)
+    return " ".join(str(value).split())
+
+
+def _is_grid(value) -> bool:
+    """Sub-grid value: a list of row dicts (other lists are written as '|'-joined cells)."""
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+def grid_file_name(title: str) -> str:
+    """File-system safe suffix for a grid title ('' -> 'Grid_Data', as in the Excel export)."""
+    name = re.sub(r'[\\/:*?"<>|\s]+', '_', title.strip()).strip('_')
+    return name or "Grid_Data"
+
+
+class _Spool:
+    """Re-iterable copy of a one-shot iterator, kept as JSON lines in a temp file."""
+
+    def __init__(self, items: Iterable[BidItem]):
+        self.file = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.items = items
+
+    def first_pass(self) -> Iterator[BidItem]:
+        for item in self.items:
+            self.file.write(json.dumps(item.to_dict(), ensure_ascii=False) + "\n")
+            yield item
+
+    def second_pass(self) -> Iterator[BidItem]:
+        self.file.seek(0)
+        for line in self.file:
+            yield BidItem(**json.loads(line))
+        self.file.close()
+
+
+class CsvExporter:
+    """
+    Write items as <stem>.csv plus <stem>__<grid>.csv per sub-grid, optionally
+    gzip/zstd compressed (.csv.gz / .csv.zst).
+    """
+
+    def __init__(self, filename: str, compression: Optional[str] = None):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (use gzip or zstd)")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the 'zstandard' package")
+        self.compression = compression
+        stem = filename[:-len(".csv")] if filename.endswith(".csv") else filename
+        self.stem = stem
+
+    def path(self, grid_name: Optional[str] = None) -> str:
+        suffix = f"__{grid_name}" if grid_name is not None else ""
+        return f"{self.stem}{suffix}.csv{COMPRESSIONS[self.compression]}"
+
+    @staticmethod
+    def _grid_names(titles: Iterable[str]) -> Dict[str, str]:
+        """Grid title -> unique file name suffix."""
+        names, used = {}, set()
+        for title in titles:
+            name = base = grid_file_name(title)
+            n = 2
+            while name in used:
+                name, n = f"{base}_{n}", n + 1
+            used.add(name)
+            names[title] = name
+        return names
+
+    @staticmethod
+    def _scan(items: Iterable[BidItem]):
+        """Union schema: ordered main columns and per-grid columns."""
+        fields: Dict[str, None] = {}  # dicts keep first-seen order
+        grids: Dict[str, Dict[str, None]] = {}
+        count = 0
+        for item in items:
+            count += 1
+            for key, value in (item.raw_data or {}).items():
+                key = key.strip()
+                if _is_grid(value):
+                    columns = grids.setdefault(key, {})
+                    for row in value:
+                        columns.update(dict.fromkeys(k for k in row if k != LINK_COLUMN))
+                else:
+                    fields[key] = None
+        columns = [k for k in EXPORT_PRIORITY_FIELDS if k in fields]
+        columns += [k for k in fields if k not in columns]
+        if LINK_COLUMN not in columns:
+            columns.insert(0, LINK_COLUMN)
+        return count, columns + META_COLUMNS, {title: [LINK_COLUMN] + list(cols) for title, cols in grids.items()}
+
+    def export(self, source: ItemSource) -> dict:
+        """
+        Stream `source` into the CSV files. `source` is a callable returning a
+        fresh iterable (e.g. JobQueue.iter_results, read inside JobQueue.snapshot
+        so both passes see the same rows) or an iterable; one-shot iterators are
+        spooled to a temp file for the second pass. Fields or grids missing from
+        the first pass are skipped and logged.
+        """
+        if callable(source):
+            first, second = source(), source()
+        elif iter(source) is source:
+            spool = _Spool(source)
+            first, second = spool.first_pass(), spool.second_pass()
+        else:
+            first = second = source
+
+        count, columns, grid_columns = self._scan(first)
+        os.makedirs(os.path.dirname(self.stem) or ".", exist_ok=True)
+
+        handles = []
+        try:
+            main_file = _open_text(self.path(), self.compression)
+            handles.append(main_file)
+            main = csv.writer(main_file)
+            main.writerow(columns)
+            grid_writers = {}
+            grid_names = self._grid_names(grid_columns)
+            for title, cols in grid_columns.items():
+                handle = _open_text(self.path(grid_names[title]), self.compression)
+                handles.append(handle)
+                grid_writers[title] = csv.writer(handle)
+                grid_writers[title].writerow(cols)
+
+            grid_rows = dict.fromkeys(grid_columns, 0)
+            known_fields = set(columns)
+            skipped = {}  # Field or grid name -> items it was skipped in
+            for item in second:
+                bid_no = item.bid_no or (item.raw_data or {}).get(LINK_COLUMN, "")
+                row = {
+                    LINK_COLUMN: bid_no,
+                    '상세페이지URL': item.url,
+                    'crawled_at': item.crawled_at,
+                    'previous_revision': item.previous_revision,
+                    # Field names only; old/new values stay in the JSON results
+                    'changed_fields': list(item.changed_fields or []),
+                    'removed_fields': list(item.removed_fields or []),
+                }
+                for key, value in (item.raw_data or {}).items():
+                    key = key.strip()
+                    if _is_grid(value):
+                        if key not in grid_writers:
+                            skipped[key] = skipped.get(key, 0) + 1
+                            continue
+                        # Rows are written as lists in header order (cheaper than csv.DictWriter)
+                        cols = grid_columns[key][1:]
+                        grid_writers[key].writerows(
+                            [bid_no] + [_clean(grid_row.get(c)) for c in cols] for grid_row in value)
+                        grid_rows[key] += len(value)
+                    else:
+                        if key not in known_fields:
+                            skipped[key] = skipped.get(key, 0) + 1
+                        row[key] = value
+                main.writerow([_clean(row.get(c)) for c in columns])
+        finally:
+            for handle in handles:
+                handle.close()
+
+        if skipped:
+            logger.warning(f"Skipped fields/grids not seen in the schema pass (source changed between passes): {skipped}")
+        summary = {'items': count, 'columns': len(columns), 'file': self.path(),
+                   'grids': {self.path(grid_names[title]): rows for title, rows in grid_rows.items()},
+                   'skipped': skipped}
+        logger.info(f"Exported {count} items to {self.path()} ({len(grid_columns)} grid files)")
+        return summary
+
+
+def export_csv(source: ItemSource, filename: str, compression: Optional[str] = None) -> dict:
+    return CsvExporter(filename, compression).export(source)
@@ -0,0 +1,189 @@
+import json
+import os
+import sqlite3
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+from .config import QUEUE_DB, JOB_LEASE_SECONDS, MAX_JOB_ATTEMPTS
+from .model import BidItem
+
+logger = logging.getLogger(__name__)
+
+# Job lifecycle: pending -> leased -> done
+#                           \-> pending (retry) / failed (attempts exhausted)
+STATUS_PENDING = "pending"
+STATUS_LEASED = "leased"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Durable SQLite-backed queue of detail jobs keyed by bid number.
+
+    The list walker enqueues bid numbers (with the list page they were found
+    on) and leases them as it goes; jobs it does not finish (crashed worker,
+    expired lease, failed fetch) are listed with available() and drained afterwards. The
+    parsed result is written in the same transaction that marks the job done.
+    """
+
+    def __init__(self, db_file: str = QUEUE_DB, lease_seconds: int = JOB_LEASE_SECONDS,
+                 max_attempts: int = MAX_JOB_ATTEMPTS):
+        self.db_file = db_file
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                bid_no TEXT PRIMARY KEY,
+                status TEXT NOT NULL DEFAULT 'pending',
+                lease_owner TEXT,
+                lease_expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                meta TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, lease_expires)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                bid_no TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                completed_at REAL NOT NULL
+            )
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, bid_no: str, meta: Optional[dict] = None) -> bool:
+        """Add a job. Returns False if the bid number is already known."""
+        now = time.time()
+        cur = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (bid_no, status, meta, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (bid_no, STATUS_PENDING, json.dumps(meta, ensure_ascii=False) if meta else None, now, now)
+        )
+        return cur.rowcount > 0
+
+    def lease(self, bid_no: str, worker_id: str) -> bool:
+        """
+        Atomically lease a specific job.
+        Succeeds only if the job is pending or its previous lease has expired.
+        """
+        now = time.time()
+        cur = self.conn.execute(
+            """
+            UPDATE jobs
+               SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ?
+             WHERE bid_no = ?
+               AND attempts < ?
+               AND (status = ? OR (status = ? AND lease_expires < ?))
+            """,
+            (STATUS_LEASED, worker_id, now + self.lease_seconds, now,
+             bid_no, self.max_attempts, STATUS_PENDING, STATUS_LEASED, now)
+        )
+        return cur.rowcount > 0
+
+    def available(self, scope: str = "") -> List[Tuple[str, dict]]:
+        """
+        Jobs of a scope (the 'shard' name in their meta, '' for unsharded runs)
+        that can be leased now: pending, or leased with an expired lease.
+        Returns [(bid_no, meta), ...] oldest first; lease each before fetching it.
+        """
+        rows = self.conn.execute(
+            """
+            SELECT bid_no, meta FROM jobs
+             WHERE attempts < ?
+               AND (status = ? OR (status = ? AND lease_expires < ?))
+               AND COALESCE(json_extract(meta, '$.shard'), '') = ?
+             ORDER BY created_at
+            """,
+            (self.max_attempts, STATUS_PENDING, STATUS_LEASED, time.time(), scope)
+        ).fetchall()
+        return [(bid_no, json.loads(meta) if meta else {}) for bid_no, meta in rows]
+
+    def complete(self, bid_no: str, worker_id: str, item: BidItem) -> bool:
+        """
+        Record the result and mark the job done in one transaction.
+        Returns False (and writes nothing) if the lease is no longer held by worker_id.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            cur = self.conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, last_error = NULL, updated_at = ? "
+                "WHERE bid_no = ? AND status = ? AND lease_owner = ?",
+                (STATUS_DONE, now, bid_no, STATUS_LEASED, worker_id)
+            )
+            if cur.rowcount == 0:
+                self.conn.execute("ROLLBACK")
+                logger.warning(f"Lease for {bid_no} lost before completion; result discarded.")
+                return False
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (bid_no, data, completed_at) VALUES (?, ?, ?)",
+                (bid_no, json.dumps(item.to_dict(), ensure_ascii=False), now)
+            )
+            self.conn.execute("COMMIT")
+            return True
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def fail(self, bid_no: str, worker_id: str, error: str = ""):
+        """Release a leased job after a failure. It is retried until max_attempts is reached."""
+        now = time.time()
+        self.conn.execute(
+            """
+            UPDATE jobs
+               SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END,
+                   lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ?
+             WHERE bid_no = ? AND status = ? AND lease_owner = ?
+            """,
+            (self.max_attempts, STATUS_FAILED, STATUS_PENDING, error[:500], now,
+             bid_no, STATUS_LEASED, worker_id)
+        )
+
+    def load_results(self, since: Optional[float] = None) -> List[BidItem]:
+        """Load completed results in completion order (only those completed at or after `since`, if given)."""
+        rows = self.conn.execute(
+            "SELECT data FROM results WHERE completed_at >= ? ORDER BY completed_at", (since or 0,)
+        ).fetchall()
+        return [BidItem(**json.loads(data)) for (data,) in rows]
+
+    @contextmanager
+    def snapshot(self):
+        """Read transaction: every query inside it sees the same committed data (e.g. both export passes)."""
+        self.conn.execute("BEGIN")
+        try:
+            yield self
+        finally:
+            self.conn.execute("COMMIT")
+
+    def iter_results(self, batch_size: int = 500) -> Iterator[BidItem]:
+        """Stream completed results in completion order without loading them all."""
+        cursor = self.conn.execute("SELECT data FROM results ORDER BY completed_at")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for (data,) in rows:
+                yield BidItem(**json.loads(data))
+
+    def stats(self) -> dict:
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def retried(self) -> int:
+        """Number of jobs leased more than once (re-processed after a failure or expired lease)."""
+        return self.conn.execute("SELECT COUNT(*) FROM jobs WHERE attempts > 1").fetchone()[0]
@@ -0,0 +1,220 @@
+import functools
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from .config import METRICS_RESERVOIR_SIZE
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = (0.5, 0.95, 0.99)
+METRIC_PREFIX = "nuri_crawler"
+
+LabelKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, labels: dict) -> LabelKey:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Dict[str, str] = None) -> str:
+    pairs = list(labels) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    escaped = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " "))
+        for k, v in pairs
+    )
+    return "{" + escaped + "}"
+
+
+class Histogram:
+    """
+    Observations of one stage: exact count, sum and max, plus a bounded uniform
+    sample (reservoir sampling) for the quantiles, so long-running watch/daemon
+    processes do not keep every observation.
+    """
+
+    __slots__ = ('count', 'total', 'max', 'samples', 'size')
+
+    def __init__(self, size: int = METRICS_RESERVOIR_SIZE):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples: List[float] = []
+        self.size = size
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+        else:
+            index = random.randrange(self.count)
+            if index < self.size:
+                self.samples[index] = value
+
+    def sorted_samples(self) -> List[float]:
+        return sorted(self.samples)
+
+
+class Metrics:
+    """
+    Per-stage latency histograms and counters for one crawler process.
+
+    Stages are timed with `with metrics.stage("parse"):` or the @timed decorator;
+    results are exported as a JSON run report and a Prometheus text file, and
+    optionally served on a local /metrics endpoint.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self.histograms: Dict[LabelKey, Histogram] = defaultdict(Histogram)
+        self.counters: Dict[LabelKey, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._server = None
+
+    @contextmanager
+    def stage(self, name: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def observe(self, name: str, seconds: float, **labels):
+        with self._lock:
+            self.histograms[_key(name, labels)].add(seconds)
+
+    def incr(self, name: str, amount: float = 1, **labels):
+        with self._lock:
+            self.counters[_key(name, labels)] += amount
+
+    def summary(self) -> dict:
+        """Machine-readable run summary."""
+        with self._lock:
+            stages = {}
+            for (name, labels), hist in sorted(self.histograms.items()):
+                ordered = hist.sorted_samples()
+                label_suffix = "".join(f"[{k}={v}]" for k, v in labels)
+                stages[name + label_suffix] = {
+                    'count': hist.count,
+                    'total_s': round(hist.total, 4),
+                    'mean_s': round(hist.total / hist.count, 4),
+                    'p50_s': round(_percentile(ordered, 0.5), 4),
+                    'p95_s': round(_percentile(ordered, 0.95), 4),
+                    'p99_s': round(_percentile(ordered, 0.99), 4),
+                    'max_s': round(hist.max, 4),
+                }
+            counters = {
+                name + "".join(f"[{k}={v}]" for k, v in labels): value
+                for (name, labels), value in sorted(self.counters.items())
+            }
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'duration_s': round(time.perf_counter() - self._start, 3),
+            'stages': stages,
+            'counters': counters,
+        }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            histograms = [(key, hist.sorted_samples(), hist.total, hist.count)
+                          for key, hist in sorted(self.histograms.items())]
+            counters = sorted(self.counters.items())
+
+        seen = set()
+        for (name, labels), ordered, total, count in histograms:
+            metric = f"{METRIC_PREFIX}_{name}_seconds"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} summary")
+                seen.add(metric)
+            for q in QUANTILES:
+                lines.append(f"{metric}{_format_labels(labels, {'quantile': str(q)})} {_percentile(ordered, q):.6f}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+
+        for (name, labels), value in counters:
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}_run_duration_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}_run_duration_seconds {time.perf_counter() - self._start:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, filename: str):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def write_prometheus(self, filename: str):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        # Write-then-rename so node_exporter's textfile collector never reads a partial file
+        tmp = filename + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, filename)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve /metrics (Prometheus text) and /report (JSON) from a background thread."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body, content_type = metrics.to_prometheus(), "text/plain; version=0.0.4"
+                elif self.path.startswith("/report"):
+                    body, content_type = json.dumps(metrics.summary(), ensure_ascii=False), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Metrics endpoint at http://{host}:{port}/metrics")
+
+    def stop_server(self):
+        if self._server:
+            self._server.shutdown()
+            self._server = None
+
+
+def timed(stage: str):
+    """Time a method as `stage` using the instance's `metrics` attribute."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(stage):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
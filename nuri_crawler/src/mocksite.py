@@ -0,0 +1,342 @@
+"""
+Local stand-in for the parts of nuri.g2b.go.kr the crawler depends on:
+
+- main page with popup, depth1/2/3 menu and the content iframe
+- list page (iframe URL contains 'BidPbancL') with search button,
+  tr.gridBodyDefault rows and .w2pageList pagination (a[index=N])
+- detail pages with w2textbox label/span pairs and w2grid sub-grids,
+  built from the stored data/results.json. With grid_window, grids render
+  only their first rows (like WebSquare's virtual scrolling) and the full
+  data is reachable through $p.getComponentById(id)
+
+Optional fault injection (soak tests) per response: missing list button,
+detached content frame, slow loading spinner, vanishing pagination and
+HTTP 500 errors.
+"""
+import html
+import json
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs, urlencode
+from .config import SOAK_SPINNER_MS, SOAK_PAGINATION_GAP_MS
+
+logger = logging.getLogger(__name__)
+
+ROWS_PER_PAGE = 10
+PAGES_PER_BLOCK = 10
+
+MAIN_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>누리장터 (mock)</title></head>
+<body>
+<div class="w2window" id="popup_notice">
+  <p>공지사항 (mock)</p>
+  <input type="button" class="btn close" value="닫기" onclick="this.parentNode.style.display='none'">
+</div>
+<ul class="menu">
+  <li><a class="depth1" href="#">입찰공고</a>
+    <ul><li><a class="depth2" href="#">입찰공고</a>
+      <ul><li><a class="depth3" href="#" onclick="openList(); return false;">입찰공고목록</a></li></ul>
+    </li></ul>
+  </li>
+</ul>
+<iframe name="__processbarIFrame" style="display:none"></iframe>
+<iframe name="mf_wfm_container" id="mf_wfm_container" src="about:blank" style="width:1800px;height:900px"></iframe>
+<script>
+function openList() {
+  document.getElementById('mf_wfm_container').src = '/ui/BidPbancL?searched=0';
+}
+</script>
+</body></html>
+"""
+
+
+def _e(value) -> str:
+    return html.escape(str(value if value is not None else ""))
+
+
+class MockSite:
+    """
+    Threaded HTTP server generating `total` notices by cycling the records in
+    results.json with synthetic bid numbers and descending 입력일시.
+    Every response is delayed by latency_ms. `faults` maps a fault name
+    (see FAULTS) to the probability of injecting it into a response.
+    `grid_window` caps the rendered rows per grid (None = render all).
+    """
+
+    FAULTS = ("missing_list_button", "detached_frame", "slow_spinner", "missing_pagination", "server_error")
+
+    def __init__(self, results_file: str = "data/results.json", total: int = 100,
+                 latency_ms: float = 0, host: str = "127.0.0.1", port: int = 0,
+                 faults: Optional[Dict[str, float]] = None, seed: Optional[int] = None,
+                 grid_window: Optional[int] = None):
+        unknown = set(faults or {}) - set(self.FAULTS)
+        if unknown:
+            raise ValueError(f"Unknown faults: {', '.join(sorted(unknown))}")
+        self.total = total
+        self.latency_ms = latency_ms
+        self.faults = dict(faults or {})
+        self.grid_window = grid_window
+        self.fault_counts = Counter()
+        self.detail_requests = Counter()  # bid_no -> detail page loads
+        self._random = random.Random(seed)
+        self.host = host
+        self.port = port
+        self.templates = self._load_templates(results_file)
+        self.notices = [self._make_notice(i) for i in range(total)]
+        self.by_bid = {n['bid_no']: n for n in self.notices}
+        self.request_count = 0
+        self._server = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_templates(results_file: str) -> List[dict]:
+        with open(results_file, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+        templates = [it['raw_data'] for it in items if it.get('raw_data')]
+        if not templates:
+            raise ValueError(f"No raw_data records in {results_file}")
+        return templates
+
+    def _make_notice(self, i: int) -> dict:
+        raw = dict(self.templates[i % len(self.templates)])
+        bid_no = f"R26BK{90000000 + self.total - i:08d}-000"
+        raw['입찰공고번호'] = bid_no
+        # Newest first, 7 notices per day, 20 minutes apart
+        day = 28 - (i // 7) % 28
+        minute = 60 * 18 - (i % 7) * 20
+        return {
+            'bid_no': bid_no,
+            'input_date': f"2026/02/{day:02d} {minute // 60:02d}:{minute % 60:02d}",
+            'raw': raw,
+        }
+
+    def _inject(self, fault: str) -> bool:
+        """Roll for a fault and count it if injected."""
+        rate = self.faults.get(fault, 0)
+        if not rate:
+            return False
+        with self._lock:
+            injected = self._random.random() < rate
+            if injected:
+                self.fault_counts[fault] += 1
+        return injected
+
+    # --- Rendering -------------------------------------------------------
+
+    def _filtered(self, date_from: str = "") -> List[dict]:
+        if not date_from:
+            return self.notices
+        return [n for n in self.notices if n['input_date'][:10] >= date_from.replace("-", "/")]
+
+    def render_list(self, page: int, searched: bool, date_from: str = "") -> str:
+        notices = self._filtered(date_from) if searched else []
+        start = (page - 1) * ROWS_PER_PAGE
+        rows = []
+        for idx, notice in enumerate(notices[start:start + ROWS_PER_PAGE], start=start + 1):
+            raw = notice['raw']
+            detail_href = "/ui/BidPbancL/detail?" + urlencode({'bid': notice['bid_no'], 'page': page, 'date_from': date_from})
+            rows.append(
+                f'<tr class="gridBodyDefault" id="grid_row_{idx}">'
+                f'<td>{idx}</td><td>{_e(notice["bid_no"])}</td><td>{_e(raw.get("공고종류"))}</td>'
+                f'<td><a href="{_e(detail_href)}">{_e(raw.get("입찰공고명"))}</a></td>'
+                f'<td>{_e(raw.get("담당부서"))}</td><td>{_e(raw.get("담당부서"))}</td>'
+                f'<td>{_e(raw.get("계약방법"))}</td><td>{_e(notice["input_date"])}</td></tr>'
+            )
+
+        # Slow spinner: rows are inserted only after the spinner finishes
+        body_rows, deferred, spinner_script = ''.join(rows), "", ""
+        if rows and self._inject("slow_spinner"):
+            body_rows, deferred = "", f'<template id="deferred_rows">{"".join(rows)}</template>'
+            spinner_script = f"""
+setTimeout(() => {{
+  document.querySelector('.w2grid_body_table tbody').appendChild(document.getElementById('deferred_rows').content.cloneNode(true));
+  document.getElementById('___processbar2').remove();
+}}, {SOAK_SPINNER_MS});"""
+            deferred += '<div id="___processbar2" class="w2_proc_img">처리중...</div>'
+
+        pages = max(1, -(-len(notices) // ROWS_PER_PAGE))
+        block_start = ((page - 1) // PAGES_PER_BLOCK) * PAGES_PER_BLOCK + 1
+        links = []
+        for n in range(block_start, min(block_start + PAGES_PER_BLOCK, pages + 1)):
+            href = "/ui/BidPbancL?" + urlencode({'searched': 1, 'page': n, 'date_from': date_from})
+            cls = "w2pageList_label w2pageList_label_selected" if n == page else "w2pageList_label"
+            links.append(f'<li><a id="mf_wfm_container_pagelist_page_{n}" index="{n}" class="{cls}" href="{_e(href)}">{n}</a></li>')
+        if block_start + PAGES_PER_BLOCK <= pages:
+            href = "/ui/BidPbancL?" + urlencode({'searched': 1, 'page': block_start + PAGES_PER_BLOCK, 'date_from': date_from})
+            links.append(f'<li class="next"><a class="w2pageList_control_next" href="{_e(href)}">다음</a></li>')
+
+        # Vanishing pagination: links are removed right after load and restored later
+        pagination_script = ""
+        if len(links) > 1 and self._inject("missing_pagination"):
+            pagination_script = f"""
+const pageList = document.querySelector('.w2pageList');
+const pageLinks = pageList.innerHTML;
+pageList.innerHTML = '';
+setTimeout(() => {{ pageList.innerHTML = pageLinks; }}, {SOAK_PAGINATION_GAP_MS});"""
+
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>BidPbancL</title></head><body>
+<div class="search">
+  <input id="mf_wfm_container_ibxStrDay" type="text" value="{_e(date_from)}">
+  <input id="mf_wfm_container_btnS0001" type="button" value="검색" onclick="doSearch()">
+</div>
+<div class="w2grid" id="mf_wfm_container_grdBidPbancList">
+  <table class="w2grid_head"><thead><tr>
+    <th>No</th><th>입찰공고번호</th><th>공고종류</th><th>입찰공고명</th><th>공고기관</th><th>수요기관</th><th>계약방법</th><th>입력일시</th>
+  </tr></thead></table>
+  <div class="w2grid_body"><table class="w2grid_body_table"><tbody>
+  {body_rows}
+  </tbody></table></div>
+  {deferred}
+</div>
+<ul class="w2pageList">{''.join(links)}</ul>
+<script>
+function doSearch() {{
+  const from = document.getElementById('mf_wfm_container_ibxStrDay').value;
+  location.href = '/ui/BidPbancL?searched=1&page=1&date_from=' + encodeURIComponent(from);
+}}{spinner_script}{pagination_script}
+</script>
+</body></html>"""
+
+    def render_detail(self, bid_no: str, page: int, date_from: str = "") -> Optional[str]:
+        notice = self.by_bid.get(bid_no)
+        if not notice:
+            return None
+        fields, grids = [], []
+        grid_data = {}  # Backing data of virtualized grids: id -> rows of cell values
+        for grid_idx, (key, value) in enumerate(notice['raw'].items()):
+            if isinstance(value, list):
+                headers = list(value[0].keys()) if value else []
+                head = "".join(
+                    f'<td><div class="w2grid_head_sort_div_main_outer"><nobr>{_e(h)}</nobr></div></td>' for h in headers
+                )
+                rendered = value
+                if self.grid_window and len(value) > self.grid_window:
+                    rendered = value[:self.grid_window]
+                    grid_data[f"grid_{grid_idx}"] = [[row.get(h, "") for h in headers] for row in value]
+                body = "".join(
+                    "<tr>" + "".join(f"<td><nobr>{_e(row.get(h))}</nobr></td>" for h in headers) + "</tr>"
+                    for row in rendered
+                )
+                grids.append(
+                    f'<div class="df_tit">{_e(key)}</div>'
+                    f'<div class="w2grid" id="grid_{grid_idx}">'
+                    f'<table class="w2grid_head"><tr class="w2grid_hRow">{head}</tr></table>'
+                    f'<div class="w2grid_body"><table class="w2grid_body_table">{body}</table></div></div>'
+                )
+            else:
+                fields.append(
+                    f'<div class="w2group"><label class="w2textbox ">{_e(key)}</label>'
+                    f'<span class="w2textbox v-m">{_e(value)}</span></div>'
+                )
+        with self._lock:
+            self.detail_requests[bid_no] += 1
+
+        grid_json = json.dumps(grid_data, ensure_ascii=False).replace("</", "<\\/")
+        back_href = "/ui/BidPbancL?" + urlencode({'searched': 1, 'page': page, 'date_from': date_from})
+        list_button = ""
+        if not self._inject("missing_list_button"):
+            # Detached frame: the list is reopened in a new iframe element instead of navigating
+            detach = "true" if self._inject("detached_frame") else "false"
+            list_button = (
+                '<input type="button" id="mf_wfm_container_btn_list" class="w2trigger btn_list" value="목록" '
+                f'onclick="backToList({detach})">'
+            )
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>BidPbancL detail</title></head><body>
+<div class="df_tit">공고일반</div>
+{''.join(fields)}
+{''.join(grids)}
+{list_button}
+<script>
+const GRID_DATA = {grid_json};
+window.$p = {{
+  getComponentById: (id) => {{
+    const rows = GRID_DATA[id];
+    if (!rows) return null;
+    return {{
+      getTotalRow: () => rows.length,
+      getColumnCount: () => rows.length ? rows[0].length : 0,
+      getCellDisplayData: (row, col) => rows[row][col],
+    }};
+  }},
+}};
+function backToList(detach) {{
+  const href = {json.dumps(back_href)};
+  const old = window.frameElement;
+  if (detach && old) {{
+    const fresh = old.cloneNode(false);
+    fresh.src = href;
+    old.parentNode.replaceChild(fresh, old);
+  }} else {{
+    location.href = href;
+  }}
+}}
+</script>
+</body></html>"""
+
+    # --- Server ----------------------------------------------------------
+
+    def handle(self, path: str, query: dict):
+        """Return (status, body) for a request path."""
+        param = lambda name, default="": query.get(name, [default])[0]
+        if path == "/":
+            return 200, MAIN_PAGE
+        if path.startswith("/ui/") and self._inject("server_error"):
+            return 500, "Internal Server Error"
+        if path == "/ui/BidPbancL":
+            return 200, self.render_list(int(param("page", "1")), param("searched") == "1", param("date_from"))
+        if path == "/ui/BidPbancL/detail":
+            body = self.render_detail(param("bid"), int(param("page", "1")), param("date_from"))
+            return (200, body) if body else (404, "Not found")
+        return 404, "Not found"
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with site._lock:
+                    site.request_count += 1
+                if site.latency_ms:
+                    time.sleep(site.latency_ms / 1000)
+                parsed = urlparse(self.path)
+                status, body = site.handle(parsed.path, parse_qs(parsed.query))
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        return Handler
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self) -> "MockSite":
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info(f"Mock site serving {self.total} notices at {self.url} (latency {self.latency_ms} ms)")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def default_results_file() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "results.json")
@@ -13,5 +13,12 @@ class BidItem:
     # Metadata
     crawled_at: Optional[str] = None
 
+    # Revision tracking: raw_data is always the full record; for amended notices
+    # the per-field delta against previous_revision (the earlier full bid number):
+    # changed_fields {field: {'old': ..., 'new': ...}}, removed_fields {field: old value}
+    previous_revision: Optional[str] = None
+    changed_fields: Optional[dict] = None
+    removed_fields: Optional[dict] = None
+
     def to_dict(self):
         return self.__dict__
@@ -1,13 +1,35 @@
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from .model import BidItem
-from .config import SELECTORS
+from .config import SELECTORS, PROJECTION_MODE, PROJECTION_GRIDS
+from typing import Iterable, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Only label/span elements are needed when no grids are projected
+FIELDS_ONLY = SoupStrainer(['label', 'span'])
+
 class NuriParser:
-    def parse_detail(self, html_content: str, url: str = None) -> BidItem:
+    def __init__(self, fields: Optional[Iterable[str]] = None, grids: Optional[Iterable[str]] = None):
+        """
+        Projection: `fields` are the labels to extract and `grids` the grid titles
+        to keep. None means everything (the default full extraction).
+        """
+        self.fields = set(fields) if fields is not None else None
+        self.grids = set(grids) if grids is not None else None
+
+    @classmethod
+    def from_config(cls) -> "NuriParser":
+        if PROJECTION_MODE:
+            return cls(fields=SELECTORS['detail']['fields_by_label'], grids=PROJECTION_GRIDS or [])
+        return cls()
+
+    @property
+    def projected(self) -> bool:
+        return self.fields is not None or self.grids is not None
+
+    def parse_detail(self, html_content: str, url: str = None, grid_rows: Optional[dict] = None) -> BidItem:
         """
         Parse detail page HTML to extract bid information using label-value pairs.
         
@@ -17,10 +39,15 @@ class NuriParser:
         Args:
             html_content: HTML content of the detail page
             url: URL of the detail page
+            grid_rows: Full row lists by grid element id, read in the frame for
+                virtualized grids; they replace the rendered rows
             
         Returns:
             BidItem with extracted data
         """
+        if self.projected:
+            return self._parse_projected(html_content, url, grid_rows)
+
         soup = BeautifulSoup(html_content, 'lxml')
         
         # Dictionary to store all extracted key-value pairs
@@ -56,11 +83,15 @@ class NuriParser:
 
         
         # 2. Extract Additional Grids (Construct Details, Competitors, etc.)
-        grids_data = self._extract_all_grids(soup)
+        grids_data = self._extract_all_grids(soup, grid_rows=grid_rows)
         data.update(grids_data)
         
         logger.info(f"Total extracted fields (inc. grids): {len(data)}")
         
+        return self.build_item(data, url)
+
+    def build_item(self, data: dict, url: str = None) -> BidItem:
+        """Create a BidItem from extracted label/grid data."""
         # Create BidItem with required fields
         item = BidItem(
             bid_no=data.get('입찰공고번호', ''),
@@ -73,10 +104,48 @@ class NuriParser:
         
         return item
 
-    def _extract_all_grids(self, soup: BeautifulSoup) -> dict:
+    def _parse_projected(self, html_content: str, url: str = None, grid_rows: Optional[dict] = None) -> BidItem:
+        """Extract only the requested fields and grids, stopping once all are found."""
+        want_grids = self.grids is None or bool(self.grids)
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=None if want_grids else FIELDS_ONLY)
+
+        data = {}
+        if self.fields is None or self.fields:
+            remaining = set(self.fields) if self.fields is not None else None
+            current_key = None
+            # Lazy document-order walk so the loop can stop early
+            elements = (
+                el for el in soup.descendants
+                if el.name in ('label', 'span') and 'w2textbox' in (el.get('class') or [])
+            )
+            for el in elements:
+                text = el.get_text(strip=True)
+                if not text:
+                    continue
+                if el.name == 'label':
+                    current_key = text
+                elif current_key:
+                    if remaining is None or current_key in remaining:
+                        data[current_key] = text
+                        if remaining is not None:
+                            remaining.discard(current_key)
+                            if not remaining:
+                                break
+                    current_key = None
+
+        if want_grids:
+            data.update(self._extract_all_grids(soup, only=self.grids, grid_rows=grid_rows))
+
+        logger.debug(f"Projected extraction: {len(data)} fields/grids")
+        return self.build_item(data, url)
+
+    def _extract_all_grids(self, soup: BeautifulSoup, only: Optional[set] = None,
+                           grid_rows: Optional[dict] = None) -> dict:
         """
         Extract all tables/grids found in the page.
         Identifies grids by looking for .w2grid containers and their preceding titles.
+        With `only`, other grids are skipped unparsed and the walk stops once all are found.
+        Containers whose id is in `grid_rows` take those rows instead of the rendered ones.
         """
         results = {}
         
@@ -93,12 +162,19 @@ class NuriParser:
             prev_el = container.find_previous(['div', 'h3', 'h4'], class_=['df_tit', 'tit', 'w2textbox'])
             if prev_el:
                 title = prev_el.get_text(strip=True)
+
+            if only is not None and title not in only:
+                continue
             
             # Extract header and rows
-            rows = self._parse_ws_grid(container)
+            rows = grid_rows.get(container.get('id')) if grid_rows else None
+            if rows is None:
+                rows = self._parse_ws_grid(container)
             if rows:
                 results[title] = rows
                 logger.info(f"Extracted grid '{title}' with {len(rows)} rows")
+            if only is not None and len(results) == len(only):
+                break
         
         return results
 
@@ -0,0 +1,249 @@
+"""
+Offline micro-benchmark for NuriParser over a corpus of detail-page HTML.
+
+Every *.html file in the corpus directory is benchmarked, so real pages saved
+by `crawl --profile-rate` (data/diagnostics/<run>/<bid_no>.html) can be
+copied in next to the generated fixtures.
+"""
+import copy
+import json
+import logging
+import os
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+from bs4 import BeautifulSoup
+from .config import PARSER_CORPUS_DIR, PARSER_BASELINE_FILE, PARSER_BENCH_ITERATIONS, PARSER_REGRESSION_THRESHOLD
+from .mocksite import MockSite, default_results_file
+from .parser import NuriParser
+
+logger = logging.getLogger(__name__)
+
+# (fixture name, index into results.json, rows per 투찰제한 grid or None to keep as stored)
+CORPUS_SPEC = [
+    ("01_unnamed_grid", 0, None),  # Unnamed grid lands under key ''
+    ("02_named_license_grid", 7, None),  # '[...] 업종을 등록한 업체' grid title
+    ("03_many_attachments", 1, None),
+    ("04_revision", 3, None),  # -001 amended notice
+    ("05_large_restriction_grids", 0, 250),
+    ("06_huge_restriction_grids", 0, 1000),
+]
+LARGE_GRIDS = ("투찰제한-지역", "투찰제한-업종")
+
+
+def _scale_grid(rows: List[dict], size: int) -> List[dict]:
+    if not rows:
+        return rows
+    scaled = []
+    for i in range(size):
+        row = dict(rows[i % len(rows)])
+        first_key = next(iter(row))
+        row[first_key] = f"{row[first_key]} {i // len(rows) + 1}" if i >= len(rows) else row[first_key]
+        scaled.append(row)
+    return scaled
+
+
+def build_corpus(corpus_dir: str = PARSER_CORPUS_DIR, results_file: Optional[str] = None) -> List[str]:
+    """Render the fixtures in CORPUS_SPEC with the mock site's detail template."""
+    site = MockSite(results_file or default_results_file(), total=0)
+    os.makedirs(corpus_dir, exist_ok=True)
+    written = []
+    for name, index, grid_rows in CORPUS_SPEC:
+        raw = copy.deepcopy(site.templates[index % len(site.templates)])
+        if grid_rows:
+            for key in LARGE_GRIDS:
+                raw[key] = _scale_grid(raw.get(key, []), grid_rows)
+        bid_no = raw.get('입찰공고번호', name)
+        site.by_bid[bid_no] = {'bid_no': bid_no, 'input_date': '', 'raw': raw}
+        path = os.path.join(corpus_dir, f"{name}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(site.render_detail(bid_no, page=1))
+        written.append(path)
+    logger.info(f"Wrote {len(written)} fixtures to {corpus_dir}")
+    return written
+
+
+def load_corpus(corpus_dir: str = PARSER_CORPUS_DIR) -> Dict[str, str]:
+    docs = {}
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.endswith(".html"):
+            with open(os.path.join(corpus_dir, name), 'r', encoding='utf-8') as f:
+                docs[name] = f.read()
+    if not docs:
+        raise FileNotFoundError(f"No .html fixtures in {corpus_dir} (run with --build-corpus)")
+    return docs
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _calibration_workload():
+    """Fixed pure-Python workload; its time scales rates to the machine's current speed."""
+    total = 0
+    for i in range(200000):
+        total += i % 7
+    return total
+
+
+def _spread(values: List[float]) -> float:
+    """Interquartile range relative to the median: the round-to-round noise the gate has to tolerate."""
+    if len(values) < 2:
+        return 0.0
+    q1, _, q3 = statistics.quantiles(values, n=4)
+    middle = statistics.median(values)
+    return (q3 - q1) / middle if middle else 0.0
+
+
+def _allocations(func) -> dict:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, 'filename')
+    del result
+    return {
+        'peak_kb': round(peak / 1024, 1),
+        'retained_kb': round(sum(stat.size_diff for stat in diff) / 1024, 1),
+        'blocks': sum(stat.count_diff for stat in diff),
+    }
+
+
+def benchmark_corpus(docs: Dict[str, str], iterations: int = PARSER_BENCH_ITERATIONS) -> dict:
+    """
+    Docs/sec and allocation profile of parse_detail and _extract_all_grids per fixture.
+
+    Each of `iterations` rounds times every document and stage once, plus the
+    calibration workload, so slow phases of a busy machine hit all of them alike.
+    Reported rates are medians over the rounds; 'spread' is the relative
+    interquartile range of the corpus rate across rounds (see check_regression).
+    """
+    parser = NuriParser()
+    # Per-call INFO logging would dominate the timings
+    parser_logger = logging.getLogger(NuriParser.__module__)
+    level = parser_logger.level
+    parser_logger.setLevel(logging.WARNING)
+    stages = ('parse_detail', 'extract_all_grids')
+    try:
+        calls = {}
+        for name, html in docs.items():
+            soup = BeautifulSoup(html, 'lxml')
+            calls[name] = {
+                'parse_detail': lambda html=html: parser.parse_detail(html),
+                'extract_all_grids': lambda soup=soup: parser._extract_all_grids(soup),
+            }
+            for func in calls[name].values():
+                func()  # Warm-up
+
+        samples = {name: {stage: [] for stage in stages} for name in docs}
+        calibrations, corpus_rates = [], {stage: [] for stage in stages}
+        for _ in range(iterations):
+            calibrations.append(_timed(_calibration_workload))
+            round_totals = dict.fromkeys(stages, 0.0)
+            for name in docs:
+                for stage in stages:
+                    seconds = _timed(calls[name][stage])
+                    samples[name][stage].append(seconds)
+                    round_totals[stage] += seconds
+            for stage in stages:
+                corpus_rates[stage].append(len(docs) / round_totals[stage])
+
+        per_doc = {}
+        totals = dict.fromkeys(stages, 0.0)
+        for name, html in docs.items():
+            per_doc[name] = {'size_kb': round(len(html.encode('utf-8')) / 1024, 1)}
+            for stage in stages:
+                seconds = statistics.median(samples[name][stage])
+                totals[stage] += seconds
+                per_doc[name][stage] = {'docs_per_s': round(1 / seconds, 2), 'alloc': _allocations(calls[name][stage])}
+    finally:
+        parser_logger.setLevel(level)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'documents': len(docs),
+        'iterations': iterations,
+        'python': sys.version.split()[0],
+        'calibration_s': round(statistics.median(calibrations), 6),
+        # Corpus-wide throughput: each document parsed once per pass (median per document)
+        'docs_per_s': {stage: round(len(docs) / seconds, 2) for stage, seconds in totals.items()},
+        'spread': {stage: round(_spread(values), 4) for stage, values in corpus_rates.items()},
+        'peak_rss_mb': round(peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024, 1),
+        'per_doc': per_doc,
+    }
+
+
+def _drops(checks, scale: float, tolerance: Dict[str, float]) -> List[str]:
+    messages = []
+    for label, stage, rate, base_rate in checks:
+        allowed = tolerance[stage]
+        if base_rate and rate * scale < base_rate * (1 - allowed):
+            drop = (1 - rate * scale / base_rate) * 100
+            messages.append(f"{label}: {rate} docs/s vs baseline {base_rate} "
+                            f"(-{drop:.1f}% machine-normalized, tolerance {allowed:.0%})")
+    return messages
+
+
+def check_regression(report: dict, baseline: dict, threshold: float = PARSER_REGRESSION_THRESHOLD):
+    """
+    Compare machine-normalized median docs/sec with the baseline. Returns (failures, warnings):
+    corpus-wide drops beyond the tolerance fail the gate; per-document drops are
+    reported as warnings since single small documents are too noisy to gate on.
+
+    The tolerance per stage is `threshold`, widened to the larger round-to-round
+    spread measured in this run or the baseline, so noise alone never fails it.
+    """
+    scale = 1.0
+    if baseline.get('calibration_s') and report.get('calibration_s'):
+        scale = report['calibration_s'] / baseline['calibration_s']
+
+    tolerance = {
+        stage: max(threshold, report.get('spread', {}).get(stage, 0.0), baseline.get('spread', {}).get(stage, 0.0))
+        for stage in report['docs_per_s']
+    }
+    corpus = [(f"corpus {stage}", stage, rate, baseline.get('docs_per_s', {}).get(stage))
+              for stage, rate in report['docs_per_s'].items()]
+    per_doc = []
+    for name, doc in report['per_doc'].items():
+        base_doc = baseline.get('per_doc', {}).get(name, {})
+        for stage in ('parse_detail', 'extract_all_grids'):
+            per_doc.append((f"{name} {stage}", stage, doc[stage]['docs_per_s'],
+                            base_doc.get(stage, {}).get('docs_per_s')))
+    return _drops(corpus, scale, tolerance), _drops(per_doc, scale, tolerance)
+
+
+def run_parser_bench(corpus_dir: str = PARSER_CORPUS_DIR, baseline_file: str = PARSER_BASELINE_FILE,
+                     iterations: int = PARSER_BENCH_ITERATIONS, threshold: float = PARSER_REGRESSION_THRESHOLD,
+                     update_baseline: bool = False, build: bool = False) -> int:
+    """Run the benchmark and compare against the baseline. Returns a process exit code."""
+    if build or not os.path.isdir(corpus_dir):
+        build_corpus(corpus_dir)
+    report = benchmark_corpus(load_corpus(corpus_dir), iterations)
+    print(json.dumps({k: v for k, v in report.items() if k != 'per_doc'}, ensure_ascii=False, indent=2))
+
+    if update_baseline or not os.path.exists(baseline_file):
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        logger.info(f"Baseline written to {baseline_file}")
+        return 0
+
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    failures, warnings = check_regression(report, baseline, threshold)
+    for warning in warnings:
+        logger.warning(f"Slower document: {warning}")
+    for failure in failures:
+        logger.error(f"Parser regression: {failure}")
+    if failures:
+        return 1
+    logger.info(f"Parser throughput within tolerance of baseline (threshold {threshold:.0%}, spread {report['spread']}).")
+    return 0
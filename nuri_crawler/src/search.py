@@ -0,0 +1,355 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+from .config import (SEARCH_DB, SEARCH_AGENCY_FIELDS, SEARCH_DATE_FIELDS, SEARCH_DEADLINE_FIELDS, SEARCH_ITEM_GRIDS,
+                     SEARCH_BID_TYPE_FIELD, SEARCH_TASK_CATEGORY_FIELD)
+from .model import BidItem
+from .state import normalize_input_date, split_revision
+
+logger = logging.getLogger(__name__)
+
+# Hangul syllables/jamo and CJK ideographs are indexed as overlapping bigrams;
+# Latin letters and digits as whole lowercase words
+CJK_RUN = r'[가-힣ᄀ-ᇿ㄰-㆏一-鿿]+'
+TOKEN_PATTERN = re.compile(f'({CJK_RUN})|([0-9a-z]+)')
+
+# Above this many full-text matches, walk the date index newest-first and stop
+# at the LIMIT instead of sorting every match
+SORT_MATCHES_LIMIT = 5000
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    '건축물 안전점검 2026' -> ['건축', '축물', '안전', '전점', '점검', '2026'].
+    Korean has no reliable word boundaries, so any substring of two or more
+    syllables is found as a phrase of consecutive bigrams.
+    """
+    tokens = []
+    for cjk, word in TOKEN_PATTERN.findall((text or "").lower()):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+def match_query(text: str) -> Optional[str]:
+    """
+    FTS5 MATCH expression requiring every query word: a multi-syllable word
+    becomes a phrase of its bigrams, a single syllable a prefix match.
+    """
+    terms = []
+    for cjk, word in TOKEN_PATTERN.findall((text or "").lower()):
+        if word:
+            terms.append(f'"{word}"*' if len(word) < 3 else f'"{word}"')
+        elif len(cjk) == 1:
+            terms.append(f'"{cjk}"*')
+        else:
+            terms.append('"' + " ".join(cjk[i:i + 2] for i in range(len(cjk) - 1)) + '"')
+    return " AND ".join(terms) or None
+
+
+def _first(raw: dict, fields: Iterable[str]) -> Optional[str]:
+    for field in fields:
+        value = raw.get(field)
+        if value and not isinstance(value, list):
+            return value
+    return None
+
+
+def _item_names(raw: dict) -> Optional[str]:
+    """Item names from the sub-grids (물품 품명, 공사명, 용역명), or None if no such grid."""
+    names, found = [], False
+    for grid, column in SEARCH_ITEM_GRIDS.items():
+        rows = raw.get(grid)
+        if isinstance(rows, list):
+            found = True
+            names.extend(row.get(column, "") for row in rows if row.get(column))
+    return " ".join(names) if found else None
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index of crawled notices keyed by base bid number, so an
+    amended notice updates its original entry. Searchable text (공고명,
+    agency, sub-grid item names) is stored pre-tokenized into Hangul bigrams;
+    the full merged record is kept alongside for the read API.
+
+    Every write bumps `seq` on the touched rows and the index generation,
+    which readers use for change feeds, cursors and cache invalidation.
+    """
+
+    COLUMNS = ('bid_no', 'bid_name', 'bid_type', 'task_category', 'agency', 'notice_date', 'deadline', 'items', 'url')
+
+    def __init__(self, db_file: str = SEARCH_DB):
+        self.db_file = db_file
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self):
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS notices (
+                id INTEGER PRIMARY KEY,
+                base_no TEXT NOT NULL UNIQUE,
+                bid_no TEXT NOT NULL,
+                bid_name TEXT,
+                agency TEXT,
+                notice_date TEXT,
+                items TEXT,
+                url TEXT
+            )
+        """)
+        # Columns added for the read API (kept as ALTERs so older index files upgrade in place)
+        existing = {row[1] for row in self.conn.execute("PRAGMA table_info(notices)")}
+        for column, decl in [('bid_type', 'TEXT'), ('task_category', 'TEXT'), ('deadline', 'TEXT'),
+                             ('data', 'TEXT'), ('crawled_at', 'TEXT'), ('seq', 'INTEGER NOT NULL DEFAULT 0')]:
+            if column not in existing:
+                self.conn.execute(f"ALTER TABLE notices ADD COLUMN {column} {decl}")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_notices_date ON notices(notice_date)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_notices_seq ON notices(seq)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_notices_deadline ON notices(deadline)")
+        self.conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS notices_fts USING fts5(
+                bid_name, agency, items, tokenize = 'unicode61 remove_diacritics 0'
+            )
+        """)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM notices").fetchone()[0]
+
+    def generation(self) -> tuple:
+        """(generation, last write time) of the index; changes on every committed write."""
+        meta = dict(self.conn.execute("SELECT key, value FROM meta WHERE key IN ('generation', 'updated_at')"))
+        return int(meta.get('generation', 0)), float(meta.get('updated_at', 0))
+
+    def _upsert(self, item: BidItem, seq: int):
+        raw = dict(item.raw_data or {})
+        base_no, _ = split_revision(item.bid_no)
+        row = self.conn.execute("SELECT id FROM notices WHERE base_no = ?", (base_no,)).fetchone()
+        notice_date = _first(raw, SEARCH_DATE_FIELDS)
+        deadline = _first(raw, SEARCH_DEADLINE_FIELDS)
+        values = {
+            'bid_no': item.bid_no,
+            'bid_name': item.bid_name or raw.get('입찰공고명') or None,
+            'bid_type': raw.get(SEARCH_BID_TYPE_FIELD) or None,
+            'task_category': raw.get(SEARCH_TASK_CATEGORY_FIELD) or None,
+            'agency': _first(raw, SEARCH_AGENCY_FIELDS),
+            'notice_date': normalize_input_date(notice_date) if notice_date else None,
+            'deadline': normalize_input_date(deadline) if deadline else None,
+            'items': _item_names(raw),
+            'url': item.url,
+            'data': json.dumps(raw, ensure_ascii=False),
+            'crawled_at': item.crawled_at,
+            'seq': seq,
+        }
+        names = list(values)
+        if row:
+            row_id = row[0]
+            self.conn.execute(
+                f"UPDATE notices SET {', '.join(f'{n} = ?' for n in names)} WHERE id = ?",
+                [values[n] for n in names] + [row_id]
+            )
+            self.conn.execute("DELETE FROM notices_fts WHERE rowid = ?", (row_id,))
+        else:
+            row_id = self.conn.execute(
+                f"INSERT INTO notices (base_no, {', '.join(names)}) VALUES ({', '.join('?' * (len(names) + 1))})",
+                [base_no] + [values[n] for n in names]
+            ).lastrowid
+        self.conn.execute(
+            "INSERT INTO notices_fts (rowid, bid_name, agency, items) VALUES (?, ?, ?, ?)",
+            (row_id, " ".join(tokenize(values['bid_name'])), " ".join(tokenize(values['agency'])),
+             " ".join(tokenize(values['items'])))
+        )
+
+    def add(self, items: Iterable[BidItem]) -> int:
+        """Index (or re-index) items in one transaction. Returns the number indexed."""
+        count = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM notices").fetchone()[0]
+            for item in items:
+                if item.bid_no:
+                    seq += 1
+                    self._upsert(item, seq)
+                    count += 1
+            if count:
+                generation, _ = self.generation()
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                    [('generation', str(generation + 1)), ('updated_at', repr(time.time()))]
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def rebuild_from_json(self, json_file: str) -> int:
+        """Index every item in a results.json file (existing entries are updated)."""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        items = [BidItem(**{k: v for k, v in d.items() if k in BidItem.__dataclass_fields__}) for d in data]
+        return self.add(items)
+
+    def _match_clause(self, keyword: Optional[str], agency: Optional[str]):
+        """
+        ('n.id IN (...)', match expression, bounded match count), or None when
+        there is no full-text condition.
+        """
+        match = []
+        keyword_query = match_query(keyword) if keyword else None
+        if keyword_query:
+            match.append(f"{{bid_name items}} : ({keyword_query})")
+        agency_query = match_query(agency) if agency else None
+        if agency_query:
+            match.append(f"agency : ({agency_query})")
+        if not match:
+            return None
+        match_expr = " AND ".join(match)
+        # Bounded count: only need to know whether there are more than SORT_MATCHES_LIMIT
+        matches = self.conn.execute(
+            "SELECT COUNT(*) FROM (SELECT rowid FROM notices_fts WHERE notices_fts MATCH ? LIMIT ?)",
+            (match_expr, SORT_MATCHES_LIMIT + 1)
+        ).fetchone()[0]
+        return "n.id IN (SELECT rowid FROM notices_fts WHERE notices_fts MATCH ?)", match_expr, matches
+
+    @staticmethod
+    def _range(clauses: list, params: list, column: str, date_from: Optional[str], date_to: Optional[str]):
+        if date_from:
+            clauses.append(f"n.{column} >= ?")
+            params.append(normalize_input_date(date_from))
+        if date_to:
+            clauses.append(f"n.{column} < ?")
+            # Inclusive end date: everything on that day sorts before its next character
+            params.append(normalize_input_date(date_to) + "~")
+
+    def search(self, keyword: Optional[str] = None, agency: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None, limit: int = 50) -> List[dict]:
+        """
+        Notices matching all given conditions, newest first.
+        keyword matches 공고명 and sub-grid item names, agency the agency column,
+        and dates ('YYYY/MM/DD' or 'YYYY-MM-DD') are inclusive.
+        """
+        start = time.perf_counter()
+        clauses, params = [], []
+        scan_by_date = False
+        match = self._match_clause(keyword, agency)
+        if match:
+            clause, match_expr, matches = match
+            if not matches:
+                return []
+            scan_by_date = matches > SORT_MATCHES_LIMIT
+            clauses.append(clause)
+            params.append(match_expr)
+        self._range(clauses, params, "notice_date", date_from, date_to)
+
+        sql = f"SELECT {', '.join('n.' + c for c in self.COLUMNS)} FROM notices n"
+        if scan_by_date:
+            sql += " INDEXED BY idx_notices_date"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY n.notice_date DESC LIMIT ?"
+        params.append(limit)
+
+        rows = self.conn.execute(sql, params).fetchall()
+        logger.debug(f"Search returned {len(rows)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return [dict(zip(self.COLUMNS, row)) for row in rows]
+
+    def page(self, keyword: Optional[str] = None, agency: Optional[str] = None, bid_type: Optional[str] = None,
+             task_category: Optional[str] = None, deadline_from: Optional[str] = None,
+             deadline_to: Optional[str] = None, before_seq: Optional[int] = None, after_seq: Optional[int] = None,
+             limit: int = 50, full: bool = False) -> List[dict]:
+        """
+        One keyset page ordered by write sequence: newest writes first, or
+        oldest first after `after_seq` (a change feed). Each row carries its
+        `seq`, which the caller turns into the next cursor.
+        """
+        clauses, params = [], []
+        scan_by_seq = True
+        match = self._match_clause(keyword, agency)
+        if match:
+            clause, match_expr, matches = match
+            if not matches:
+                return []
+            # Few matches: sorting them beats walking the whole seq index
+            scan_by_seq = matches > SORT_MATCHES_LIMIT
+            clauses.append(clause)
+            params.append(match_expr)
+        if bid_type:
+            clauses.append("n.bid_type = ?")
+            params.append(bid_type)
+        if task_category:
+            clauses.append("n.task_category = ?")
+            params.append(task_category)
+        self._range(clauses, params, "deadline", deadline_from, deadline_to)
+        if before_seq is not None:
+            clauses.append("n.seq < ?")
+            params.append(before_seq)
+        if after_seq is not None:
+            clauses.append("n.seq > ?")
+            params.append(after_seq)
+
+        columns = self.COLUMNS + ('seq', 'crawled_at') + (('data',) if full else ())
+        sql = f"SELECT {', '.join('n.' + c for c in columns)} FROM notices n"
+        if scan_by_seq:
+            sql += " INDEXED BY idx_notices_seq"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY n.seq {'ASC' if after_seq is not None else 'DESC'} LIMIT ?"
+        params.append(limit)
+
+        results = []
+        for row in self.conn.execute(sql, params):
+            record = dict(zip(columns, row))
+            if full:
+                record['raw_data'] = json.loads(record.pop('data') or '{}')
+            results.append(record)
+        return results
+
+    def get(self, bid_no: str) -> Optional[dict]:
+        """Full merged record by bid number (any revision of it)."""
+        base_no, _ = split_revision(bid_no)
+        columns = self.COLUMNS + ('seq', 'crawled_at', 'data')
+        row = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM notices WHERE base_no = ?", (base_no,)
+        ).fetchone()
+        if not row:
+            return None
+        record = dict(zip(columns, row))
+        record['raw_data'] = json.loads(record.pop('data') or '{}')
+        return record
+
+    @contextmanager
+    def snapshot(self):
+        """Read transaction: every query inside it sees the same committed data (e.g. both export passes)."""
+        self.conn.execute("BEGIN")
+        try:
+            yield self
+        finally:
+            self.conn.execute("COMMIT")
+
+    def iter_items(self, batch_size: int = 500) -> Iterator[BidItem]:
+        """Stream the merged records (revisions applied) in write order, e.g. for CSV export."""
+        cursor = self.conn.execute("SELECT bid_no, bid_name, url, data, crawled_at FROM notices ORDER BY seq")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for bid_no, bid_name, url, data, crawled_at in rows:
+                yield BidItem(bid_no=bid_no, bid_name=bid_name, url=url,
+                              raw_data=json.loads(data or '{}'), crawled_at=crawled_at)
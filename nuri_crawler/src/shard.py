@@ -0,0 +1,134 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import List, Optional
+from .config import SHARD_PROCESSES, SHARD_DAYS, SHARD_TARGET_COUNT, METRICS_PORT, HEADLESS, DELAY_BETWEEN_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = "%Y/%m/%d"  # Matches the site's date display (e.g. 2026/02/09)
+
+
+def split_date_range(date_from: str, date_to: str, days: int = SHARD_DAYS,
+                     extra_filters: Optional[dict] = None) -> List[dict]:
+    """
+    Split an inclusive notice date range into shards of `days` days each.
+
+    Returns:
+        List of shard dicts: {'name': ..., 'filters': {'date_from': ..., 'date_to': ..., ...}}
+    """
+    start = datetime.strptime(date_from, DATE_FORMAT)
+    end = datetime.strptime(date_to, DATE_FORMAT)
+    shards = []
+    while start <= end:
+        shard_end = min(start + timedelta(days=days - 1), end)
+        filters = {
+            'date_from': start.strftime(DATE_FORMAT),
+            'date_to': shard_end.strftime(DATE_FORMAT),
+        }
+        if extra_filters:
+            filters.update(extra_filters)
+        shards.append({
+            'name': f"{start:%Y%m%d}-{shard_end:%Y%m%d}",
+            'filters': filters,
+        })
+        start = shard_end + timedelta(days=1)
+    return shards
+
+
+def split_by_values(key: str, values: List[str], base_filters: Optional[dict] = None) -> List[dict]:
+    """Build one shard per value of a single filter (e.g. 업무분류 task categories or agencies)."""
+    shards = []
+    for value in values:
+        filters = dict(base_filters or {})
+        filters[key] = value
+        shards.append({'name': f"{key}-{value}", 'filters': filters})
+    return shards
+
+
+def _run_shard(shard: dict, target_count: int, output_root: str, headless: bool = HEADLESS,
+               delay: float = DELAY_BETWEEN_REQUESTS, metrics_port: Optional[int] = None) -> int:
+    """Worker process entry point: one browser per shard."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format=f'%(asctime)s - [{shard["name"]}] %(name)s - %(levelname)s - %(message)s'
+    )
+    # Imported here so the coordinator process never loads Playwright
+    from .crawler import NuriCrawler
+
+    crawler = NuriCrawler(
+        shard=shard,
+        target_count=target_count,
+        output_dir=os.path.join(output_root, "shards", shard['name']),
+        headless=headless,
+        delay=delay,
+        metrics_port=metrics_port,
+    )
+    crawler.run()
+    return len(crawler.results)
+
+
+class ShardCoordinator:
+    """
+    Runs each shard in its own process with its own browser.
+    Dedupe happens through the shared SQLite job queue: a bid number leased
+    by one shard is skipped by the others, and completed results are merged
+    from the queue once all shards finish.
+    """
+
+    def __init__(self, shards: List[dict], processes: int = SHARD_PROCESSES,
+                 target_count: int = SHARD_TARGET_COUNT, output_root: str = "data",
+                 headless: bool = HEADLESS, delay: float = DELAY_BETWEEN_REQUESTS):
+        self.shards = shards
+        self.processes = max(1, min(processes, len(shards) or 1))
+        self.target_count = target_count
+        self.headless = headless
+        self.delay = delay
+        self.output_root = output_root
+        self.started_at = None  # Start of run(); merge_results only takes results completed since
+
+    def run(self) -> dict:
+        """Run all shards and return {shard_name: items_collected or error string}."""
+        logger.info(f"Running {len(self.shards)} shards across {self.processes} processes")
+        self.started_at = time.time()
+        summary = {}
+        # 'spawn' avoids sharing Playwright/driver state through fork
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=self.processes, mp_context=ctx) as pool:
+            # Each shard process serves its own metrics on METRICS_PORT + shard number
+            futures = {
+                pool.submit(_run_shard, shard, self.target_count, self.output_root, self.headless,
+                            self.delay, METRICS_PORT + n if METRICS_PORT else None): shard['name']
+                for n, shard in enumerate(self.shards, start=1)
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    summary[name] = future.result()
+                    logger.info(f"Shard {name} finished: {summary[name]} items")
+                except Exception as e:
+                    summary[name] = f"error: {e}"
+                    logger.error(f"Shard {name} failed: {e}")
+        return summary
+
+    def merge_results(self):
+        """
+        Merge the results completed during this run from the shared queue into
+        the main result files (the queue also holds every earlier run's results).
+        """
+        from .jobqueue import JobQueue
+        from .storage import Storage
+
+        queue = JobQueue()
+        try:
+            items = queue.load_results(since=self.started_at)
+        finally:
+            queue.close()
+        logger.info(f"Merging {len(items)} results from all shards")
+        if items:
+            Storage.save_json(items, os.path.join(self.output_root, "results.json"))
+            Storage.save_excel(items, os.path.join(self.output_root, "results.xlsx"))
+        return items
@@ -0,0 +1,100 @@
+import logging
+from typing import Dict, Optional
+from .bench import crawl_mock_site, write_report
+from .config import SOAK_FAULT_RATES, MOCK_GRID_WINDOW
+from .metrics import Histogram, _percentile
+from .mocksite import MockSite, default_results_file
+
+logger = logging.getLogger(__name__)
+
+
+def _excess(hist: Histogram, baseline: float) -> float:
+    """Seconds spent above the baseline duration (scaled up from the sample if it was capped)."""
+    if not hist.samples:
+        return 0.0
+    return sum(max(0.0, v - baseline) for v in hist.samples) * hist.count / len(hist.samples)
+
+
+def recovery_report(metrics, detail_requests: Dict[str, int], queue_retried: int) -> dict:
+    """
+    Recovery frequency and time lost per recovery type, measured against the
+    median clean path (list button for back-navigation, median detail load).
+    """
+    back = {}
+    for (name, labels), hist in metrics.histograms.items():
+        if name == "back_navigation":
+            back[dict(labels).get("strategy", "unknown")] = hist
+
+    baseline = _percentile(back["list_button"].sorted_samples() if "list_button" in back else [], 0.5)
+    recoveries = {}
+    for strategy, hist in sorted(back.items()):
+        recoveries[strategy] = {
+            'count': hist.count,
+            'total_s': round(hist.total, 3),
+            'time_lost_s': round(_excess(hist, baseline), 3),
+        }
+
+    counters = {(name, labels): value for (name, labels), value in metrics.counters.items()}
+    pagination_waits = metrics.histograms.get(("pagination_wait", ()), Histogram())
+    recoveries['pagination_retry'] = {
+        'count': int(counters.get(("recovery", (("strategy", "pagination_retry"),)), 0)),
+        'total_s': round(pagination_waits.total, 3),
+        'time_lost_s': round(pagination_waits.total, 3),
+    }
+
+    detail_ready = metrics.histograms.get(("detail_ready", ()), Histogram())
+    detail_timeouts = int(counters.get(("detail_wait_timeout", ()), 0))
+    recoveries['detail_wait'] = {
+        'count': detail_timeouts,
+        'total_s': round(detail_ready.total, 3),
+        'time_lost_s': round(_excess(detail_ready, _percentile(detail_ready.sorted_samples(), 0.5)), 3),
+    }
+
+    return {
+        'baseline_back_navigation_s': round(baseline, 3),
+        'recoveries': recoveries,
+        'time_lost_total_s': round(sum(r['time_lost_s'] for r in recoveries.values()), 3),
+        'reprocessed': {
+            'detail_reloads': sum(count - 1 for count in detail_requests.values() if count > 1),
+            'queue_jobs_retried': queue_retried,
+            'rows_rescanned': int(counters.get(("rows_skipped", (("reason", "visited"),)), 0)),
+            'items_failed': int(sum(v for (name, _), v in counters.items() if name == "items_failed")),
+        },
+    }
+
+
+def run_soak(notices: int = 200, target_count: Optional[int] = None, faults: Optional[Dict[str, float]] = None,
+             seed: Optional[int] = None, latency_ms: float = 0, results_file: Optional[str] = None,
+             report_file: Optional[str] = None, headless: bool = True) -> dict:
+    """
+    Crawl the mock site with injected faults (missing list buttons, detached
+    frames, slow spinners, vanishing pagination, server errors) and report
+    how often each recovery path ran and what it cost.
+    """
+    target_count = target_count or notices
+    faults = SOAK_FAULT_RATES if faults is None else faults
+    site = MockSite(results_file or default_results_file(), total=notices, latency_ms=latency_ms,
+                    faults=faults, seed=seed, grid_window=MOCK_GRID_WINDOW).start()
+    try:
+        crawler, elapsed, _, retried = crawl_mock_site(site, target_count, headless)
+    finally:
+        site.stop()
+
+    items = len(crawler.results)
+    report = {
+        'notices': notices,
+        'target_count': target_count,
+        'items': items,
+        'elapsed_s': round(elapsed, 3),
+        'notices_per_min': round(items / elapsed * 60, 2) if elapsed else 0.0,
+        'fault_rates': faults,
+        'seed': seed,
+        'faults_injected': dict(site.fault_counts),
+    }
+    report.update(recovery_report(crawler.metrics, site.detail_requests, retried))
+    report['metrics'] = crawler.metrics.summary()
+    logger.info(f"Soak: {items}/{target_count} notices in {elapsed:.1f}s, "
+                f"{sum(site.fault_counts.values())} faults injected, "
+                f"{report['time_lost_total_s']}s lost to recovery")
+    write_report(report, report_file)
+    return report
@@ -1,42 +1,315 @@
 
+import hashlib
 import json
 import os
+import re
+import sqlite3
+import time
 import logging
-from typing import Set
+import threading
+from typing import Optional, Tuple
+from .config import STATE_DB, JOB_LEASE_SECONDS
 
 logger = logging.getLogger(__name__)
 
+
 class StateManager:
-    def __init__(self, state_file: str = "data/state.json"):
-        self.state_file = state_file
-        self.visited_ids: Set[str] = set()
+    """
+    Crawl state shared by every crawler process using the same database.
+
+    Visited bid numbers, revision hashes, the 입력일시 high-water mark and
+    attachment progress live in a WAL-mode SQLite file, so concurrent runs
+    (e.g. an hourly cron job overlapping a backfill) see each other's progress
+    and never overwrite it. `claim` hands a bid number to exactly one process.
+    """
+
+    def __init__(self, db_file: str = STATE_DB, lease_seconds: int = JOB_LEASE_SECONDS):
+        self.db_file = db_file
+        self.lease_seconds = lease_seconds
+        if os.path.dirname(db_file):
+            os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        # Attachment workers use the same connection from their threads
+        self._lock = threading.RLock()
+        # Autocommit mode; read-modify-write updates use explicit BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(db_file, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
         self.load_state()
 
+    def _create_tables(self):
+        self.conn.execute("CREATE TABLE IF NOT EXISTS visited (bid_no TEXT PRIMARY KEY, visited_at REAL NOT NULL)")
+        # base bid number -> latest revision, content hash, per-field hashes and record (JSON),
+        # plus the revision before it (what a retried fetch of the latest one is diffed against)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS revisions (
+                base TEXT PRIMARY KEY,
+                revision TEXT,
+                hash TEXT NOT NULL,
+                field_hashes TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(revisions)")}
+        for column in ('data', 'previous_revision', 'previous_hashes', 'previous_data'):
+            if column not in columns:
+                try:
+                    self.conn.execute(f"ALTER TABLE revisions ADD COLUMN {column} TEXT")
+                except sqlite3.OperationalError:
+                    pass  # Added by a concurrent process
+        # attachment URL -> {'bid_no', 'name', 'status', 'bytes', 'sha256', ...} (JSON)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS attachments (url TEXT PRIMARY KEY, info TEXT NOT NULL)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS claims (
+                bid_no TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def _write(self, func):
+        """Run func() in a BEGIN IMMEDIATE transaction (one writer across processes)."""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func()
+                self.conn.execute("COMMIT")
+                return result
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
     def load_state(self):
-        if os.path.exists(self.state_file):
+        """Import a legacy state.json next to the database once, then report what is stored."""
+        legacy_file = os.path.join(os.path.dirname(self.db_file), "state.json")
+        if os.path.exists(legacy_file) and not self._meta('imported_json'):
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.visited_ids = set(data.get('visited_ids', []))
-                logger.info(f"Loaded {len(self.visited_ids)} visited IDs from state.")
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    self._import_json(json.load(f))
+                logger.info(f"Imported {legacy_file} into {self.db_file}.")
             except Exception as e:
-                logger.error(f"Failed to load state: {e}")
+                logger.error(f"Failed to import {legacy_file}: {e}")
+        count = self.conn.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+        if count:
+            logger.info(f"Loaded {count} visited IDs from state (high-water mark: {self.high_water_mark}).")
         else:
             logger.info("No existing state found. Starting fresh.")
 
+    def _import_json(self, data: dict):
+        now = time.time()
+
+        def write():
+            self.conn.executemany("INSERT OR IGNORE INTO visited (bid_no, visited_at) VALUES (?, ?)",
+                                  [(bid_no, now) for bid_no in data.get('visited_ids', [])])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO revisions (base, revision, hash, field_hashes, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(base, info.get('revision'), info.get('hash', ''), json.dumps(info.get('field_hashes', {})), now)
+                 for base, info in data.get('revisions', {}).items()]
+            )
+            self.conn.executemany("INSERT OR IGNORE INTO attachments (url, info) VALUES (?, ?)",
+                                  [(url, json.dumps(info, ensure_ascii=False))
+                                   for url, info in data.get('attachments', {}).items()])
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('imported_json', ?)", (str(now),))
+        self._write(write)
+        if data.get('high_water_mark'):
+            self.update_high_water_mark(data['high_water_mark'])
+
     def save_state(self):
-        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+        """Every update is committed as it happens; this only checkpoints the WAL into the database file."""
         try:
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    'visited_ids': list(self.visited_ids)
-                }, f, ensure_ascii=False, indent=2)
-            logger.info("State saved.")
-        except Exception as e:
-            logger.error(f"Failed to save state: {e}")
+            with self._lock:
+                self.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to checkpoint state: {e}")
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Newest 입력일시 fully crawled by any process."""
+        return self._meta('high_water_mark')
 
     def is_visited(self, bid_id: str) -> bool:
-        return bid_id in self.visited_ids
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM visited WHERE bid_no = ?", (bid_id,)).fetchone() is not None
 
     def mark_visited(self, bid_id: str):
-        self.visited_ids.add(bid_id)
+        """Record a fetched bid number and drop its claim."""
+        def write():
+            self.conn.execute("INSERT OR IGNORE INTO visited (bid_no, visited_at) VALUES (?, ?)", (bid_id, time.time()))
+            self.conn.execute("DELETE FROM claims WHERE bid_no = ?", (bid_id,))
+        self._write(write)
+
+    def needs_fetch(self, bid_id: str) -> bool:
+        """
+        True if this bid number is new or a newer revision of a known notice.
+        Older revisions are skipped; the recorded revision itself only while it
+        is not visited (its baseline is written before the result is committed).
+        """
+        if self.is_visited(bid_id):
+            return False
+        base, revision = split_revision(bid_id)
+        with self._lock:
+            row = self.conn.execute("SELECT revision FROM revisions WHERE base = ?", (base,)).fetchone()
+        if not row or revision is None or row[0] is None:
+            return True
+        return int(revision) >= int(row[0])
+
+    def claim(self, bid_id: str, owner: str) -> bool:
+        """
+        Atomically take a bid number for fetching. Fails if it no longer needs
+        fetching or another owner holds an unexpired claim. Claims end with
+        mark_visited, release, or after lease_seconds (crashed process).
+        """
+        def write():
+            if not self.needs_fetch(bid_id):
+                return False
+            now = time.time()
+            cur = self.conn.execute(
+                """
+                INSERT INTO claims (bid_no, owner, expires) VALUES (?, ?, ?)
+                ON CONFLICT(bid_no) DO UPDATE SET owner = excluded.owner, expires = excluded.expires
+                 WHERE claims.owner = excluded.owner OR claims.expires < ?
+                """,
+                (bid_id, owner, now + self.lease_seconds, now)
+            )
+            return cur.rowcount > 0
+        return self._write(write)
+
+    def release(self, bid_id: str, owner: str):
+        """Give up a claim after a failed fetch so any process can retry it."""
+        with self._lock:
+            self.conn.execute("DELETE FROM claims WHERE bid_no = ? AND owner = ?", (bid_id, owner))
+
+    def revision_changes(self, item) -> Optional[dict]:
+        """
+        Compare a parsed item with the previous revision of its notice (read only).
+
+        If this revision is already the recorded baseline (a retry after a crash
+        or lost lease), the revision recorded before it is used, so every fetch
+        of a revision yields the same delta.
+
+        Returns:
+            None for the first revision of a notice, otherwise the per-field delta:
+            {'previous_revision': ..., 'changed': {field: {'old': ..., 'new': ...}},
+             'removed': {field: old value}}
+            Old values are None if the previous revision was recorded without its
+            record (state imported from state.json).
+        """
+        base, revision = split_revision(item.bid_no)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT revision, field_hashes, data, previous_revision, previous_hashes, previous_data "
+                "FROM revisions WHERE base = ?", (base,)
+            ).fetchone()
+        if not row:
+            return None
+        if row[0] == revision:
+            previous_revision, old_hashes, old_data = row[3], row[4], row[5]
+            if old_hashes is None:
+                return None
+        else:
+            previous_revision, old_hashes, old_data = row[0], row[1], row[2]
+
+        old_hashes = json.loads(old_hashes)
+        old_data = json.loads(old_data) if old_data else {}
+        raw_data = item.raw_data or {}
+        changed = {k: {'old': old_data.get(k), 'new': v} for k, v in raw_data.items()
+                   if old_hashes.get(k) != _hash_value(v)}
+        removed = {k: old_data.get(k) for k in old_hashes if k not in raw_data}
+        previous_bid_no = f"{base}-{previous_revision}" if previous_revision else base
+        return {'previous_revision': previous_bid_no, 'changed': changed, 'removed': removed}
+
+    def record_revision(self, item) -> bool:
+        """
+        Store an item's revision, hashes and record as the baseline of its notice
+        (the replaced baseline is kept as the previous revision). The baseline
+        never moves backwards and re-recording the same revision is a no-op.
+        Returns True if the baseline changed.
+        """
+        raw_data = item.raw_data or {}
+        base, revision = split_revision(item.bid_no)
+
+        def write():
+            cur = self.conn.execute(
+                """
+                INSERT INTO revisions (base, revision, hash, field_hashes, data, updated_at) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(base) DO UPDATE SET
+                    previous_revision = revisions.revision, previous_hashes = revisions.field_hashes,
+                    previous_data = revisions.data, revision = excluded.revision, hash = excluded.hash,
+                    field_hashes = excluded.field_hashes, data = excluded.data, updated_at = excluded.updated_at
+                 WHERE excluded.revision IS NOT NULL
+                   AND (revisions.revision IS NULL
+                        OR CAST(revisions.revision AS INTEGER) < CAST(excluded.revision AS INTEGER))
+                """,
+                (base, revision, _hash_value(raw_data), json.dumps(_field_hashes(raw_data)),
+                 json.dumps(raw_data, ensure_ascii=False), time.time())
+            )
+            return cur.rowcount > 0
+        return self._write(write)
+
+    def attachment(self, url: str) -> Optional[dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT info FROM attachments WHERE url = ?", (url,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def record_attachment(self, url: str, **info):
+        """Create or update the download progress entry of an attachment."""
+        def write():
+            row = self.conn.execute("SELECT info FROM attachments WHERE url = ?", (url,)).fetchone()
+            merged = json.loads(row[0]) if row else {}
+            merged.update(info)
+            self.conn.execute("INSERT OR REPLACE INTO attachments (url, info) VALUES (?, ?)",
+                              (url, json.dumps(merged, ensure_ascii=False)))
+        self._write(write)
+
+    def update_high_water_mark(self, input_date: str):
+        """Advance the high-water mark; it never moves backwards."""
+        input_date = normalize_input_date(input_date)
+        if not input_date:
+            return
+
+        def write():
+            self.conn.execute(
+                """
+                INSERT INTO meta (key, value) VALUES ('high_water_mark', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                 WHERE meta.value IS NULL OR meta.value < excluded.value
+                """,
+                (input_date,)
+            )
+        self._write(write)
+
+
+def normalize_input_date(value: str) -> str:
+    """Normalize 입력일시 text (e.g. '2026-02-09 10:23') to a sortable 'YYYY/MM/DD HH:MM' string."""
+    return " ".join((value or "").replace("-", "/").replace(".", "/").split())
+
+
+REVISION_PATTERN = re.compile(r'^(?P<base>.+)-(?P<revision>\d+)$')
+
+
+def split_revision(bid_id: str) -> Tuple[str, Optional[str]]:
+    """Split 'R26BK01323461-000' into ('R26BK01323461', '000'). Revision is None if absent."""
+    match = REVISION_PATTERN.match(bid_id.strip())
+    if not match:
+        return bid_id.strip(), None
+    return match.group('base'), match.group('revision')
+
+
+def _field_hashes(raw_data: dict) -> dict:
+    return {k: _hash_value(v) for k, v in raw_data.items()}
+
+
+def _hash_value(value) -> str:
+    """Stable short content hash of a field value (strings or nested grid lists)."""
+    encoded = json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
@@ -1,35 +1,24 @@
 
-import csv
 import json
 import os
-from typing import List
+from typing import List, Optional
+from .config import EXPORT_COMPRESSION
+from .export import export_csv
 from .model import BidItem
-import pandas as pd
-from openpyxl.utils import get_column_letter
 
 import logging
 logger = logging.getLogger(__name__)
 
 class Storage:
     @staticmethod
-    def save_csv(items: List[BidItem], filename: str):
+    def save_csv(items: List[BidItem], filename: str, compression: Optional[str] = EXPORT_COMPRESSION):
+        """
+        Save items as a flattened CSV (scalar raw_data fields as columns) plus
+        one CSV per sub-grid linked by 입찰공고번호. See src/export.py.
+        """
         if not items:
             return
-            
-        keys = items[0].to_dict().keys()
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        
-        mode = 'w'
-        write_header = True
-        
-        with open(filename, mode, newline='', encoding='utf-8-sig') as f:
-            writer = csv.DictWriter(f, fieldnames=keys)
-            if write_header:
-                writer.writeheader()
-            for item in items:
-                writer.writerow(item.to_dict())
+        export_csv(items, filename, compression)
 
     @staticmethod
     def save_json(items: List[BidItem], filename: str):
@@ -105,6 +94,9 @@ class Storage:
             logger.info("No valid data rows found.")
             return
 
+        # pandas/openpyxl take ~0.5 s to import; only Excel output needs them
+        import pandas as pd
+
         # 2. Save using ExcelWriter
         with pd.ExcelWriter(filename, engine='openpyxl') as writer:
             # A. Process Main Sheet
@@ -133,6 +125,8 @@ class Storage:
     @staticmethod
     def _auto_adjust_columns(writer, sheet_name, df):
         """Helper to auto-adjust column widths in a sheet."""
+        from openpyxl.utils import get_column_letter
+
         worksheet = writer.sheets[sheet_name]
         for idx, col in enumerate(df.columns):
             max_len = max(
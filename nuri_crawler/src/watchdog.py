@@ -0,0 +1,150 @@
+import logging
+import os
+from typing import Optional
+from .config import MEMORY_RSS_LIMIT_MB, MEMORY_HEAP_LIMIT_MB, MEMORY_RECYCLE_MARGIN_MB, RECYCLE_EVERY_N_ITEMS
+
+try:
+    import psutil
+except ImportError:  # Optional; falls back to /proc on Linux
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+RENDERER_FLAG = "--type=renderer"  # Chromium renderer processes (one or more per context's pages)
+
+
+def process_tree_rss_mb(root_pid: Optional[int] = None, renderers_only: bool = False) -> Optional[float]:
+    """
+    Total RSS (MB) of all descendants of root_pid: the Playwright driver and
+    every Chromium process it spawned, or with renderers_only just the
+    renderer processes. Returns None if it cannot be measured.
+    """
+    root_pid = root_pid or os.getpid()
+    if psutil:
+        try:
+            children = psutil.Process(root_pid).children(recursive=True)
+            total = 0
+            for child in children:
+                try:
+                    if renderers_only and RENDERER_FLAG not in child.cmdline():
+                        continue
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / 1024 / 1024
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+    children_of = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # Field 4 is ppid; comm (field 2) may contain spaces, so split after ')'
+                fields = f.read().rsplit(b")", 1)[1].split()
+            children_of.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+
+    descendants, frontier = [], [root_pid]
+    while frontier:
+        pid = frontier.pop()
+        children = children_of.get(pid, [])
+        descendants.extend(children)
+        frontier.extend(children)
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for pid in descendants:
+        try:
+            if renderers_only:
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    if RENDERER_FLAG.encode() not in f.read().split(b"\0"):
+                        continue
+            with open(f"/proc/{pid}/statm") as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total / 1024 / 1024
+
+
+class MemoryWatchdog:
+    """
+    Decides when the browser context should be recycled: when the renderer
+    RSS or the page's JS heap exceeds its limit, or after a fixed number of
+    notices. Renderer memory is what closing a context frees; the driver and
+    browser processes only shrink when the browser is restarted.
+
+    After each recycle the memory left over is the new baseline, and the
+    limits only fire again `margin_mb` above it, so memory that a recycle
+    cannot free does not trigger a recycle on every notice. If a recycle
+    leaves the renderer RSS above its limit, restart_needed asks the crawler
+    to restart the whole browser.
+    """
+
+    def __init__(self, rss_limit_mb: float = MEMORY_RSS_LIMIT_MB, heap_limit_mb: float = MEMORY_HEAP_LIMIT_MB,
+                 recycle_every: int = RECYCLE_EVERY_N_ITEMS, margin_mb: float = MEMORY_RECYCLE_MARGIN_MB,
+                 rss_probe=None):
+        self.rss_limit_mb = rss_limit_mb
+        self.heap_limit_mb = heap_limit_mb
+        self.recycle_every = recycle_every
+        self.margin_mb = margin_mb
+        self.rss_probe = rss_probe or (lambda: process_tree_rss_mb(renderers_only=True))
+        self.items_since_recycle = 0
+        self.recycle_count = 0
+        self.restart_count = 0
+        self.restart_needed = False
+        self.baseline = {'rss_mb': 0.0, 'heap_mb': 0.0}
+        self.last_sample = {}
+
+    def sample(self, page) -> dict:
+        heap_mb = None
+        try:
+            # Chromium-only API; returns null elsewhere
+            used = page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : null")
+            heap_mb = used / 1024 / 1024 if used else None
+        except Exception as e:
+            logger.debug(f"JS heap sample failed: {e}")
+        self.last_sample = {'rss_mb': self.rss_probe(), 'heap_mb': heap_mb}
+        return self.last_sample
+
+    def record_item(self):
+        self.items_since_recycle += 1
+
+    def _threshold(self, key: str, limit: float) -> float:
+        """Limit, raised to baseline + margin when a recycle could not get below it."""
+        return max(limit, (self.baseline.get(key) or 0.0) + self.margin_mb)
+
+    def check(self, page) -> Optional[str]:
+        """Return the reason to recycle now, or None."""
+        if self.recycle_every and self.items_since_recycle >= self.recycle_every:
+            return f"{self.items_since_recycle} notices since last recycle"
+        sample = self.sample(page)
+        if sample['rss_mb'] is not None and self.rss_limit_mb:
+            threshold = self._threshold('rss_mb', self.rss_limit_mb)
+            if sample['rss_mb'] > threshold:
+                return f"renderer RSS {sample['rss_mb']:.0f} MB > {threshold:.0f} MB"
+        if sample['heap_mb'] is not None and self.heap_limit_mb:
+            threshold = self._threshold('heap_mb', self.heap_limit_mb)
+            if sample['heap_mb'] > threshold:
+                return f"JS heap {sample['heap_mb']:.0f} MB > {threshold:.0f} MB"
+        return None
+
+    def reset(self, page=None, restarted: bool = False):
+        """
+        Re-baseline after a recycle (page: the restored list page). Sets
+        restart_needed if a context recycle left the renderer RSS over its limit.
+        """
+        self.items_since_recycle = 0
+        if restarted:
+            self.restart_count += 1
+        else:
+            self.recycle_count += 1
+        sample = self.sample(page) if page is not None else {}
+        self.baseline = {key: sample.get(key) or 0.0 for key in ('rss_mb', 'heap_mb')}
+        self.restart_needed = bool(not restarted and self.rss_limit_mb and
+                                   self.baseline['rss_mb'] > self.rss_limit_mb)
@@ -0,0 +1,100 @@
+import json
+import urllib.error
+import urllib.request
+from email.utils import formatdate
+
+import pytest
+
+from src.api import ApiError, ReadAPI, decode_cursor, encode_cursor
+from src.model import BidItem
+from src.search import SearchIndex
+
+
+@pytest.fixture
+def api(tmp_path):
+    db_file = str(tmp_path / "search.db")
+    index = SearchIndex(db_file)
+    index.add([BidItem(f"N{i}-000", f"공고 {i}", raw_data={'공고기관': "조달청"}) for i in range(5)])
+    index.close()
+    server = ReadAPI(db_file=db_file, port=0).start()
+    yield server
+    server.stop()
+
+
+def get(api, path, **headers):
+    """(status, headers, parsed JSON body or None)."""
+    request = urllib.request.Request(f"http://{api.host}:{api.port}{path}", headers=headers)
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        body = e.read()
+        return e.code, e.headers, json.loads(body) if body else None
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor('before', 42)) == {'before': 42}
+    for bad in ("!!!", encode_cursor('other', 1), "e30"):
+        with pytest.raises(ApiError):
+            decode_cursor(bad)
+
+
+def test_cursor_pagination(api):
+    status, _, first = get(api, "/notices?limit=2")
+    assert status == 200
+    assert [row['bid_no'] for row in first['items']] == ["N4-000", "N3-000"]
+    _, _, second = get(api, f"/notices?limit=2&cursor={first['next_cursor']}")
+    assert [row['bid_no'] for row in second['items']] == ["N2-000", "N1-000"]
+    _, _, last = get(api, f"/notices?limit=2&cursor={second['next_cursor']}")
+    assert [row['bid_no'] for row in last['items']] == ["N0-000"]
+    assert last['next_cursor'] is None
+
+
+def test_change_feed_always_returns_a_cursor(api):
+    _, _, feed = get(api, "/notices?since=3")
+    assert [row['bid_no'] for row in feed['items']] == ["N3-000", "N4-000"]
+    _, _, empty = get(api, f"/notices?cursor={feed['next_cursor']}")
+    assert empty['items'] == []
+    assert decode_cursor(empty['next_cursor']) == {'after': 5}
+
+
+def test_get_notice_and_errors(api):
+    status, _, record = get(api, "/notices/N1-000")
+    assert status == 200 and record['raw_data'] == {'공고기관': "조달청"}
+    assert get(api, "/notices/missing")[0] == 404
+    assert get(api, "/nope")[0] == 404
+    assert get(api, "/notices?limit=x")[0] == 400
+    assert get(api, "/notices?bogus=1")[0] == 400
+    assert get(api, "/notices?cursor=!!!")[0] == 400
+
+
+def test_etag_and_not_modified(api):
+    status, headers, _ = get(api, "/notices")
+    etag = headers['ETag']
+    assert status == 200 and etag.startswith('W/"')
+    assert get(api, "/notices", **{'If-None-Match': etag})[0] == 304
+    assert get(api, "/notices", **{'If-None-Match': 'W/"0-other"'})[0] == 200
+    assert get(api, "/notices", **{'If-Modified-Since': headers['Last-Modified']})[0] == 304
+    assert get(api, "/notices", **{'If-Modified-Since': formatdate(0, usegmt=True)})[0] == 200
+
+
+def test_conditional_headers_do_not_hide_errors(api):
+    assert get(api, "/nope", **{'If-None-Match': '*'})[0] == 404
+    assert get(api, "/notices/missing", **{'If-None-Match': '*'})[0] == 404
+    assert get(api, "/notices?bogus=1", **{'If-None-Match': '*'})[0] == 400
+    assert get(api, "/notices", **{'If-None-Match': '*'})[0] == 304
+
+
+def test_cache_is_cleared_when_the_index_changes(api):
+    _, headers, before = get(api, "/notices?limit=1")
+    assert api.cache.hits == 0
+    get(api, "/notices?limit=1")
+    assert api.cache.hits == 1
+
+    index = SearchIndex(api.db_file)
+    index.add([BidItem("N9-000", "새 공고")])
+    index.close()
+    status, new_headers, after = get(api, "/notices?limit=1", **{'If-None-Match': headers['ETag']})
+    assert status == 200
+    assert new_headers['ETag'] != headers['ETag']
+    assert after['items'][0]['bid_no'] == "N9-000" != before['items'][0]['bid_no']
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.attachments import STATUS_DONE, AttachmentDownloader
+from src.state import StateManager
+
+FILES = {
+    '/a.pdf': b"A" * 100_000 + b"B" * 50_000,
+    '/copy.pdf': b"A" * 100_000 + b"B" * 50_000,
+    '/other.hwp': b"other file",
+}
+ETAG = '"v1"'
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Static files with single Range requests and an If-Range check against ETAG."""
+    requests = []
+
+    def do_GET(self):
+        body = FILES.get(self.path)
+        self.requests.append((self.path, self.headers.get('Range')))
+        if body is None:
+            self.send_error(404)
+            return
+        start = 0
+        range_header = self.headers.get('Range')
+        if range_header and self.headers.get('If-Range', ETAG) == ETAG:
+            start = int(range_header.split('=')[1].rstrip('-'))
+            if start >= len(body):
+                self.send_error(416)
+                return
+        self.send_response(206 if start else 200)
+        self.send_header('ETag', ETAG)
+        self.send_header('Content-Length', str(len(body) - start))
+        self.end_headers()
+        self.wfile.write(body[start:])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    RangeHandler.requests = []
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def downloader(tmp_path):
+    return AttachmentDownloader(StateManager(str(tmp_path / "state.db")), str(tmp_path / "files"), workers=2)
+
+
+def test_download_stores_by_content_hash(tmp_path, server):
+    dl = downloader(tmp_path)
+    assert dl.submit("X-000", "a.pdf", server + "/a.pdf")
+    dl.close()
+
+    sha256 = hashlib.sha256(FILES['/a.pdf']).hexdigest()
+    info = dl.state.attachment(server + "/a.pdf")
+    assert info['status'] == STATUS_DONE and info['sha256'] == sha256
+    with open(dl._object_path(sha256), 'rb') as f:
+        assert f.read() == FILES['/a.pdf']
+    assert os.path.samefile(info['path'], dl._object_path(sha256))
+    assert not os.path.exists(dl._partial_path(server + "/a.pdf"))
+
+
+def test_partial_download_resumes_with_range(tmp_path, server):
+    dl = downloader(tmp_path)
+    url = server + "/a.pdf"
+    partial = dl._partial_path(url)
+    os.makedirs(os.path.dirname(partial))
+    with open(partial, 'wb') as f:
+        f.write(FILES['/a.pdf'][:100_000])
+    dl.state.record_attachment(url, status="partial", etag=ETAG, attempts=1)
+
+    dl.submit("X-000", "a.pdf", url)
+    dl.close()
+
+    assert RangeHandler.requests == [("/a.pdf", "bytes=100000-")]
+    assert dl.stats['resumed'] == 1 and dl.stats['bytes'] == 50_000
+    info = dl.state.attachment(url)
+    assert info['sha256'] == hashlib.sha256(FILES['/a.pdf']).hexdigest()
+    assert info['bytes'] == len(FILES['/a.pdf'])
+
+
+def test_changed_file_restarts_instead_of_resuming(tmp_path, server):
+    dl = downloader(tmp_path)
+    url = server + "/a.pdf"
+    partial = dl._partial_path(url)
+    os.makedirs(os.path.dirname(partial))
+    with open(partial, 'wb') as f:
+        f.write(b"stale bytes")
+    dl.state.record_attachment(url, status="partial", etag='"v0"', attempts=1)
+
+    dl.submit("X-000", "a.pdf", url)
+    dl.close()
+
+    assert dl.stats['resumed'] == 0
+    assert dl.state.attachment(url)['sha256'] == hashlib.sha256(FILES['/a.pdf']).hexdigest()
+
+
+def test_identical_content_is_stored_once(tmp_path, server):
+    dl = downloader(tmp_path)
+    dl.submit("X-000", "a.pdf", server + "/a.pdf")
+    dl.wait()
+    dl.submit("Y-000", "copy.pdf", server + "/copy.pdf")
+    dl.close()
+
+    sha256 = hashlib.sha256(FILES['/a.pdf']).hexdigest()
+    assert dl.stats['downloaded'] == 1 and dl.stats['deduplicated'] == 1
+    assert os.listdir(os.path.dirname(dl._object_path(sha256))) == [sha256]
+    for bid_no, name in (("X-000", "a.pdf"), ("Y-000", "copy.pdf")):
+        assert os.path.samefile(os.path.join(dl.root_dir, "by_notice", bid_no, name), dl._object_path(sha256))
+
+
+def test_known_url_is_linked_without_downloading(tmp_path, server):
+    dl = downloader(tmp_path)
+    dl.submit("X-000", "other.hwp", server + "/other.hwp")
+    dl.wait()
+    assert not dl.submit("X-001", "other.hwp", server + "/other.hwp")
+    dl.close()
+
+    assert len(RangeHandler.requests) == 1
+    assert os.path.exists(os.path.join(dl.root_dir, "by_notice", "X-001", "other.hwp"))
+
+
+def test_failed_download_is_recorded(tmp_path, server):
+    dl = downloader(tmp_path)
+    dl.submit("X-000", "missing.pdf", server + "/missing.pdf")
+    dl.close()
+
+    info = dl.state.attachment(server + "/missing.pdf")
+    assert dl.stats['failed'] == 1
+    assert info['status'] == "partial" and info['attempts'] == 1 and "404" in info['error']
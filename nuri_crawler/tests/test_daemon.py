@@ -0,0 +1,54 @@
+from datetime import datetime
+
+import pytest
+
+from src.daemon import CronSchedule, CrawlerDaemon
+
+MONDAY = datetime(2026, 10, 19, 10, 30, 15)
+
+
+def test_hourly():
+    assert CronSchedule("0 * * * *").next_after(MONDAY) == datetime(2026, 10, 19, 11, 0)
+
+
+def test_next_is_strictly_after():
+    assert CronSchedule("30 10 * * *").next_after(MONDAY) == datetime(2026, 10, 20, 10, 30)
+
+
+def test_steps_ranges_and_lists():
+    schedule = CronSchedule("*/20 9-17/4 * * *")
+    assert schedule.minutes == {0, 20, 40}
+    assert schedule.hours == {9, 13, 17}
+    assert schedule.next_after(MONDAY) == datetime(2026, 10, 19, 13, 0)
+    assert CronSchedule("5,35 * * * *").next_after(MONDAY) == datetime(2026, 10, 19, 10, 35)
+
+
+def test_sunday_is_0_or_7():
+    expected = datetime(2026, 10, 25, 0, 0)
+    assert CronSchedule("0 0 * * 0").next_after(MONDAY) == expected
+    assert CronSchedule("0 0 * * 7").next_after(MONDAY) == expected
+
+
+def test_restricted_day_fields_match_either():
+    # The 1st of the month or any Wednesday, whichever comes first
+    assert CronSchedule("0 0 1 * 3").next_after(MONDAY) == datetime(2026, 10, 21, 0, 0)
+
+
+def test_leap_day():
+    assert CronSchedule("0 0 29 2 *").next_after(MONDAY) == datetime(2028, 2, 29, 0, 0)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "5-1 * * * *", "*/0 * * * *", "0 0 31 2 x"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
+
+
+def test_never_firing_expression():
+    with pytest.raises(ValueError):
+        CronSchedule("0 0 31 2 *").next_after(MONDAY)
+
+
+def test_interval_schedule():
+    daemon = CrawlerDaemon(interval=60)
+    assert daemon._next_run_time(1000.0) == 1060.0
@@ -0,0 +1,97 @@
+import csv
+import gzip
+
+import pytest
+
+from src.export import CsvExporter, export_csv, grid_file_name
+from src.model import BidItem
+
+
+def notice(bid_no, **raw_data):
+    return BidItem(bid_no, "name", url=f"https://example.com/{bid_no}", raw_data=raw_data)
+
+
+ITEMS = [
+    notice("A-000", 비고="x", 공고기관="조달청", 입찰공고명="공고 A",
+           물품상세내역=[{'품명': "복사용지", '수량': 10}, {'품명': "토너", '수량': 2}]),
+    notice("B-000", 입찰공고명="공고 B", 지역제한=["서울", "경기"], 추가항목="y",
+           **{'물품상세내역': [{'품명': "책상", '규격': "1200"}], '': [{'파일명': "a.pdf"}]}),
+]
+
+
+def read(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, 'rt', encoding='utf-8-sig', newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_grid_file_name():
+    assert grid_file_name("물품 상세/내역") == "물품_상세_내역"
+    assert grid_file_name("  ") == "Grid_Data"
+
+
+def test_union_schema_with_priority_columns(tmp_path):
+    summary = export_csv(ITEMS, str(tmp_path / "out.csv"))
+    header, first, second = read(summary['file'])
+    assert header[:4] == ['입찰공고번호', '입찰공고명', '공고기관', '비고']
+    assert header[4:6] == ['지역제한', '추가항목']
+    assert header[-5:] == ['상세페이지URL', 'crawled_at', 'previous_revision', 'changed_fields', 'removed_fields']
+    assert first[:6] == ["A-000", "공고 A", "조달청", "x", "", ""]
+    assert second[:6] == ["B-000", "공고 B", "", "", "서울|경기", "y"]
+    assert summary['items'] == 2 and summary['skipped'] == {}
+
+
+def test_grids_are_linked_by_bid_number(tmp_path):
+    summary = export_csv(ITEMS, str(tmp_path / "out.csv"))
+    rows = read(str(tmp_path / "out__물품상세내역.csv"))
+    assert rows == [
+        ['입찰공고번호', '품명', '수량', '규격'],
+        ["A-000", "복사용지", "10", ""],
+        ["A-000", "토너", "2", ""],
+        ["B-000", "책상", "", "1200"],
+    ]
+    assert read(str(tmp_path / "out__Grid_Data.csv"))[1] == ["B-000", "a.pdf"]
+    assert summary['grids'][str(tmp_path / "out__물품상세내역.csv")] == 3
+
+
+def test_gzip_compression(tmp_path):
+    summary = export_csv(ITEMS, str(tmp_path / "out"), compression="gzip")
+    assert summary['file'] == str(tmp_path / "out.csv.gz")
+    assert len(read(summary['file'])) == 3
+    assert read(str(tmp_path / "out__물품상세내역.csv.gz"))[1][0] == "A-000"
+
+
+def test_unknown_compression():
+    with pytest.raises(ValueError):
+        CsvExporter("out.csv", compression="bz2")
+
+
+def test_one_shot_iterator_and_callable_sources(tmp_path):
+    from_list = export_csv(ITEMS, str(tmp_path / "list.csv"))
+    from_iterator = export_csv(iter(ITEMS), str(tmp_path / "iter.csv"))
+    from_callable = export_csv(lambda: iter(ITEMS), str(tmp_path / "call.csv"))
+    expected = read(from_list['file'])
+    assert read(from_iterator['file']) == expected
+    assert read(from_callable['file']) == expected
+
+
+def test_revision_delta_columns_hold_field_names(tmp_path):
+    amended = notice("A-001", 입찰공고명="공고 A (정정)")
+    amended.previous_revision = "A-000"
+    amended.changed_fields = {'입찰공고명': {'old': "공고 A", 'new': "공고 A (정정)"}}
+    amended.removed_fields = {'비고': "x"}
+    header, row = read(export_csv([amended], str(tmp_path / "out.csv"))['file'])
+    values = dict(zip(header, row))
+    assert values['previous_revision'] == "A-000"
+    assert values['changed_fields'] == "입찰공고명"
+    assert values['removed_fields'] == "비고"
+
+
+def test_fields_missing_from_the_schema_pass_are_skipped(tmp_path):
+    passes = iter([[ITEMS[0]], ITEMS])  # The source grows between the two passes
+    summary = export_csv(lambda: next(passes), str(tmp_path / "out.csv"))
+    assert summary['skipped'] == {'지역제한': 1, '추가항목': 1, '': 1}
+    header, _, second = read(summary['file'])
+    assert '지역제한' not in header
+    assert second[0] == "B-000"
+    assert not (tmp_path / "out__Grid_Data.csv").exists()
@@ -0,0 +1,103 @@
+import time
+
+from src.jobqueue import JobQueue, STATUS_DONE, STATUS_FAILED, STATUS_LEASED, STATUS_PENDING
+from src.model import BidItem
+
+
+def queue(tmp_path, **kwargs):
+    return JobQueue(str(tmp_path / "queue.db"), **kwargs)
+
+
+def status(q, bid_no):
+    return q.conn.execute("SELECT status FROM jobs WHERE bid_no = ?", (bid_no,)).fetchone()[0]
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    q = queue(tmp_path)
+    assert q.enqueue("A", {'page': 1})
+    assert not q.enqueue("A", {'page': 2})
+    assert q.stats() == {STATUS_PENDING: 1}
+
+
+def test_lease_is_exclusive(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("A")
+    assert q.lease("A", "w1")
+    assert not q.lease("A", "w2")
+    assert status(q, "A") == STATUS_LEASED
+
+
+def test_complete_writes_result_and_marks_done(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("A")
+    q.lease("A", "w1")
+    assert q.complete("A", "w1", BidItem("A", "name", raw_data={'x': 1}))
+    assert status(q, "A") == STATUS_DONE
+    assert [item.raw_data for item in q.load_results()] == [{'x': 1}]
+    assert not q.lease("A", "w2")
+
+
+def test_complete_without_lease_writes_nothing(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("A")
+    q.lease("A", "w1")
+    assert not q.complete("A", "w2", BidItem("A", "name"))
+    assert q.load_results() == []
+    assert status(q, "A") == STATUS_LEASED
+
+
+def test_fail_retries_until_max_attempts(tmp_path):
+    q = queue(tmp_path, max_attempts=2)
+    q.enqueue("A")
+    q.lease("A", "w1")
+    q.fail("A", "w1", "boom")
+    assert status(q, "A") == STATUS_PENDING
+    assert q.lease("A", "w1")
+    q.fail("A", "w1", "boom")
+    assert status(q, "A") == STATUS_FAILED
+    assert not q.lease("A", "w1")
+    assert q.retried() == 1
+
+
+def test_fail_by_other_worker_is_ignored(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("A")
+    q.lease("A", "w1")
+    q.fail("A", "w2", "not mine")
+    assert status(q, "A") == STATUS_LEASED
+
+
+def test_expired_lease_can_be_taken_over(tmp_path):
+    q = queue(tmp_path, lease_seconds=0)
+    q.enqueue("A")
+    q.lease("A", "w1")
+    time.sleep(0.01)
+    assert q.lease("A", "w2")
+    # The first worker lost the lease: its result is discarded
+    assert not q.complete("A", "w1", BidItem("A", "stale"))
+    assert q.complete("A", "w2", BidItem("A", "fresh"))
+    assert [item.bid_name for item in q.load_results()] == ["fresh"]
+
+
+def test_available_filters_by_scope_and_lease(tmp_path):
+    q = queue(tmp_path)
+    q.enqueue("A", {'shard': '', 'page': 2})
+    q.enqueue("B", {'shard': 's1', 'page': 1})
+    q.enqueue("C")
+    q.enqueue("D", {'page': 1})
+    q.lease("D", "w1")
+    assert q.available() == [("A", {'shard': '', 'page': 2}), ("C", {})]
+    assert q.available("s1") == [("B", {'shard': 's1', 'page': 1})]
+
+
+def test_load_results_since(tmp_path):
+    q = queue(tmp_path)
+    for bid_no in ("A", "B"):
+        q.enqueue(bid_no)
+        q.lease(bid_no, "w1")
+    q.complete("A", "w1", BidItem("A", "old"))
+    since = time.time()
+    time.sleep(0.01)
+    q.complete("B", "w1", BidItem("B", "new"))
+    assert [item.bid_no for item in q.load_results(since=since)] == ["B"]
+    assert [item.bid_no for item in q.iter_results()] == ["A", "B"]
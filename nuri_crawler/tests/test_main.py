@@ -0,0 +1,60 @@
+from argparse import Namespace
+
+from main import resolve_profile
+from src.config import (HEADLESS, TARGET_COUNT, INCREMENTAL_MODE, DELAY_BETWEEN_REQUESTS, RUN_PROFILES,
+                        SHARD_PROCESSES, SHARD_TARGET_COUNT, ATTACHMENT_WORKERS)
+
+
+def args(**values):
+    defaults = {'profile': None, 'headless': None, 'delay': None, 'target_count': None, 'incremental': False}
+    defaults.update(values)
+    return Namespace(**defaults)
+
+
+def test_no_profile_uses_config_defaults():
+    assert resolve_profile(args()) == {
+        'headless': HEADLESS, 'target_count': TARGET_COUNT, 'incremental': INCREMENTAL_MODE,
+        'delay': DELAY_BETWEEN_REQUESTS, 'concurrency': None,
+    }
+
+
+def test_command_defaults_apply_without_profile():
+    settings = resolve_profile(args(processes=None), concurrency=SHARD_PROCESSES, target_count=SHARD_TARGET_COUNT)
+    assert settings['concurrency'] == SHARD_PROCESSES
+    assert settings['target_count'] == SHARD_TARGET_COUNT
+
+
+def test_profile_overrides_command_defaults():
+    settings = resolve_profile(args(profile="backfill", processes=None),
+                               concurrency=SHARD_PROCESSES, target_count=SHARD_TARGET_COUNT)
+    assert settings['concurrency'] == RUN_PROFILES["backfill"]["concurrency"]
+    assert settings['target_count'] == RUN_PROFILES["backfill"]["target_count"]
+    assert settings['headless'] == RUN_PROFILES["backfill"]["headless"]
+
+
+def test_profile_without_a_setting_keeps_the_command_default():
+    settings = resolve_profile(args(profile="dev"), concurrency=ATTACHMENT_WORKERS)
+    assert settings['concurrency'] == ATTACHMENT_WORKERS
+    assert settings['delay'] == DELAY_BETWEEN_REQUESTS
+
+
+def test_flags_override_profile():
+    settings = resolve_profile(args(profile="scheduled", headless=False, target_count=7, delay=0.5, processes=3),
+                               concurrency=SHARD_PROCESSES)
+    assert settings['headless'] is False
+    assert settings['target_count'] == 7
+    assert settings['delay'] == 0.5
+    assert settings['concurrency'] == 3
+    assert settings['incremental'] is True  # From the profile; no flag given
+
+
+def test_incremental_flag_only_enables():
+    assert resolve_profile(args(incremental=True))['incremental'] is True
+    assert resolve_profile(args(profile="scheduled", incremental=False))['incremental'] is True
+
+
+def test_commands_without_a_flag_ignore_it():
+    # watch has no --target-count / --incremental; missing attributes are not overrides
+    settings = resolve_profile(Namespace(profile="backfill", headless=None, delay=None))
+    assert settings['target_count'] == RUN_PROFILES["backfill"]["target_count"]
+    assert settings['incremental'] == INCREMENTAL_MODE
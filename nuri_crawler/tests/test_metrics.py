@@ -0,0 +1,81 @@
+import json
+
+from src.metrics import Histogram, Metrics, _percentile, timed
+
+
+def test_percentile_is_nearest_rank():
+    values = list(range(1, 101))
+    assert _percentile(values, 0.5) == 50
+    assert _percentile(values, 0.95) == 95
+    assert _percentile(values, 0.99) == 99
+    assert _percentile([], 0.5) == 0.0
+
+
+def test_histogram_keeps_exact_totals_with_bounded_samples():
+    hist = Histogram(size=100)
+    for value in range(10_000):
+        hist.add(float(value))
+    assert hist.count == 10_000
+    assert hist.total == sum(range(10_000))
+    assert hist.max == 9999.0
+    assert len(hist.samples) == 100
+    # Uniform sample: the median estimate lands near the true median
+    assert 2500 < _percentile(hist.sorted_samples(), 0.5) < 7500
+
+
+def test_summary_stages_and_counters():
+    metrics = Metrics()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        metrics.observe("detail_fetch", seconds)
+    metrics.observe("back_navigation", 1.0, strategy="list_button")
+    metrics.incr("items_stored")
+    metrics.incr("items_failed", reason="exception")
+    metrics.incr("items_failed", reason="exception")
+
+    summary = metrics.summary()
+    stage = summary['stages']['detail_fetch']
+    assert stage['count'] == 4
+    assert stage['total_s'] == 1.0
+    assert stage['p50_s'] == 0.2
+    assert stage['max_s'] == 0.4
+    assert 'back_navigation[strategy=list_button]' in summary['stages']
+    assert summary['counters'] == {'items_failed[reason=exception]': 2, 'items_stored': 1}
+    json.dumps(summary)
+
+
+def test_prometheus_output():
+    metrics = Metrics()
+    metrics.observe("detail_fetch", 0.5, kind='a"b')
+    metrics.incr("items_stored", 3)
+    lines = metrics.to_prometheus().splitlines()
+
+    assert lines.count("# TYPE nuri_crawler_detail_fetch_seconds summary") == 1
+    assert 'nuri_crawler_detail_fetch_seconds{kind="a\\"b",quantile="0.5"} 0.500000' in lines
+    assert 'nuri_crawler_detail_fetch_seconds_sum{kind="a\\"b"} 0.500000' in lines
+    assert 'nuri_crawler_detail_fetch_seconds_count{kind="a\\"b"} 1' in lines
+    assert "# TYPE nuri_crawler_items_stored_total counter" in lines
+    assert "nuri_crawler_items_stored_total 3" in lines
+    assert lines[-2] == "# TYPE nuri_crawler_run_duration_seconds gauge"
+
+
+def test_write_prometheus_replaces_file(tmp_path):
+    metrics = Metrics()
+    metrics.incr("items_stored")
+    target = tmp_path / "metrics.prom"
+    metrics.write_prometheus(str(target))
+    assert "nuri_crawler_items_stored_total 1" in target.read_text(encoding='utf-8')
+    assert not (tmp_path / "metrics.prom.tmp").exists()
+
+
+def test_timed_decorator():
+    class Worker:
+        def __init__(self):
+            self.metrics = Metrics()
+
+        @timed("parse")
+        def parse(self):
+            return "ok"
+
+    worker = Worker()
+    assert worker.parse() == "ok"
+    assert worker.metrics.summary()['stages']['parse']['count'] == 1
@@ -0,0 +1,87 @@
+from src.model import BidItem
+from src.search import SearchIndex, match_query, tokenize
+
+
+def notice(bid_no, name, agency="조달청", date="2026/02/09 10:00", items=None, **raw):
+    raw_data = {'입찰공고명': name, '공고기관': agency, '공고일시': date, **raw}
+    if items is not None:
+        raw_data['물품상세내역'] = [{'품명': item} for item in items]
+    return BidItem(bid_no, name, raw_data=raw_data)
+
+
+def index(tmp_path, *items):
+    search_index = SearchIndex(str(tmp_path / "search.db"))
+    search_index.add(items)
+    return search_index
+
+
+def test_tokenize_hangul_bigrams_and_words():
+    assert tokenize("건축물 안전점검 2026") == ['건축', '축물', '안전', '전점', '점검', '2026']
+    assert tokenize("LED 조명") == ['led', '조명']
+    assert tokenize("동") == ['동']
+    assert tokenize(None) == []
+
+
+def test_match_query():
+    assert match_query("안전점검") == '"안전 전점 점검"'
+    assert match_query("동 tv led") == '"동"* AND "tv"* AND "led"'
+    assert match_query("  ") is None
+
+
+def test_search_finds_substrings_of_words(tmp_path):
+    search_index = index(tmp_path, notice("A-000", "건축물 안전점검 용역"), notice("B-000", "도로 포장 공사"))
+    assert [row['bid_no'] for row in search_index.search(keyword="전점검")] == ["A-000"]
+    assert [row['bid_no'] for row in search_index.search(keyword="포장 도로")] == ["B-000"]
+    assert search_index.search(keyword="안전 포장") == []
+
+
+def test_search_matches_item_names_and_agency(tmp_path):
+    search_index = index(
+        tmp_path,
+        notice("A-000", "소모품 구매", agency="서울특별시 교육청", items=["복사용지", "토너"]),
+        notice("B-000", "소모품 구매", agency="부산광역시"),
+    )
+    assert [row['bid_no'] for row in search_index.search(keyword="복사용지")] == ["A-000"]
+    assert [row['bid_no'] for row in search_index.search(keyword="소모품", agency="교육청")] == ["A-000"]
+    assert search_index.search(keyword="복사용지")[0]['items'] == "복사용지 토너"
+
+
+def test_search_orders_by_date_with_inclusive_range(tmp_path):
+    search_index = index(
+        tmp_path,
+        notice("A-000", "용역 A", date="2026-02-01 09:00"),
+        notice("B-000", "용역 B", date="2026-02-09 18:00"),
+        notice("C-000", "용역 C", date="2026-02-10 09:00"),
+    )
+    assert [row['bid_no'] for row in search_index.search(keyword="용역")] == ["C-000", "B-000", "A-000"]
+    rows = search_index.search(date_from="2026/02/01", date_to="2026/02/09")
+    assert [row['bid_no'] for row in rows] == ["B-000", "A-000"]
+
+
+def test_revision_updates_the_notice(tmp_path):
+    search_index = index(tmp_path, notice("A-000", "청사 보수 공사"))
+    generation, _ = search_index.generation()
+    search_index.add([notice("A-001", "청사 보수 공사 (정정)")])
+    assert len(search_index) == 1
+    assert search_index.generation()[0] == generation + 1
+    record = search_index.get("A-000")
+    assert record['bid_no'] == "A-001"
+    assert record['raw_data']['입찰공고명'] == "청사 보수 공사 (정정)"
+    assert search_index.search(keyword="정정")[0]['bid_no'] == "A-001"
+
+
+def test_page_keyset_and_change_feed(tmp_path):
+    search_index = index(tmp_path, *(notice(f"N{i}-000", f"공고 {i}") for i in range(5)))
+    first = search_index.page(limit=2)
+    assert [row['bid_no'] for row in first] == ["N4-000", "N3-000"]
+    second = search_index.page(before_seq=first[-1]['seq'], limit=2)
+    assert [row['bid_no'] for row in second] == ["N2-000", "N1-000"]
+    feed = search_index.page(after_seq=3, limit=10)
+    assert [row['bid_no'] for row in feed] == ["N3-000", "N4-000"]
+
+
+def test_iter_items_in_snapshot(tmp_path):
+    search_index = index(tmp_path, notice("A-000", "공고"))
+    with search_index.snapshot():
+        items = list(search_index.iter_items())
+    assert [item.raw_data['입찰공고명'] for item in items] == ["공고"]
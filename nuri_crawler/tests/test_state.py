@@ -0,0 +1,133 @@
+import json
+import time
+
+from src.model import BidItem
+from src.state import StateManager, normalize_input_date, split_revision
+
+
+def state(tmp_path):
+    return StateManager(str(tmp_path / "state.db"))
+
+
+def test_normalize_input_date():
+    assert normalize_input_date("2026-02-09  10:23") == "2026/02/09 10:23"
+    assert normalize_input_date("2026.02.09 10:23") == "2026/02/09 10:23"
+    assert normalize_input_date(None) == ""
+
+
+def test_high_water_mark_only_advances(tmp_path):
+    s = state(tmp_path)
+    assert s.high_water_mark is None
+    s.update_high_water_mark("2026-02-09 10:23")
+    assert s.high_water_mark == "2026/02/09 10:23"
+    s.update_high_water_mark("2026/02/08 23:59")
+    assert s.high_water_mark == "2026/02/09 10:23"
+    s.update_high_water_mark("")
+    assert s.high_water_mark == "2026/02/09 10:23"
+    s.update_high_water_mark("2026/02/10 00:00")
+    assert s.high_water_mark == "2026/02/10 00:00"
+
+
+def test_high_water_mark_is_shared_across_processes(tmp_path):
+    first, second = state(tmp_path), state(tmp_path)
+    first.update_high_water_mark("2026/02/10 00:00")
+    second.update_high_water_mark("2026/02/09 00:00")
+    assert second.high_water_mark == "2026/02/10 00:00"
+
+
+def item(bid_no, **raw_data):
+    return BidItem(bid_no, "name", raw_data=raw_data)
+
+
+def test_split_revision():
+    assert split_revision("R26BK01323461-000") == ("R26BK01323461", "000")
+    assert split_revision(" R26BK01323461 ") == ("R26BK01323461", None)
+
+
+def test_first_revision_has_no_delta(tmp_path):
+    s = state(tmp_path)
+    assert s.revision_changes(item("X-000", a=1)) is None
+
+
+def test_revision_delta_has_old_and_new_values(tmp_path):
+    s = state(tmp_path)
+    s.record_revision(item("X-000", a=1, b=2, grid=[{'c': 1}]))
+    changes = s.revision_changes(item("X-001", a=1, b=3, d=4))
+    assert changes == {
+        'previous_revision': "X-000",
+        'changed': {'b': {'old': 2, 'new': 3}, 'd': {'old': None, 'new': 4}},
+        'removed': {'grid': [{'c': 1}]},
+    }
+
+
+def test_refetched_revision_gets_the_same_delta(tmp_path):
+    s = state(tmp_path)
+    s.record_revision(item("X-000", a=1))
+    amended = item("X-001", a=2)
+    first = s.revision_changes(amended)
+    assert s.record_revision(amended)
+    # Crash or lost lease before the result was committed: fetched again
+    assert s.needs_fetch("X-001")
+    assert s.revision_changes(amended) == first
+    assert not s.record_revision(amended)
+
+
+def test_revision_baseline_never_moves_backwards(tmp_path):
+    s = state(tmp_path)
+    s.record_revision(item("X-001", a=2))
+    assert not s.record_revision(item("X-000", a=1))
+    assert not s.needs_fetch("X-000")
+    assert s.needs_fetch("X-002")
+    assert s.revision_changes(item("X-002", a=3))['previous_revision'] == "X-001"
+
+
+def test_visited_revision_is_not_fetched_again(tmp_path):
+    s = state(tmp_path)
+    s.record_revision(item("X-000", a=1))
+    s.mark_visited("X-000")
+    assert not s.needs_fetch("X-000")
+
+
+def test_claim_is_exclusive_across_processes(tmp_path):
+    first, second = state(tmp_path), state(tmp_path)
+    assert first.claim("X-000", "a")
+    assert first.claim("X-000", "a")  # Renewal by the same owner
+    assert not second.claim("X-000", "b")
+    first.release("X-000", "b")  # Only the owner can release
+    assert not second.claim("X-000", "b")
+    first.release("X-000", "a")
+    assert second.claim("X-000", "b")
+
+
+def test_expired_claim_can_be_taken_over(tmp_path):
+    crashed = StateManager(str(tmp_path / "state.db"), lease_seconds=0)
+    assert crashed.claim("X-000", "a")
+    time.sleep(0.01)
+    assert state(tmp_path).claim("X-000", "b")
+
+
+def test_visited_notice_cannot_be_claimed(tmp_path):
+    first, second = state(tmp_path), state(tmp_path)
+    assert first.claim("X-000", "a")
+    first.mark_visited("X-000")
+    assert second.conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 0
+    assert not second.needs_fetch("X-000")
+    assert not second.claim("X-000", "b")
+    assert second.claim("X-001", "b")
+
+
+def test_legacy_state_json_is_imported_once(tmp_path):
+    legacy = {
+        'visited_ids': ["X-000"],
+        'revisions': {'X': {'revision': "000", 'hash': "h", 'field_hashes': {}}},
+        'high_water_mark': "2026/02/09 10:23",
+    }
+    (tmp_path / "state.json").write_text(json.dumps(legacy), encoding='utf-8')
+    s = state(tmp_path)
+    assert s.is_visited("X-000")
+    assert s.high_water_mark == "2026/02/09 10:23"
+    assert not s.needs_fetch("X-000")
+    assert s.needs_fetch("X-001")
+
+    s.conn.execute("DELETE FROM visited")
+    assert not state(tmp_path).is_visited("X-000")